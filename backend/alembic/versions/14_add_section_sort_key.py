@@ -0,0 +1,82 @@
+"""add gap-based sort_key to transcript_details_t
+
+Revision ID: 14
+Revises: 13
+Create Date: 2026-10-18 00:00:00.000000
+
+Sections are ordered by a sparse integer ``sort_key`` (multiples of 1024)
+instead of the dense ``section_id``. Inserting between two sections takes the
+midpoint of their keys and deleting just deactivates the row, so neither
+rewrites the rest of the transcript. The API still returns a contiguous 1-based
+``section_id``, computed with ``row_number()`` over ``sort_key`` at read time.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '14'
+down_revision: Union[str, Sequence[str], None] = '13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in sync with SECTION_KEY_GAP in app/repositories/transcription/controller.py
+SECTION_KEY_GAP = 1024
+
+
+def upgrade() -> None:
+    # 1. Add the ordering key
+    op.add_column(
+        'transcript_details_t',
+        sa.Column('sort_key', sa.BigInteger, nullable=True),
+        schema='public',
+    )
+
+    # 2. Back-fill: current order (section_id, id), spaced SECTION_KEY_GAP apart
+    op.execute(f"""
+        UPDATE public.transcript_details_t d
+        SET sort_key = r.rn * {SECTION_KEY_GAP}
+        FROM (
+            SELECT id,
+                   row_number() OVER (
+                       PARTITION BY transcription_id, is_active
+                       ORDER BY section_id, id
+                   ) AS rn
+            FROM public.transcript_details_t
+        ) r
+        WHERE d.id = r.id;
+    """)
+
+    # 3. Ordered lookups / neighbour seeks within a transcript
+    op.create_index(
+        'ix_transcript_details_transcription_sort_key',
+        'transcript_details_t',
+        ['transcription_id', 'sort_key'],
+        schema='public',
+    )
+
+
+def downgrade() -> None:
+    # Persist the computed order back into section_id before dropping the key
+    op.execute("""
+        UPDATE public.transcript_details_t d
+        SET section_id = r.rn
+        FROM (
+            SELECT id,
+                   row_number() OVER (
+                       PARTITION BY transcription_id
+                       ORDER BY sort_key, id
+                   ) AS rn
+            FROM public.transcript_details_t
+            WHERE is_active = 1
+        ) r
+        WHERE d.id = r.id;
+    """)
+    op.drop_index(
+        'ix_transcript_details_transcription_sort_key',
+        'transcript_details_t',
+        schema='public',
+    )
+    op.drop_column('transcript_details_t', 'sort_key', schema='public')
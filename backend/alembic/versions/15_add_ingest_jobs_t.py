@@ -0,0 +1,81 @@
+"""add ingest_jobs_t (background audio/transcript ingestion)
+
+Revision ID: 15
+Revises: 14
+Create Date: 2026-10-18 00:00:00.000000
+
+``POST /transcripts/{id}/upload-audio`` now stages the files and enqueues a
+job here; workers parse the transcript, place the audio and write the sections
+out of band, and clients poll ``GET /jobs/{id}`` for status and progress.
+The partial index covers exactly the rows a worker's claim query scans.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '15'
+down_revision: Union[str, Sequence[str], None] = '14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+Schema = 'public'
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ingest_jobs_t',
+        sa.Column('id', sa.Integer(), sa.Identity(always=False, start=1, increment=1), nullable=False),
+        sa.Column('job_type', sa.String(length=50), nullable=False),
+        sa.Column('transcription_id', sa.Integer(), nullable=True),
+        sa.Column('idempotency_key', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='queued'),
+        sa.Column('stage', sa.String(length=100), nullable=True),
+        sa.Column('progress', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('payload', sa.Text(), nullable=True),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='3'),
+        sa.Column('run_after', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('locked_by', sa.String(length=100), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('idempotency_key', name='uq_ingest_jobs_idempotency_key'),
+        schema=Schema,
+    )
+    # claim query: WHERE status = 'queued' AND run_after <= now() ORDER BY run_after
+    op.create_index(
+        'ix_ingest_jobs_queued',
+        'ingest_jobs_t',
+        ['run_after'],
+        schema=Schema,
+        postgresql_where=sa.text("status = 'queued'"),
+    )
+    # stale-job sweep: WHERE status = 'running' AND heartbeat_at < ...
+    op.create_index(
+        'ix_ingest_jobs_running',
+        'ingest_jobs_t',
+        ['heartbeat_at'],
+        schema=Schema,
+        postgresql_where=sa.text("status = 'running'"),
+    )
+    op.create_index(
+        'ix_ingest_jobs_transcription',
+        'ingest_jobs_t',
+        ['transcription_id'],
+        schema=Schema,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ingest_jobs_transcription', table_name='ingest_jobs_t', schema=Schema)
+    op.drop_index('ix_ingest_jobs_running', table_name='ingest_jobs_t', schema=Schema)
+    op.drop_index('ix_ingest_jobs_queued', table_name='ingest_jobs_t', schema=Schema)
+    op.drop_table('ingest_jobs_t', schema=Schema)
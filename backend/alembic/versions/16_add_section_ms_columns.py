@@ -0,0 +1,79 @@
+"""add millisecond timestamps to transcript_details_t
+
+Revision ID: 16
+Revises: 15
+Create Date: 2026-10-18 00:00:00.000000
+
+``begin_timestamp``/``end_timestamp`` stay the display strings
+(``HH:MM:SS.mmm``); ``begin_ms``/``end_ms`` hold the same times as integer
+milliseconds so durations are real arithmetic and "which section is playing at
+t" is an index seek on ``(transcription_id, begin_ms)``. The index only covers
+active rows: every re-upload deactivates the previous sections, and the seek
+should not have to step over them.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '16'
+down_revision: Union[str, Sequence[str], None] = '15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _to_ms(column: str) -> str:
+    """SQL for HH:MM:SS(.fff) / MM:SS(.fff) in *column* as milliseconds; NULL otherwise.
+
+    Mirrors app.mappers.timestamps.timestamp_to_ms for the formats the app writes.
+    """
+    value = f"btrim({column})"
+    return f"""
+        CASE
+            WHEN {value} ~ '^[0-9]+:[0-9]+:[0-9]+(\\.[0-9]+)?$' THEN round((
+                split_part({value}, ':', 1)::numeric * 3600
+                + split_part({value}, ':', 2)::numeric * 60
+                + split_part({value}, ':', 3)::numeric
+            ) * 1000)::integer
+            WHEN {value} ~ '^[0-9]+:[0-9]+(\\.[0-9]+)?$' THEN round((
+                split_part({value}, ':', 1)::numeric * 60
+                + split_part({value}, ':', 2)::numeric
+            ) * 1000)::integer
+            WHEN {value} ~ '^[0-9]+(\\.[0-9]+)?$' THEN round({value}::numeric * 1000)::integer
+        END
+    """
+
+
+def upgrade() -> None:
+    # 1. Add the columns
+    op.add_column('transcript_details_t', sa.Column('begin_ms', sa.Integer, nullable=True), schema='public')
+    op.add_column('transcript_details_t', sa.Column('end_ms', sa.Integer, nullable=True), schema='public')
+
+    # 2. Back-fill from the strings
+    op.execute(f"""
+        UPDATE public.transcript_details_t
+        SET begin_ms = {_to_ms('begin_timestamp')},
+            end_ms = {_to_ms('end_timestamp')}
+        WHERE begin_timestamp IS NOT NULL OR end_timestamp IS NOT NULL;
+    """)
+
+    # 3. "Section at time t" seeks
+    op.create_index(
+        'ix_transcript_details_transcription_begin_ms',
+        'transcript_details_t',
+        ['transcription_id', 'begin_ms'],
+        schema='public',
+        postgresql_where=sa.text('is_active = 1'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'ix_transcript_details_transcription_begin_ms',
+        'transcript_details_t',
+        schema='public',
+    )
+    op.drop_column('transcript_details_t', 'end_ms', schema='public')
+    op.drop_column('transcript_details_t', 'begin_ms', schema='public')
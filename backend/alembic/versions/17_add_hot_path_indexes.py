@@ -0,0 +1,86 @@
+"""indexes for the hot transcript, activity log and notification reads
+
+Revision ID: 17
+Revises: 16
+Create Date: 2026-10-18 00:00:00.000000
+
+* Sections of a transcript are always read as ``transcription_id = ? AND
+  is_active = 1 ORDER BY sort_key, id`` (section_id is computed from that
+  order since revision 14). A partial index on exactly that key serves the
+  list, the position sub-query and the neighbour seeks without a sort and
+  without stepping over rows deactivated by earlier uploads.
+  ``ix_transcript_details_transcription_sort_key`` stays for the lookups that
+  include inactive rows.
+* Activity log reads filter on ``action`` (``section_edited`` for "recent
+  edits", the panel's action filter) and take the newest entries, which
+  ``ix_activity_log_transcription_id`` (transcription_id, created_at) can only
+  do by filtering every entry of the transcript.
+* Notifications are listed newest first per user, optionally unread only, and
+  the badge counts unread ones. ``(user_id, created_at)`` serves the list, and
+  a partial index over unread rows serves the unread list, the count and
+  "mark all read". Together they make ``ix_notifications_user_unread``
+  (user_id, is_read) redundant.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '17'
+down_revision: Union[str, Sequence[str], None] = '16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 1. Ordered active sections of a transcript
+    op.create_index(
+        'ix_transcript_details_active_order',
+        'transcript_details_t',
+        ['transcription_id', 'sort_key', 'id'],
+        schema='public',
+        postgresql_where=sa.text('is_active = 1'),
+    )
+
+    # 2. Newest activity of one kind for a transcript
+    op.create_index(
+        'ix_activity_log_transcription_action_created',
+        'transcript_activity_log_t',
+        ['transcription_id', 'action', sa.text('created_at DESC')],
+        schema='public',
+    )
+
+    # 3. A user's notifications, newest first; unread ones on their own
+    op.create_index(
+        'ix_notifications_user_created',
+        'notifications_t',
+        ['user_id', sa.text('created_at DESC')],
+        schema='public',
+    )
+    op.create_index(
+        'ix_notifications_user_unread_created',
+        'notifications_t',
+        ['user_id', sa.text('created_at DESC')],
+        schema='public',
+        postgresql_where=sa.text('is_read = 0'),
+    )
+    op.drop_index('ix_notifications_user_unread', table_name='notifications_t', schema='public')
+
+
+def downgrade() -> None:
+    op.create_index(
+        'ix_notifications_user_unread',
+        'notifications_t',
+        ['user_id', 'is_read'],
+        schema='public',
+    )
+    op.drop_index('ix_notifications_user_unread_created', table_name='notifications_t', schema='public')
+    op.drop_index('ix_notifications_user_created', table_name='notifications_t', schema='public')
+    op.drop_index(
+        'ix_activity_log_transcription_action_created',
+        table_name='transcript_activity_log_t',
+        schema='public',
+    )
+    op.drop_index('ix_transcript_details_active_order', table_name='transcript_details_t', schema='public')
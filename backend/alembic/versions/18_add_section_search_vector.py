@@ -0,0 +1,58 @@
+"""add full-text search over transcript_details_t
+
+Revision ID: 18
+Revises: 17
+Create Date: 2026-10-18 00:00:00.000000
+
+``search_vector`` is a stored generated column, so every insert and text edit
+keeps it current without application code or triggers. It covers the text as
+shown in the editor: ``edited_text``, falling back to ``original_text``. The
+``simple`` configuration lower-cases words without stemming, because lessons
+are not all in one language.
+
+The GIN index only covers active rows; searches never return sections
+replaced by a re-upload or deleted.
+
+Adding a stored generated column rewrites the table, so run this outside busy
+hours on large installs.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '18'
+down_revision: Union[str, Sequence[str], None] = '17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 1. Generated tsvector column
+    op.add_column(
+        'transcript_details_t',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR,
+            sa.Computed("to_tsvector('simple', coalesce(edited_text, original_text, ''))", persisted=True),
+        ),
+        schema='public',
+    )
+
+    # 2. GIN index for @@ matches
+    op.create_index(
+        'ix_transcript_details_search_vector',
+        'transcript_details_t',
+        ['search_vector'],
+        schema='public',
+        postgresql_using='gin',
+        postgresql_where=sa.text('is_active = 1'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transcript_details_search_vector', table_name='transcript_details_t', schema='public')
+    op.drop_column('transcript_details_t', 'search_vector', schema='public')
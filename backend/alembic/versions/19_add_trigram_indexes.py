@@ -0,0 +1,54 @@
+"""trigram indexes for thread search and @mention autocomplete
+
+Revision ID: 19
+Revises: 18
+Create Date: 2026-10-18 00:00:00.000000
+
+Thread search and user autocomplete match substrings anywhere in the text
+(``ILIKE '%term%'``), which a b-tree cannot serve, so every keystroke of the
+autocomplete scanned users_t. pg_trgm GIN indexes answer ``ILIKE`` for terms
+of three or more characters, and ``similarity()`` ranks the matches. Only
+active rows are indexed, as only those are ever searched.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '19'
+down_revision: Union[str, Sequence[str], None] = '18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index, table, column, active-rows predicate)
+TRIGRAM_INDEXES = [
+    ('ix_thread_posts_body_trgm', 'thread_posts_t', 'body', 'is_active = 1'),
+    ('ix_transcript_threads_title_trgm', 'transcript_threads_t', 'title', 'is_active = 1'),
+    ('ix_users_user_name_trgm', 'users_t', 'user_name', 'active = 1'),
+    ('ix_users_display_name_trgm', 'users_t', 'display_name', 'active = 1'),
+]
+
+
+def upgrade() -> None:
+    # 1. Extension (ships with Postgres contrib; trusted, so the app role can create it)
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # 2. Trigram GIN indexes
+    for name, table, column, active in TRIGRAM_INDEXES:
+        op.create_index(
+            name,
+            table,
+            [column],
+            schema='public',
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+            postgresql_where=sa.text(active),
+        )
+
+
+def downgrade() -> None:
+    for name, table, _, _ in reversed(TRIGRAM_INDEXES):
+        op.drop_index(name, table_name=table, schema='public')
+    # the extension is left installed: other objects may use it by now
@@ -0,0 +1,23 @@
+"""Background job status API.
+
+``POST /transcripts/{id}/upload-audio`` answers ``202`` with a job id; poll
+``GET /jobs/{job_id}`` until ``status`` is ``succeeded`` or ``failed``.
+``stage`` and ``progress`` (0-100) describe the current step, ``error`` the
+last failed attempt (``{message, code, file}``, as for a synchronous upload
+error) and ``result`` the outcome. Requires an authenticated user, and a
+job is only visible to the user who queued it (anyone else gets ``404``).
+"""
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.auth.dependencies import get_current_user_id
+from app.services.jobs.queue import JobQueue
+
+router = APIRouter(prefix="/jobs")
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: int, user_id: int = Depends(get_current_user_id)):
+    job = await JobQueue().aget(job_id)
+    if job is None or job.created_by != user_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.model_dump()
@@ -0,0 +1,28 @@
+"""Storage monitoring API.
+
+Exposes the storage client pool metrics and the counters of the optional local
+disk cache in front of blob storage (``Storage.Settings.DiskCacheDir``), so
+pool exhaustion, hit ratio and eviction churn can be watched and the sizes
+tuned. Requires an authenticated user.
+"""
+from fastapi import APIRouter, Depends
+
+from app.auth.dependencies import get_current_user_id
+from app.infrastructure.storage.factory import StorageFactory
+
+router = APIRouter(prefix="/storage")
+
+
+@router.get("/cache/stats")
+async def get_storage_cache_stats(_user_id: int = Depends(get_current_user_id)):
+    """Hit / miss / eviction counters and size of the blob disk cache."""
+    stats = StorageFactory().cache_stats()
+    if stats is None:
+        return {"enabled": False}
+    return {"enabled": True, **stats}
+
+
+@router.get("/pool/stats")
+async def get_storage_pool_stats(_user_id: int = Depends(get_current_user_id)):
+    """Size, in-use count, wait times and exhaustion count of the storage client pool."""
+    return StorageFactory().pool_stats()
@@ -1,12 +1,19 @@
 import logging
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import Response
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
 
 from app.api_routers.transcript_files.data_model import TranscriptFile
 from app.repositories.transcripts.transcript_files import TranscriptFilesRepository
 from app.mappers.transcript_files_mapper import TranscriptFilesMapper
 from app.services.transcript_process.service import TranscriptProcessService
+from app.services.transcript_process import waveform
+from app.services.transcript_process.byte_range import (
+    RangeNotSatisfiableError,
+    content_range,
+    etag_matches,
+    parse_range_header,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -48,19 +55,52 @@ async def delete_transcript_file(transcript_id: int, file_id: int):
 
 @router.head("/{transcript_id}/audio")
 async def head_audio_file(transcript_id: int):
-    """Check whether an audio file exists for this transcript (used by the player probe)."""
+    """Check whether an audio file exists for this transcript (used by the player probe).
+
+    Answers with the same ``Content-Length`` and ``ETag`` a full GET would.
+    """
     rows = await repository.list_by_transcript(transcript_id)
     if not rows:
         raise HTTPException(status_code=404, detail="No audio file found for this transcript")
     file_record = mapper.to_transcript_file(rows[0])
+    blob_path = file_record.get("file_path")
     file_type = (file_record.get("file_type") or "").lower()
     content_type = audio_types.get(file_type, "application/octet-stream")
-    return Response(content=b"", media_type=content_type)
+
+    try:
+        info = await service.aget_audio_info(blob_path)
+    except Exception as e:
+        logger.error(f"Failed to retrieve audio from blob storage: blob_path={blob_path!r}, error={e}")
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve audio file: {str(e)}")
+    if not info["size"]:
+        raise HTTPException(status_code=404, detail="Audio file is empty or missing from storage")
+
+    headers = {"Accept-Ranges": "bytes", "Content-Length": str(info["size"])}
+    etag = _quote_etag(info.get("etag"))
+    if etag:
+        headers["ETag"] = etag
+    return Response(media_type=content_type, headers=headers)
 
 
 @router.get("/{transcript_id}/audio")
-async def get_audio_file(transcript_id: int):
-    """Return the audio file bytes for a transcript. Uses the first active audio file found."""
+async def get_audio_file(
+    transcript_id: int,
+    redirect: bool | None = Query(default=None),
+    range_header: str | None = Header(default=None, alias="Range"),
+    if_range: str | None = Header(default=None),
+    if_none_match: str | None = Header(default=None),
+):
+    """Stream the audio file for a transcript. Uses the first active audio file found.
+
+    Supports ``Range`` requests so the player can seek without re-downloading
+    the recording: only the requested bytes are fetched from storage and the
+    answer is ``206 Partial Content``. ``ETag`` / ``If-None-Match`` /
+    ``If-Range`` keep cached copies and resumed ranges consistent.
+
+    With ``?redirect=true`` (or ``Storage.Settings.AudioRedirect`` on) the
+    answer is instead a ``307`` to a short-lived, read-only signed URL, so the
+    audio is served by storage directly and never passes through the API.
+    """
     rows = await repository.list_by_transcript(transcript_id)
     if not rows:
         raise HTTPException(status_code=404, detail="No audio file found for this transcript")
@@ -69,18 +109,100 @@ async def get_audio_file(transcript_id: int):
     blob_path = file_record.get("file_path")
     file_type = (file_record.get("file_type") or "").lower()
 
+    content_type = audio_types.get(file_type, "application/octet-stream")
+
+    use_redirect = service.audio_redirect if redirect is None else redirect
+    if use_redirect:
+        try:
+            url = await service.aget_audio_url(blob_path, content_type)
+        except Exception as e:
+            logger.error(f"Failed to sign audio URL: blob_path={blob_path!r}, error={e}")
+            raise HTTPException(status_code=500, detail=f"Failed to retrieve audio file: {str(e)}")
+        # the signed URL expires, so the redirect itself must not be cached
+        return RedirectResponse(url, status_code=307, headers={"Cache-Control": "no-store"})
+
     try:
-        file_bytes = service.get_audio(blob_path)
+        info = await service.aget_audio_info(blob_path)
     except Exception as e:
         logger.error(f"Failed to retrieve audio from blob storage: blob_path={blob_path!r}, error={e}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve audio file: {str(e)}")
 
-    if not file_bytes:
+    size = info["size"]
+    if not size:
         raise HTTPException(status_code=404, detail="Audio file is empty or missing from storage")
 
-    content_type = audio_types.get(file_type, "application/octet-stream")
+    etag = _quote_etag(info.get("etag"))
+    headers = {"Accept-Ranges": "bytes"}
+    if etag:
+        headers["ETag"] = etag
+
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
 
-    return Response(
-        content=file_bytes,
-        media_type=content_type,
-    )
+    # A stale If-Range means the client's partial copy is outdated: send it all.
+    if if_range and if_range.strip() != etag:
+        range_header = None
+
+    try:
+        byte_range = parse_range_header(range_header, size)
+    except RangeNotSatisfiableError:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    if byte_range is None:
+        start, end, status_code = 0, size - 1, 200
+    else:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = content_range(start, end, size)
+    headers["Content-Length"] = str(end - start + 1)
+
+    try:
+        chunks = await service.astream_audio(
+            blob_path, offset=start, length=end - start + 1, etag=info.get("etag")
+        )
+    except Exception as e:
+        logger.error(f"Failed to retrieve audio from blob storage: blob_path={blob_path!r}, error={e}")
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve audio file: {str(e)}")
+
+    return StreamingResponse(chunks, status_code=status_code, headers=headers, media_type=content_type)
+
+
+@router.get("/{transcript_id}/waveform")
+async def get_waveform(transcript_id: int, zoom: int | None = Query(default=None, ge=0)):
+    """Waveform peaks for the transcript's audio, as a binary array.
+
+    With ``zoom`` the body is that level's interleaved signed 8-bit
+    ``min, max`` pairs (0 = finest; each step halves the resolution) and the
+    ``X-Waveform-*`` headers describe it. Without ``zoom`` the whole
+    multi-resolution peaks file is returned (see ``waveform.py`` for the
+    layout) so a client can cache every level at once.
+    """
+    rows = await repository.list_by_transcript(transcript_id)
+    if not rows:
+        raise HTTPException(status_code=404, detail="No audio file found for this transcript")
+    blob_path = mapper.to_transcript_file(rows[0]).get("file_path")
+
+    try:
+        peaks = await service.aget_waveform(blob_path)
+    except Exception as e:
+        logger.error(f"Failed to build waveform: blob_path={blob_path!r}, error={e}")
+        raise HTTPException(status_code=500, detail=f"Failed to build waveform: {str(e)}")
+
+    if zoom is None:
+        return Response(content=peaks, media_type="application/octet-stream")
+
+    data, meta = waveform.extract_level(peaks, zoom)
+    headers = {
+        "X-Waveform-Zoom": str(meta["zoom"]),
+        "X-Waveform-Zoom-Levels": str(meta["zoom_levels"]),
+        "X-Waveform-Sample-Rate": str(meta["sample_rate"]),
+        "X-Waveform-Samples-Per-Bucket": str(meta["samples_per_bucket"]),
+        "X-Waveform-Buckets": str(meta["buckets"]),
+    }
+    return Response(content=data, media_type="application/octet-stream", headers=headers)
+
+
+def _quote_etag(etag: str | None) -> str | None:
+    if not etag:
+        return None
+    return etag if etag.startswith(('"', 'W/"')) else f'"{etag}"'
@@ -1,9 +1,12 @@
+import asyncio
+
 from fastapi import APIRouter, HTTPException
 
 from app.data_models.transcript_overview import (
     TranscriptOverview,
     TranscriptOverviewSpeaker,
 )
+from app.mappers.timestamps import ms_to_duration
 from app.repositories.transcript_overview.controller import TranscriptOverviewRepository
 from app.repositories.activity_log.controller import ActivityLogRepository
 
@@ -13,52 +16,36 @@ overview_repo = TranscriptOverviewRepository()
 activity_repo = ActivityLogRepository()
 
 
-def _compute_duration(min_ts: str | None, max_ts: str | None) -> str | None:
-    """Compute a human-readable duration string from timestamp bounds."""
-    if not min_ts or not max_ts:
-        return None
-
-    def _to_seconds(ts: str) -> float:
-        parts = ts.split(":")
-        parts_f = [float(p) for p in parts]
-        if len(parts_f) == 3:
-            return parts_f[0] * 3600 + parts_f[1] * 60 + parts_f[2]
-        if len(parts_f) == 2:
-            return parts_f[0] * 60 + parts_f[1]
-        return parts_f[0]
-
-    try:
-        total_sec = _to_seconds(max_ts) - _to_seconds(min_ts)
-        if total_sec < 0:
-            total_sec = 0
-        h = int(total_sec // 3600)
-        m = int((total_sec % 3600) // 60)
-        s = int(total_sec % 60)
-        if h > 0:
-            return f"{h}:{m:02d}:{s:02d}"
-        return f"{m}:{s:02d}"
-    except (ValueError, IndexError):
+def _compute_duration(min_ms: int | None, max_ms: int | None) -> str | None:
+    """Compute a human-readable duration string from millisecond bounds."""
+    if min_ms is None or max_ms is None:
         return None
+    return ms_to_duration(max_ms - min_ms)
 
 
 @router.get("/{transcript_id}/overview")
 async def get_transcript_overview(transcript_id: int):
-    """Return aggregated landing-page data for a transcript."""
-    meta = await overview_repo.aget_transcript_meta(transcript_id)
-    if meta is None:
-        raise HTTPException(status_code=404, detail="Transcript not found")
+    """Return aggregated landing-page data for a transcript.
 
-    stats = await overview_repo.aget_section_stats(transcript_id)
-    comment_count = await overview_repo.aget_comment_count(transcript_id)
-    speakers_raw = await overview_repo.aget_speakers(transcript_id)
-    recent_activity = await activity_repo.alist(
-        transcript_id,
-        limit=15,
-        actions=["section_edited", "comment_added", "tags_updated"],
+    The transcript row, its section stats and comment count come from one
+    statement; it runs concurrently with the three list reads, so a request
+    holds at most four pooled connections and waits for the slowest query
+    instead of the sum of all of them.
+    """
+    meta, speakers_raw, recent_activity, recent_comments = await asyncio.gather(
+        overview_repo.aget_summary(transcript_id),
+        overview_repo.aget_speakers(transcript_id),
+        activity_repo.alist(
+            transcript_id,
+            limit=15,
+            actions=["section_edited", "comment_added", "tags_updated"],
+        ),
+        overview_repo.aget_recent_comments(transcript_id, limit=5),
     )
-    recent_comments = await overview_repo.aget_recent_comments(transcript_id, limit=5)
+    if meta is None:
+        raise HTTPException(status_code=404, detail="Transcript not found")
 
-    duration = _compute_duration(stats.get("min_ts"), stats.get("max_ts"))
+    duration = _compute_duration(meta.get("min_ms"), meta.get("max_ms"))
 
     speakers = [TranscriptOverviewSpeaker(**s) for s in speakers_raw]
 
@@ -72,10 +59,10 @@ async def get_transcript_overview(transcript_id: int):
         tags=meta.get("tags", []),
         created=meta.get("created"),
         modified=meta.get("modified"),
-        total_sections=stats.get("total_sections", 0),
-        edited_sections=stats.get("edited_sections", 0),
+        total_sections=meta.get("total_sections", 0),
+        edited_sections=meta.get("edited_sections", 0),
         total_speakers=len(speakers),
-        total_comments=comment_count,
+        total_comments=meta.get("comment_count", 0),
         total_duration=duration,
         speakers=speakers,
         recent_activity=[a.model_dump() for a in recent_activity],
@@ -11,6 +11,8 @@ class TranscriptDetails(BaseModel):
     speaker: Optional[str] = None
     begin_timestamp: Optional[str] = None
     end_timestamp: Optional[str] = None
+    begin_ms: Optional[int] = None
+    end_ms: Optional[int] = None
     original_text: Optional[str] = None
     edited_text: Optional[str] = None
     tags: List[str] = []
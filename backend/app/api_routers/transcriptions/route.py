@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
 
 from app.api_routers.transcriptions.data_model import (
     TranscriptDetails,
@@ -13,12 +14,14 @@ from app.mappers.activity_log_mapper import ActivityLogMapper
 from app.repositories.transcription.controller import TranscriptRepository
 from app.repositories.transcription.transcript_speakers import TranscriptSpeakersRepository
 from app.repositories.activity_log.controller import ActivityLogRepository
+from app.repositories.transcripts.controller import TranscriptsRepository
 
 router = APIRouter(prefix="/transcriptions")
 
 repository = TranscriptRepository()
 speakers_repo = TranscriptSpeakersRepository()
 activity_repo = ActivityLogRepository()
+transcripts_repo = TranscriptsRepository()
 activity_mapper = ActivityLogMapper()
 
 @router.get("/{transcript_id}")
@@ -32,85 +35,129 @@ async def get_transcript(transcript_id: int):
     return data
 
 
+@router.get("/{transcript_id}/sections/at")
+async def get_section_at(transcript_id: int, t: float = Query(..., ge=0, description="Audio time in seconds")):
+    """The section playing at audio time *t*: the last one that begins at or before it.
+
+    The player calls this on every seek, so it is a single index seek rather
+    than a scan of the transcript.
+    """
+    row = await repository.aget_section_at(transcript_id, int(round(t * 1000)))
+    if row is None:
+        raise HTTPException(status_code=404, detail="No section at this time")
+    return TranscriptDetails(**TranscriptionMapper.to_transcript_details(row)).model_dump()
+
+
+@router.get("/{transcript_id}/export")
+async def export_transcript(transcript_id: int):
+    """Download a transcript in the same plain-text format the upload accepts.
+
+    Sections are read through a server-side cursor and written out batch by
+    batch, so memory stays flat no matter how long the transcript is.
+    """
+    # checked up front: once streaming starts the status is already 200
+    if await transcripts_repo.get(transcript_id) is None:
+        raise HTTPException(status_code=404, detail="Transcript not found")
+
+    async def _export_blocks():
+        async for rows in repository.astream_sections(transcript_id):
+            yield "".join(TranscriptionMapper.to_export_block(row) for row in rows)
+
+    return StreamingResponse(
+        _export_blocks(),
+        media_type="text/plain; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="transcript_{transcript_id}.txt"'},
+    )
+
 @router.put("/sections/{section_id}")
 async def update_section(
     section_id: int,
     body: TranscriptSectionUpdate,
     current_user_id: int = Depends(get_current_user_id),
 ):
-    """Update speaker, timestamps, edited_text, or tags for a single section."""
+    """Update speaker, timestamps, edited_text, or tags for a single section.
+
+    The speaker lookup, the update and the activity entries share a single
+    transaction.
+    """
     updates = body.model_dump(exclude_none=True)
     if not updates:
         raise HTTPException(status_code=400, detail="No fields to update")
 
-    # A *speaker* name is resolved to (or creates) a speaker record. An empty
-    # name clears the assignment. This overrides any raw speaker_id.
-    if "speaker" in updates:
-        speaker_name = (updates.pop("speaker") or "").strip()
-        row = await repository.aget_section(section_id)
-        if not row:
-            raise HTTPException(status_code=404, detail="Section not found")
-        if speaker_name:
-            updates["speaker_id"] = await speakers_repo.aget_or_create_by_name(
-                row["transcription_id"], speaker_name
-            )
-        else:
-            updates["speaker_id"] = None
-
-    if "tags" in updates:
-        updates["tags"] = TranscriptionMapper.serialize_tags(updates["tags"])
-
-    # Stamp modified_at / modified_by
-    now = datetime.now(timezone.utc).replace(tzinfo=None)
-    updates["modified_at"] = now
-    updates["modified_by"] = current_user_id
-
-    result = await repository.aupdate_section(section_id, updates)
-    status = result.get("status_code", 500)
-    if status >= 400:
-        raise HTTPException(status_code=status, detail=result.get("message"))
-
-    # Log activity (best-effort, don't fail the request)
-    try:
-        row = await repository.aget_section(section_id)
-        tid = row["transcription_id"] if row else None
-        if tid:
-            changed = list(body.model_dump(exclude_none=True).keys())
-            sec = row.get('section_id', '?')
-            summary = f"Edited section #{sec}"
-            if "edited_text" in changed:
-                summary = f"Edited text in section #{sec}"
-            elif "speaker" in changed or "speaker_id" in changed:
-                summary = f"Changed speaker on section #{sec}"
-            elif "begin_timestamp" in changed or "end_timestamp" in changed:
-                summary = f"Adjusted timestamps on section #{sec}"
-
-            log = activity_mapper.to_create_values(
-                transcription_id=tid,
-                action="section_edited",
-                section_id=row.get("section_id"),
-                summary=summary,
-                user_id=current_user_id,
-            )
-            await activity_repo.acreate(log)
-
-            # Log a separate entry specifically for tag changes
-            if "tags" in changed:
-                tag_list = body.tags or []
-                if tag_list:
-                    tag_summary = f"Updated tags on section #{sec}: {', '.join(tag_list)}"
-                else:
-                    tag_summary = f"Removed all tags from section #{sec}"
-                tag_log = activity_mapper.to_create_values(
-                    transcription_id=tid,
-                    action="tags_updated",
-                    section_id=row.get("section_id"),
-                    summary=tag_summary,
-                    user_id=current_user_id,
+    async with repository.aunit_of_work() as uow:
+        row = await repository.aget_section(section_id, uow=uow)
+
+        # A *speaker* name is resolved to (or creates) a speaker record. An empty
+        # name clears the assignment. This overrides any raw speaker_id.
+        if "speaker" in updates:
+            speaker_name = (updates.pop("speaker") or "").strip()
+            if not row:
+                raise HTTPException(status_code=404, detail="Section not found")
+            if speaker_name:
+                updates["speaker_id"] = await speakers_repo.aget_or_create_by_name(
+                    row["transcription_id"], speaker_name, uow=uow
                 )
-                await activity_repo.acreate(tag_log)
-    except Exception:
-        pass
+            else:
+                updates["speaker_id"] = None
+
+        if "tags" in updates:
+            updates["tags"] = TranscriptionMapper.serialize_tags(updates["tags"])
+
+        # Stamp modified_at / modified_by
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        updates["modified_at"] = now
+        updates["modified_by"] = current_user_id
+
+        result = await repository.aupdate_section(section_id, updates, uow=uow)
+        status = result.get("status_code", 500)
+        if status >= 400:
+            raise HTTPException(status_code=status, detail=result.get("message"))
+
+        # Log activity (best-effort: a failure only rolls back the savepoint,
+        # never the edit itself)
+        try:
+            async with uow.asavepoint():
+                tid = row["transcription_id"] if row else None
+                if tid:
+                    changed = list(body.model_dump(exclude_none=True).keys())
+                    sec = row.get('section_id', '?')
+                    summary = f"Edited section #{sec}"
+                    if "edited_text" in changed:
+                        summary = f"Edited text in section #{sec}"
+                    elif "speaker" in changed or "speaker_id" in changed:
+                        summary = f"Changed speaker on section #{sec}"
+                    elif "begin_timestamp" in changed or "end_timestamp" in changed:
+                        summary = f"Adjusted timestamps on section #{sec}"
+
+                    log = activity_mapper.to_create_values(
+                        transcription_id=tid,
+                        action="section_edited",
+                        section_id=row.get("section_id"),
+                        summary=summary,
+                        user_id=current_user_id,
+                    )
+                    await activity_repo.acreate(log, uow=uow)
+
+                    # Log a separate entry specifically for tag changes
+                    if "tags" in changed:
+                        tag_list = body.tags or []
+                        if tag_list:
+                            tag_summary = f"Updated tags on section #{sec}: {', '.join(tag_list)}"
+                        else:
+                            tag_summary = f"Removed all tags from section #{sec}"
+                        tag_log = activity_mapper.to_create_values(
+                            transcription_id=tid,
+                            action="tags_updated",
+                            section_id=row.get("section_id"),
+                            summary=tag_summary,
+                            user_id=current_user_id,
+                        )
+                        await activity_repo.acreate(tag_log, uow=uow)
+        except Exception:
+            pass
+
+    if uow.failed:
+        raise HTTPException(status_code=500, detail="Failed to save section changes")
 
     return result
 
@@ -119,61 +166,77 @@ async def update_section(
 async def create_section(
     transcript_id: int,
     body: TranscriptSectionCreate,
+    background_tasks: BackgroundTasks,
     current_user_id: int = Depends(get_current_user_id),
 ):
     """Add a new section to a transcript.
 
     *position* (1-based) controls where the section is inserted.
     When omitted the section is appended at the end.
-    """
-    max_id = await repository.aget_max_section_id(transcript_id)
-    position = body.position if body.position is not None else max_id + 1
 
-    # Clamp to valid range
-    if position < 1:
-        position = 1
-    if position > max_id + 1:
-        position = max_id + 1
-
-    # Shift existing sections at or after the target position
-    if position <= max_id:
-        await repository.ashift_section_ids(transcript_id, from_position=position, delta=1)
-
-    tags_csv = TranscriptionMapper.serialize_tags(body.tags) if body.tags else None
+    The new section gets a sort_key between its two neighbours, so no other
+    row is rewritten. The insert and the activity entry run in one
+    transaction, holding a lock on the transcript so concurrent editors
+    cannot pick the same key. When the gap gets tight, the transcript is
+    re-spaced in the background after the response is sent.
+    """
+    async with repository.aunit_of_work() as uow:
+        await repository.alock_transcript(transcript_id, uow)
+
+        section_count = await repository.aget_section_count(transcript_id, uow=uow)
+        position = body.position if body.position is not None else section_count + 1
+
+        # Clamp to valid range
+        if position < 1:
+            position = 1
+        if position > section_count + 1:
+            position = section_count + 1
+
+        sort_key, crowded = await repository.aallocate_sort_key(transcript_id, position, uow=uow)
+
+        tags_csv = TranscriptionMapper.serialize_tags(body.tags) if body.tags else None
+
+        section_data = {
+            "transcription_id": transcript_id,
+            "section_id": position,
+            "sort_key": sort_key,
+            "speaker_id": body.speaker_id,
+            "speaker": None,
+            "begin_timestamp": body.begin_timestamp,
+            "end_timestamp": body.end_timestamp,
+            "original_text": body.original_text,
+            "edited_text": body.edited_text,
+            "tags": tags_csv,
+        }
+
+        result = await repository.acreate_section(section_data, uow=uow)
+        status = result.get("status_code", 500)
+        if status >= 400:
+            raise HTTPException(status_code=status, detail=result.get("message"))
+
+        # Log activity
+        try:
+            async with uow.asavepoint():
+                log = activity_mapper.to_create_values(
+                    transcription_id=transcript_id,
+                    action="section_added",
+                    section_id=position,
+                    summary=f"Added new section at position #{position}",
+                    user_id=current_user_id,
+                )
+                await activity_repo.acreate(log, uow=uow)
+        except Exception:
+            pass
 
-    section_data = {
-        "transcription_id": transcript_id,
-        "section_id": position,
-        "speaker_id": body.speaker_id,
-        "speaker": None,
-        "begin_timestamp": body.begin_timestamp,
-        "end_timestamp": body.end_timestamp,
-        "original_text": body.original_text,
-        "edited_text": body.edited_text,
-        "tags": tags_csv,
-    }
+    if uow.failed:
+        raise HTTPException(status_code=500, detail="Failed to create section")
 
-    result = await repository.acreate_section(section_data)
-    status = result.get("status_code", 500)
-    if status >= 400:
-        raise HTTPException(status_code=status, detail=result.get("message"))
-
-    # Log activity
-    try:
-        log = activity_mapper.to_create_values(
-            transcription_id=transcript_id,
-            action="section_added",
-            section_id=position,
-            summary=f"Added new section at position #{position}",
-            user_id=current_user_id,
-        )
-        await activity_repo.acreate(log)
-    except Exception:
-        pass
+    if crowded:
+        background_tasks.add_task(repository.arebalance_sections, transcript_id)
 
     return {
         "message": "Section created successfully",
-        "id": result.get("id"),
+        "id": result.get("data", {}).get("id"),
         "section_id": position,
     }
 
@@ -183,40 +246,46 @@ async def delete_section(
     section_id: int,
     current_user_id: int = Depends(get_current_user_id),
 ):
-    """Soft-delete a transcript section and compact the remaining order."""
-    row = await repository.aget_section(section_id)
-    if not row:
-        raise HTTPException(status_code=404, detail="Section not found")
-    if row["is_active"] == 0:
-        raise HTTPException(status_code=404, detail="Section already deleted")
-
-    transcript_id = row["transcription_id"]
-
-    result = await repository.adeactivate_section(section_id)
-    status = result.get("status_code", 500)
-    if status >= 400:
-        raise HTTPException(status_code=status, detail=result.get("message"))
-
-    # Re-compact section_ids so there are no gaps. Best-effort: the soft-delete
-    # above is already committed, so a hiccup while renumbering must NOT surface
-    # as a 500 — that would make a delete that actually succeeded look broken to
-    # the client (which then leaves the stale row on screen and re-tries).
-    try:
-        await repository.acompact_section_ids(transcript_id)
-    except Exception:
-        pass
-
-    # Log activity
-    try:
-        log = activity_mapper.to_create_values(
-            transcription_id=transcript_id,
-            action="section_deleted",
-            section_id=row.get("section_id"),
-            summary=f"Deleted section #{row.get('section_id', '?')}",
-            user_id=current_user_id,
-        )
-        await activity_repo.acreate(log)
-    except Exception:
-        pass
+    """Soft-delete a transcript section.
+
+    Positions are computed from sort_key on read, so the remaining sections
+    need no renumbering. The soft-delete and the activity entry commit
+    together.
+    """
+    async with repository.aunit_of_work() as uow:
+        row = await repository.aget_section(section_id, uow=uow)
+        if not row:
+            raise HTTPException(status_code=404, detail="Section not found")
+
+        transcript_id = row["transcription_id"]
+        await repository.alock_transcript(transcript_id, uow)
+        # re-read under the lock: a concurrent delete or insert may have landed since
+        row = await repository.aget_section(section_id, uow=uow)
+        if row["is_active"] == 0:
+            raise HTTPException(status_code=404, detail="Section already deleted")
+
+        result = await repository.adeactivate_section(section_id, uow=uow)
+        status = result.get("status_code", 500)
+        if status == 404:
+            raise HTTPException(status_code=404, detail="Section already deleted")
+        if status >= 400:
+            raise HTTPException(status_code=status, detail=result.get("message"))
+
+        # Log activity
+        try:
+            async with uow.asavepoint():
+                log = activity_mapper.to_create_values(
+                    transcription_id=transcript_id,
+                    action="section_deleted",
+                    section_id=row.get("section_id"),
+                    summary=f"Deleted section #{row.get('section_id', '?')}",
+                    user_id=current_user_id,
+                )
+                await activity_repo.acreate(log, uow=uow)
+        except Exception:
+            pass
+
+    if uow.failed:
+        raise HTTPException(status_code=500, detail="Failed to delete section")
 
     return {"message": "Section deleted successfully", "deleted_section_id": section_id}
@@ -46,3 +46,21 @@ class TranscriptUpdate(BaseModel):
     tags: Optional[List[str]] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class TranscriptSearchHit(BaseModel):
+    id: int                                   # section primary key
+    transcription_id: int
+    transcript_title: Optional[str] = None
+    section_id: Optional[int] = None          # 1-based position in the transcript
+    speaker_id: Optional[int] = None
+    speaker: Optional[str] = None
+    begin_timestamp: Optional[str] = None
+    begin_ms: Optional[int] = None
+    snippet: str = ""                         # HTML: escaped text, matches in <mark>
+    rank: float
+
+
+class TranscriptSearchPage(BaseModel):
+    hits: List[TranscriptSearchHit] = []
+    next_cursor: Optional[str] = None         # pass as ?cursor= for the next page; None on the last
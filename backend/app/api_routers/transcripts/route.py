@@ -1,21 +1,28 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Depends
+from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, Header, Query, Response
 
 from app.api_routers.transcripts.data_model import (
     Transcript,
     TranscriptCreate,
+    TranscriptSearchHit,
+    TranscriptSearchPage,
     TranscriptUpdate,
 )
 from app.auth.dependencies import get_current_user_id
 from app.mappers.activity_log_mapper import ActivityLogMapper
+from app.mappers.transcript_search import decode_cursor, encode_cursor, highlight
 from app.repositories.transcripts.controller import TranscriptsRepository
+from app.repositories.transcription.controller import TranscriptRepository
 from app.repositories.activity_log.controller import ActivityLogRepository
-from app.services.transcript_process.service import TranscriptProcessService
+from app.services.jobs.queue import JobQueue
+from app.services.transcript_process.service import TRANSCRIPT_UPLOAD_JOB, TranscriptProcessService
 from app.services.transcript_process.exceptions import TranscriptUploadError
 
 router = APIRouter(prefix="/transcripts")
 
 repository = TranscriptsRepository()
+section_repository = TranscriptRepository()
 transcript_service = TranscriptProcessService()
+job_queue = JobQueue()
 activity_repo = ActivityLogRepository()
 activity_mapper = ActivityLogMapper()
 
@@ -26,6 +33,34 @@ async def get_all_transcripts():
     return [Transcript(**row).model_dump() for row in data]
 
 
+# registered before /{transcript_id}, which would otherwise reject "search" as an id
+@router.get("/search")
+async def search_transcripts(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None),
+    transcript_id: int | None = Query(None),
+):
+    """Full-text search over the text of every active transcript's sections.
+
+    ``q`` takes web-search syntax: ``"exact phrase"``, ``or``, ``-word``.
+    Hits are ranked best first, with an HTML ``snippet`` of the matching
+    text. Pages are keyset-based: pass ``next_cursor`` back as ``cursor`` to
+    get the next page. ``transcript_id`` restricts the search to one
+    transcript.
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    rows = await section_repository.asearch_sections(
+        q.strip(), limit=limit, after=after, transcript_id=transcript_id
+    )
+    hits = [TranscriptSearchHit(**{**row, "snippet": highlight(row.get("snippet"))}) for row in rows]
+    next_cursor = encode_cursor(hits[-1].rank, hits[-1].id) if len(hits) == limit else None
+    return TranscriptSearchPage(hits=hits, next_cursor=next_cursor).model_dump()
+
+
 @router.get("/{transcript_id}")
 async def get_transcript(transcript_id: int):
     data = await repository.get(transcript_id)
@@ -91,11 +126,13 @@ async def delete_transcript(transcript_id: int):
         raise HTTPException(status_code=status, detail=result.get("message"))
 
 
-@router.post("/{transcript_id}/upload-audio", status_code=201)
+@router.post("/{transcript_id}/upload-audio", status_code=202)
 async def upload_audio_file(
     transcript_id: int,
+    response: Response,
     audio_file: UploadFile = File(...),
-    transcript_file: UploadFile = File(...),
+    transcript_file: UploadFile | None = File(default=None),
+    idempotency_key: str | None = Header(default=None, max_length=200),
     current_user_id: int = Depends(get_current_user_id),
 ):
     """
@@ -107,29 +144,54 @@ async def upload_audio_file(
 
         speaker timestamp
         text
+
+    The transcript file may be left out when server-side transcription is
+    enabled (``Transcription.Engine``); the audio is then transcribed and
+    diarized by the job instead.
+
+    The files are checked and staged, then ingested by a background job:
+    the response is ``202`` with the job (``Location: /jobs/{job_id}``) to
+    poll. Send an ``Idempotency-Key`` header to make retries of this request
+    return the original job instead of queueing the upload twice.
     """
     # Verify transcript exists
     transcript = await repository.get(transcript_id)
     if transcript is None:
         raise HTTPException(status_code=404, detail="Transcript not found")
 
-    try:
-        result = await transcript_service.upload_transcript(
-            transcript_id,
-            audio_file=audio_file,
-            transcript_file=transcript_file,
-            user_id=current_user_id,
-        )
-        status = result.get("status_code", 500)
-        if status >= 400:
-            raise HTTPException(status_code=status, detail=result.get("message"))
-        return result
-    except TranscriptUploadError as e:
-        # Bad audio / bad transcript — structured, user-facing error for the UI.
-        raise HTTPException(status_code=e.status_code, detail=e.to_dict())
-    except HTTPException:
-        raise
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to upload files: {str(e)}")
+    # keys are client-chosen, so scope them to the caller
+    key = f"{current_user_id}:{idempotency_key}" if idempotency_key else None
+    job = await job_queue.aget_by_key(key) if key else None
+
+    if job is None:
+        try:
+            payload = await transcript_service.astage_upload(
+                transcript_id,
+                audio_file=audio_file,
+                transcript_file=transcript_file,
+                user_id=current_user_id,
+            )
+            job, created = await job_queue.aenqueue(
+                TRANSCRIPT_UPLOAD_JOB,
+                payload,
+                transcription_id=transcript_id,
+                idempotency_key=key,
+                user_id=current_user_id,
+            )
+            if not created:
+                # a concurrent retry with the same key won; drop our copy
+                await transcript_service.adiscard_staged(payload)
+        except TranscriptUploadError as e:
+            # Bad audio / bad transcript — structured, user-facing error for the UI.
+            raise HTTPException(status_code=e.status_code, detail=e.to_dict())
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to upload files: {str(e)}")
+
+    response.headers["Location"] = f"/jobs/{job.id}"
+    return {
+        'status_code': 202,
+        'message': f'Accepted, ingestion job {job.id} is {job.status}',
+        'data': job.model_dump(),
+    }
@@ -59,6 +59,23 @@ class StorageSettings(BaseModel):
   AccountName: str = ""
   Url: str = ""
   PoolSize: int = 5
+  # Seconds to wait for a free storage client before failing the request
+  PoolAcquireTimeoutSeconds: float = 30
+  # Worker threads running blocking SDK calls for the async storage methods
+  # (defaults to PoolSize: more threads would only wait for a pooled client)
+  ExecutorWorkers: Optional[int] = None
+  # Answer GET /transcripts/{id}/audio with a 307 to a signed read-only URL
+  # instead of proxying the bytes (overridable per request with ?redirect=)
+  AudioRedirect: bool = False
+  SignedUrlMinutes: int = 15
+  # Optional read-through disk cache for blobs (audio); off when no directory
+  DiskCacheDir: Optional[str] = None
+  DiskCacheMaxMB: int = 2048
+  # Threads copying whole blobs into the disk cache, apart from ExecutorWorkers
+  # so cold recordings being cached never hold up request-path storage calls
+  DiskCacheWorkers: int = 2
+  # Block size for streamed uploads (Azure staged blocks / S3 multipart parts)
+  UploadBlockSizeMB: int = 8
   # DigitalOcean Spaces / S3 fields (optional so an Azure config also validates)
   Bucket: Optional[str] = None
   Region: Optional[str] = None
@@ -71,6 +88,37 @@ class Storage(BaseModel):
   ServiceProvider: str
   Settings: StorageSettings
 
+class JobSettings(BaseModel):
+  # "Local": workers run as tasks inside the API process (dev / single box).
+  # "Database": the API only enqueues; `python -m app.worker` processes claim
+  # jobs from ingest_jobs_t.
+  Broker: str = "Local"
+  Workers: int = 1
+  PollSeconds: float = 2.0
+  MaxAttempts: int = 3
+  RetryBaseSeconds: float = 10.0
+  # a running job not heard from for this long is assumed lost and requeued
+  StaleAfterSeconds: int = 900
+
+class TranscriptionSettings(BaseModel):
+  # "" = off (uploads must include a transcript file); "nemo" = Parakeet ASR +
+  # NeMo diarization on CPU (needs nemo-toolkit[asr]); "stub" = fake, for tests
+  Engine: str = ""
+  Model: str = "nvidia/parakeet-tdt-0.6b-v3"
+  MaxSpeakers: int = 8
+  # worker processes, each holding one copy of the model in memory
+  Workers: int = 1
+  # audio windows transcribed per model call, and how long to wait for a batch to fill
+  BatchSize: int = 4
+  BatchWindowSeconds: float = 2.0
+  # recordings are transcribed in windows of this many seconds (bounds memory),
+  # overlapping so words cut at a window edge are heard whole by the neighbour
+  WindowSeconds: float = 60.0
+  OverlapSeconds: float = 4.0
+  # label speakers per word and split segments where the speaker changes,
+  # instead of one speaker per ASR segment
+  WordLevelSpeakers: bool = False
+
 class build_information(BaseModel):
   init_time: str
   build_number: str
@@ -85,5 +133,7 @@ class AppConfig(BaseModel):
   SecretManager: SecretManager
   TransactionalDatabase: TransactionalDatabase
   Storage: Storage
+  Jobs: JobSettings = JobSettings()
+  Transcription: TranscriptionSettings = TranscriptionSettings()
   BuildInformation: build_information
   
\ No newline at end of file
@@ -0,0 +1,24 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from datetime import datetime
+
+
+class IngestJobEntry(BaseModel):
+    """Read model returned by the API (the handler payload stays internal)."""
+    id: int
+    job_type: str
+    transcription_id: Optional[int] = None
+    status: str                                  # queued | running | succeeded | failed
+    stage: Optional[str] = None
+    progress: int = 0                            # 0-100
+    attempts: int = 0
+    max_attempts: int = 0
+    result: Optional[dict] = None
+    error: Optional[dict] = None                 # {message, code, file} of the last failure
+    run_after: Optional[datetime] = None         # when a queued retry becomes eligible
+    created_by: Optional[int] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Identity, UniqueConstraint
+from app.db_models.base import Base, Schema
+
+
+class IngestJobsT(Base):
+    """Background job (currently: audio + transcript ingestion).
+
+    Workers claim ``queued`` rows whose ``run_after`` has passed with
+    ``SELECT ... FOR UPDATE SKIP LOCKED``, so several worker processes can
+    share the table without handing the same job out twice. ``idempotency_key``
+    lets a client retry the enqueue request without creating a second job.
+    """
+    __tablename__ = 'ingest_jobs_t'
+    __table_args__ = (
+        UniqueConstraint('idempotency_key', name='uq_ingest_jobs_idempotency_key'),
+        {'schema': Schema},
+    )
+
+    id = Column(Integer, primary_key=True, nullable=False, server_default=Identity(start=1, increment=1))
+    job_type = Column(String(50), nullable=False)                 # e.g. transcript_upload
+    transcription_id = Column(Integer, nullable=True)
+    idempotency_key = Column(String(255), nullable=True)
+
+    status = Column(String(20), nullable=False, default='queued')  # queued | running | succeeded | failed
+    stage = Column(String(100), nullable=True)                     # human-readable step, e.g. "writing sections"
+    progress = Column(Integer, nullable=False, default=0)          # 0-100
+    payload = Column(Text, nullable=True)                          # JSON input for the handler
+    result = Column(Text, nullable=True)                           # JSON output on success
+    error = Column(Text, nullable=True)                            # JSON {message, code, file} of the last failure
+
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(DateTime, nullable=False)                   # not claimable before (retry backoff)
+    locked_by = Column(String(100), nullable=True)                 # worker id while running
+    heartbeat_at = Column(DateTime, nullable=True)                 # last sign of life from that worker
+
+    created_by = Column(Integer, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
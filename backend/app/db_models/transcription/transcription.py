@@ -1,6 +1,11 @@
-from sqlalchemy import Column, Integer, String, Identity, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, Identity, Text, DateTime, ForeignKey, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from app.db_models.base import Base, Schema
 
+# text search configuration of transcript_details_t.search_vector: lessons are
+# multilingual, so words are lower-cased but not stemmed
+SEARCH_CONFIG = 'simple'
+
 
 class TranscriptSpeakersT(Base):
     __tablename__ = 'transcript_speakers_t'
@@ -53,17 +58,25 @@ class TranscriptDetailsT(Base):
     id = Column(Integer, primary_key=True, nullable=False, server_default=Identity(start=1, increment=1))
 
     transcription_id = Column(Integer, nullable=True)
-    section_id = Column(Integer, nullable=True)
+    section_id = Column(Integer, nullable=True)            # position snapshot; the API computes positions from sort_key
+    sort_key = Column(BigInteger, nullable=True)           # sparse ordering key (gaps of SECTION_KEY_GAP)
     speaker_id = Column(Integer, ForeignKey(f'{Schema}.transcript_speakers_t.id'), nullable=True)
     speaker = Column(String(200), nullable=True)
     begin_timestamp = Column(String(50), nullable=True)
     end_timestamp = Column(String(50), nullable=True)
+    begin_ms = Column(Integer, nullable=True)              # begin_timestamp in milliseconds, for range queries
+    end_ms = Column(Integer, nullable=True)                # end_timestamp in milliseconds
     original_text = Column(Text, nullable=True)
     edited_text = Column(Text, nullable=True)
     tags = Column(Text, nullable=True)
     modified_at = Column(DateTime, nullable=True)
     modified_by = Column(Integer, nullable=True)
     is_active = Column(Integer, nullable=False, default=1)
+    # full-text search over the text as shown (edited, else original); kept up to date by Postgres
+    search_vector = Column(
+        TSVECTOR().with_variant(Text, 'sqlite'),
+        Computed(f"to_tsvector('{SEARCH_CONFIG}', coalesce(edited_text, original_text, ''))", persisted=True),
+    )
 
 
 class TranscriptDetailsCommentsT(Base):
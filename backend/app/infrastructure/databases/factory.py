@@ -38,14 +38,29 @@ class DatabaseFactory:
     def delete(self, stmt):
         return self.database_provider.delete(stmt)
     
+    @property
+    def dialect_name(self):
+        return self.database_provider.dialect_name
+
+    def aunit_of_work(self):
+        return self.database_provider.aunit_of_work()
+
     async def aread(self, query):
         result = await self.database_provider.aread(query)
         return result
     
+    async def astream(self, query, batch_size=1000):
+        async for rows in self.database_provider.astream(query, batch_size=batch_size):
+            yield rows
+
     async def acreate(self, query):
         result = await self.database_provider.acreate(query)
         return result    
     
+    async def acreate_many(self, query, rows, before=()):
+        result = await self.database_provider.acreate_many(query, rows, before=before)
+        return result
+
     async def aupdate(self, query):
         result = await self.database_provider.aupdate(query)
         return result    
@@ -0,0 +1,48 @@
+"""
+Turn SQLAlchemy result rows into plain ``dict`` records.
+
+This replaces the old ``pd.DataFrame(rows).astype(object)`` /
+``df.where(df.notnull(), None)`` / ``to_dict(orient='records')`` round trip in
+``SQLFactory``. Building a DataFrame copied every row into column arrays and
+then back out again, and it also had side effects callers did not want (an int
+column containing a NULL came back as floats, datetimes came back as
+``pd.Timestamp``). Here we zip the result's column keys straight onto each row
+tuple, so values are passed through exactly as the driver returned them.
+
+Null handling is pluggable: the default normaliser only turns float ``NaN``
+into ``None`` (the one null-like value a driver can hand back that the old
+pandas path used to clean up). Pass ``null_normalizer=None`` to skip
+normalisation entirely, or any ``callable(value) -> value`` to customise it.
+"""
+
+import math
+from typing import Any, Callable, Iterable, Sequence
+
+NullNormalizer = Callable[[Any], Any]
+
+
+def normalize_null(value: Any) -> Any:
+    """Map float ``NaN`` to ``None``; return every other value untouched."""
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+class RowMapper:
+    def __init__(self, null_normalizer: NullNormalizer | None = normalize_null):
+        self.null_normalizer = null_normalizer
+
+    def map_rows(self, keys: Sequence[str], rows: Iterable[Sequence[Any]]) -> list[dict]:
+        """Map an iterable of row tuples onto *keys* and return a list of dicts."""
+        keys = list(keys)
+        normalize = self.null_normalizer
+        if normalize is None:
+            return [dict(zip(keys, row)) for row in rows]
+        return [
+            {key: normalize(value) for key, value in zip(keys, row)}
+            for row in rows
+        ]
+
+    def map_result(self, result) -> list[dict]:
+        """Fetch every row from a SQLAlchemy ``Result`` and map it."""
+        return self.map_rows(result.keys(), result.fetchall())
@@ -1,6 +1,5 @@
 import os
 import urllib
-import pandas as pd
 from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Session
@@ -10,6 +9,8 @@ from sqlalchemy import text
 
 from app.config.app_logging import AppLogging
 from app.config.app_settings import SettingsConfig
+from app.infrastructure.databases.row_mapper import RowMapper
+from app.infrastructure.databases.unit_of_work import SQLUnitOfWork
 
 class SQLFactory:
 
@@ -26,6 +27,7 @@ class SQLFactory:
         self._general_settings = SettingsConfig().settings
         self._settings = SettingsConfig().settings.TransactionalDatabase.Settings
         self._logger = AppLogging().logger
+        self.row_mapper = RowMapper()
         self.conn_string = self.generate_connection_string()
 
         sync_connect_args = {}
@@ -160,13 +162,11 @@ class SQLFactory:
         try:
             response_body = {'status_code': None, 'message': None, 'data': []}
             session = Session(bind=self.engine, autocommit=False, autoflush=False)
-            data_rows = session.execute(query).fetchall()
-            if len(data_rows) == 0:
+            data_rows_dict = self.row_mapper.map_result(session.execute(query))
+            if len(data_rows_dict) == 0:
                 response_body['status_code'] = 404
                 response_body['message'] = 'No records were found that match the query criteria.'
             else:
-                df = pd.DataFrame(data_rows).astype(object)
-                data_rows_dict = df.where(df.notnull(), None).to_dict(orient='records')
                 response_body['status_code'] = 200
                 response_body['message'] = 'Success'
                 response_body['data'] = data_rows_dict
@@ -209,87 +209,61 @@ class SQLFactory:
         finally:
             session.close()
     
-    async def aread(self, query):
+    @property
+    def dialect_name(self):
+        return self.aengine.dialect.name
+
+    def aunit_of_work(self):
+        """Start a unit of work: several statements, one session, one commit."""
+        return SQLUnitOfWork(self.aengine, self.row_mapper, self._logger)
+
+    # The single-statement async helpers below are each a one-statement unit of
+    # work, so they share its envelope handling and commit/rollback rules.
+
+    async def _arun_single(self, operation):
         try:
-            response_body = {'status_code': None, 'message': None, 'data': []}
-            async with AsyncSession(bind=self.aengine, autocommit=False, autoflush=False) as session:
-                result = await session.execute(query)
-                data_rows = result.fetchall()
-                if len(data_rows) == 0:
-                    response_body['status_code'] = 404
-                    response_body['message'] = 'No records were found that match the query criteria.'
-                else:
-                    df = pd.DataFrame(data_rows).astype(object)
-                    data_rows_dict = df.where(df.notnull(), None).to_dict(orient='records')
-                    response_body['status_code'] = 200
-                    response_body['message'] = 'Success'
-                    response_body['data'] = data_rows_dict
-            return response_body
+            async with self.aunit_of_work() as uow:
+                return await operation(uow)
         except Exception as e:
-            response_body['status_code'] = 500
-            response_body['message'] = str(e)
-            response_body['data'] = []
+            # e.g. the commit itself failed after the statement succeeded
             self._logger.exception(e, exc_info=True)
-            return response_body
+            return {'status_code': 500, 'message': str(e), 'data': []}
 
-    async def acreate(self, stmt):
-        try:
-            response_body = {'status_code': None, 'message': None, 'data': []}
-            async with AsyncSession(bind=self.aengine, autocommit=False, autoflush=True) as session:
-                result = await session.execute(stmt.returning(stmt.table.c.id))
-                created_id = result.scalar()
-                
-                await session.commit()
+    async def aread(self, query):
+        return await self._arun_single(lambda uow: uow.aread(query))
 
-                response_body['status_code'] = 201
-                response_body['message'] = 'Success, Created record with Id: {}'.format(created_id)
-                response_body['data'] = {"id": created_id}
+    async def astream(self, query, batch_size=1000):
+        """Yield mapped rows in lists of up to *batch_size* using a server-side cursor.
 
-            return response_body
-        
+        Unlike ``aread`` the full result is never held in memory, so this is the
+        path for exports and scans over whole transcripts / the whole corpus.
+        The session (and its pooled connection) stays checked out until the
+        caller finishes iterating or closes the generator.
+        """
+        try:
+            async with AsyncSession(bind=self.aengine, autocommit=False, autoflush=False) as session:
+                result = await session.stream(query.execution_options(yield_per=batch_size))
+                keys = list(result.keys())
+                async for partition in result.partitions(batch_size):
+                    yield self.row_mapper.map_rows(keys, partition)
         except Exception as e:
-            response_body['status_code'] = 500
-            response_body['message'] = str(e)
             self._logger.exception(e, exc_info=True)
-            
-            return response_body
+            raise
 
-    async def aupdate(self, stmt):
-        try:
-            response_body = {'status_code': None, 'message': None, 'data': []}
-            async with AsyncSession(bind=self.aengine, autocommit=False, autoflush=False) as session:
-                result = await session.execute(stmt)
-                await session.commit()
-            
-            response_body['status_code'] = 200
-            response_body['message'] = 'Success, Updated {} records'.format(result.rowcount)
+    async def acreate(self, stmt):
+        return await self._arun_single(lambda uow: uow.acreate(stmt))
 
-            return response_body
+    async def acreate_many(self, stmt, rows, before=()):
+        """Insert *rows* with a single executemany/multi-row VALUES statement.
 
-        except Exception as e:
-            response_body['status_code'] = 500
-            response_body['message'] = str(e)
-            self._logger.exception(e, exc_info=True)
-            return response_body
+        Every statement in *before* (e.g. deactivating the rows being replaced)
+        runs first in the same transaction, so readers see either the old rows
+        or the new ones and never a half-written mix.
+        """
+        return await self._arun_single(lambda uow: uow.acreate_many(stmt, rows, before=before))
+
+    async def aupdate(self, stmt):
+        return await self._arun_single(lambda uow: uow.aupdate(stmt))
 
     async def adelete(self, stmt):
-        try:
-            response_body = {'status_code': None, 'message': None, 'data': []}
-            async with AsyncSession(bind=self.aengine, autocommit=False, autoflush=False) as session:
-                result = await session.execute(stmt)
-                await session.commit()
-                if result.rowcount == 0:
-                    response_body['status_code'] = 404
-                    response_body['message'] = 'No records found matching the query criteria'
-                else:
-                    response_body['status_code'] = 200
-                    response_body['message'] = 'Success, Deleted {} records'.format(result.rowcount)
-            
-            return response_body
-        
-        except Exception as e:
-            response_body['status_code'] = 500
-            response_body['message'] = str(e)
-            self._logger.exception(e, exc_info=True)
-            
-            return response_body
+        return await self._arun_single(lambda uow: uow.adelete(stmt))
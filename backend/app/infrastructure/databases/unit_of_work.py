@@ -0,0 +1,152 @@
+from contextlib import asynccontextmanager
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class SQLUnitOfWork:
+    """One session / one transaction shared by several statements.
+
+    Exposes the same ``aread`` / ``acreate`` / ``acreate_many`` / ``aupdate`` /
+    ``adelete`` methods (and the same ``{'status_code','message','data'}``
+    envelopes) as ``DatabaseFactory``, so a repository method can run against
+    either one. Use it as an async context manager::
+
+        async with database.aunit_of_work() as uow:
+            await repo.alock_transcript(transcript_id, uow)
+            await repo.acreate_section(data, uow=uow)
+
+    The transaction commits when the block exits cleanly. It rolls back if the
+    block raises, or if any statement failed (failures are reported through the
+    envelope exactly like the single-statement methods, and also flip
+    ``failed``).
+    """
+
+    def __init__(self, engine, row_mapper, logger):
+        self._engine = engine
+        self._row_mapper = row_mapper
+        self._logger = logger
+        self.session = None
+        self.failed = False
+
+    @property
+    def dialect_name(self):
+        return self._engine.dialect.name
+
+    async def __aenter__(self):
+        self.session = AsyncSession(bind=self._engine, autocommit=False, autoflush=False)
+        self.failed = False
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None and not self.failed:
+                await self.session.commit()
+            else:
+                await self.session.rollback()
+        finally:
+            await self.session.close()
+        return False
+
+    @asynccontextmanager
+    async def asavepoint(self):
+        """Run a block inside a SAVEPOINT.
+
+        If a statement in the block fails (or the block raises) only the work
+        since the savepoint is rolled back, leaving the outer transaction
+        usable. Exceptions are re-raised; failed envelopes are not.
+        """
+        failed_before = self.failed
+        nested = await self.session.begin_nested()
+        try:
+            yield self
+        except Exception:
+            await nested.rollback()
+            self.failed = failed_before
+            raise
+        if self.failed and not failed_before:
+            await nested.rollback()
+            self.failed = failed_before
+        else:
+            await nested.commit()
+
+    def _fail(self, response_body, e):
+        self.failed = True
+        response_body['status_code'] = 500
+        response_body['message'] = str(e)
+        self._logger.exception(e, exc_info=True)
+        return response_body
+
+    async def aread(self, query):
+        response_body = {'status_code': None, 'message': None, 'data': []}
+        try:
+            result = await self.session.execute(query)
+            data_rows_dict = self._row_mapper.map_result(result)
+            if len(data_rows_dict) == 0:
+                response_body['status_code'] = 404
+                response_body['message'] = 'No records were found that match the query criteria.'
+            else:
+                response_body['status_code'] = 200
+                response_body['message'] = 'Success'
+                response_body['data'] = data_rows_dict
+            return response_body
+        except Exception as e:
+            response_body['data'] = []
+            return self._fail(response_body, e)
+
+    async def acreate(self, stmt):
+        response_body = {'status_code': None, 'message': None, 'data': []}
+        try:
+            result = await self.session.execute(stmt.returning(stmt.table.c.id))
+            created_id = result.scalar()
+
+            response_body['status_code'] = 201
+            response_body['message'] = 'Success, Created record with Id: {}'.format(created_id)
+            response_body['data'] = {"id": created_id}
+            return response_body
+        except Exception as e:
+            return self._fail(response_body, e)
+
+    async def acreate_many(self, stmt, rows, before=()):
+        response_body = {'status_code': None, 'message': None, 'data': []}
+        try:
+            for before_stmt in before:
+                await self.session.execute(before_stmt)
+            created_ids = []
+            if rows:
+                result = await self.session.execute(
+                    stmt.returning(stmt.table.c.id, sort_by_parameter_order=True),
+                    rows,
+                )
+                created_ids = list(result.scalars())
+
+            response_body['status_code'] = 201
+            response_body['message'] = 'Success, Created {} records'.format(len(created_ids))
+            response_body['data'] = {"ids": created_ids}
+            return response_body
+        except Exception as e:
+            return self._fail(response_body, e)
+
+    async def aupdate(self, stmt):
+        response_body = {'status_code': None, 'message': None, 'data': []}
+        try:
+            result = await self.session.execute(stmt)
+
+            response_body['status_code'] = 200
+            response_body['message'] = 'Success, Updated {} records'.format(result.rowcount)
+            return response_body
+        except Exception as e:
+            return self._fail(response_body, e)
+
+    async def adelete(self, stmt):
+        response_body = {'status_code': None, 'message': None, 'data': []}
+        try:
+            result = await self.session.execute(stmt)
+            if result.rowcount == 0:
+                response_body['status_code'] = 404
+                response_body['message'] = 'No records found matching the query criteria'
+            else:
+                response_body['status_code'] = 200
+                response_body['message'] = 'Success, Deleted {} records'.format(result.rowcount)
+            return response_body
+        except Exception as e:
+            return self._fail(response_body, e)
@@ -1,10 +1,13 @@
-from azure.storage.blob import BlobServiceClient, generate_container_sas, generate_blob_sas, ContainerSasPermissions, BlobSasPermissions
+from azure.storage.blob import BlobServiceClient, BlobBlock, generate_container_sas, generate_blob_sas, ContainerSasPermissions, BlobSasPermissions
 from datetime import datetime, timedelta, timezone
+import time
 
-from queue import Queue
+from azure.core.exceptions import ResourceNotFoundError, ServiceRequestError, ServiceResponseError
 
 from app.config.app_settings import SettingsConfig
 from app.config.app_logging import AppLogging
+from app.infrastructure.storage.blocks import iter_blocks, block_id
+from app.infrastructure.storage.client_pool import ClientPool
 
 class AzureBlobStorageFactory:
     _instance = None
@@ -24,59 +27,77 @@ class AzureBlobStorageFactory:
         self._connection_string = self._settings.ConnectionString
         self._container_name = self._settings.ContainerName
         self._pool_size = self._settings.PoolSize
+        self._block_size = self._settings.UploadBlockSizeMB * 1024 * 1024
 
-        self.pool = Queue(maxsize=self._pool_size)
-        for _ in range(self._pool_size):
-            self.pool.put(self._create_client())
+        # Clients are built on first use; one whose transport failed is
+        # dropped and replaced rather than handed out again.
+        self.pool = ClientPool(
+            self._create_client,
+            max_size=self._pool_size,
+            acquire_timeout=self._settings.PoolAcquireTimeoutSeconds,
+            recycle_on=(ServiceRequestError, ServiceResponseError),
+        )
 
     def _create_client(self):
         return BlobServiceClient.from_connection_string(self._connection_string)
 
     def get_client(self):
-        return self.pool.get()
+        return self.pool.acquire()
 
-    def release_client(self, client):
-        self.pool.put(client)
+    def release_client(self, client, discard=False):
+        self.pool.release(client, discard=discard)
+
+    def pool_stats(self):
+        return self.pool.metrics()
+
+    @staticmethod
+    def is_not_found(error):
+        """Whether *error* means the blob does not exist."""
+        return isinstance(error, ResourceNotFoundError)
+
+    @property
+    def container_name(self):
+        return self._container_name
 
     def upload(self, file_bytes, blob_path):
-        client = self.get_client()
-        try:
+        with self.pool.client() as client:
             container_client = client.get_container_client(self._container_name)
             blob_client = container_client.get_blob_client(blob_path)
             message = blob_client.upload_blob(file_bytes, overwrite=True)
             return message
-        finally:
-            self.release_client(client)
+
+    def upload_stream(self, fileobj, blob_path, block_size=None):
+        """Upload a file-like object as staged blocks, one block in memory at a time."""
+        with self.pool.client() as client:
+            container_client = client.get_container_client(self._container_name)
+            blob_client = container_client.get_blob_client(blob_path)
+            block_ids = []
+            for index, block in enumerate(iter_blocks(fileobj, block_size or self._block_size)):
+                current_id = block_id(index)
+                blob_client.stage_block(current_id, block, length=len(block))
+                block_ids.append(BlobBlock(block_id=current_id))
+            # committing replaces any existing blob, like upload_blob(overwrite=True)
+            return blob_client.commit_block_list(block_ids)
 
     def delete(self, blob_path):
-        client = self.get_client()
-        try:
+        with self.pool.client() as client:
             container_client = client.get_container_client(self._container_name)
             message = container_client.delete_blob(blob_path)
             return message
-        finally:
-            self.release_client(client)
 
     def read(self, blob_path):
-        client = self.get_client()
-        try:
+        with self.pool.client() as client:
             container_client = client.get_container_client(self._container_name)
             blob_client = container_client.get_blob_client(blob_path)
             blob_data = blob_client.download_blob().readall()
             return blob_data
-        finally:
-            self.release_client(client)
     def get_container_url(self):
-        client = self.get_client()
-        try:
+        with self.pool.client() as client:
             container_client = client.get_container_client(self._container_name)
             return container_client.url
-        finally:
-            self.release_client(client)
 
     def generate_container_sas_url(self, expiry_hours=1):
-        client = self.get_client()
-        try:
+        with self.pool.client() as client:
             sas_token = generate_container_sas(
                 account_name=client.account_name,
                 container_name=self._container_name,
@@ -86,12 +107,9 @@ class AzureBlobStorageFactory:
             )
             container_url = f"https://{client.account_name}.blob.core.windows.net/{self._container_name}?{sas_token}"
             return container_url
-        finally:
-            self.release_client(client)
     
     def generate_blob_sas_url(self, blob_path, expiry_hours=24, container_name=None):
-        client = self.get_client()
-        try:
+        with self.pool.client() as client:
             target_container = container_name or self._container_name
             # Use UTC for SAS token times to avoid timezone issues with Azure
             now_utc = datetime.now(timezone.utc)
@@ -109,87 +127,135 @@ class AzureBlobStorageFactory:
             #blob_url = f"https://{client.account_name}.blob.core.usgovcloudapi.net/{self.container_name}/{blob_path}"
             blob_url = blob_url.replace(' ', '%20')
             return blob_url
-        finally:
-            self.release_client(client)
     
+    def generate_read_url(self, blob_path, expiry_minutes=15, content_type=None):
+        """Short-lived, read-only SAS URL for a single blob."""
+        with self.pool.client() as client:
+            blob_client = client.get_blob_client(self._container_name, blob_path)
+            now_utc = datetime.now(timezone.utc)
+            sas_token = generate_blob_sas(
+                account_name=client.account_name,
+                container_name=self._container_name,
+                blob_name=blob_path,
+                account_key=client.credential.account_key,
+                permission=BlobSasPermissions(read=True),
+                start=now_utc - timedelta(minutes=5),  # clock skew
+                expiry=now_utc + timedelta(minutes=expiry_minutes),
+                content_type=content_type,
+            )
+            return f"{blob_client.url}?{sas_token}"
+
     def list_files(self, folder_path):
-        client = self.get_client()
-        try:
+        with self.pool.client() as client:
             container_client = client.get_container_client(self._container_name)
             blob_list = container_client.list_blobs(name_starts_with=folder_path)
             blob_names = [blob.name for blob in blob_list if blob.name != folder_path]            
             return blob_names
-        finally:
-            self.release_client(client)
 
     def stream_blob(self, blob_path):
-        client = self.get_client()
-        try:
+        # the pooled client stays checked out until the chunks are consumed
+        return self.pool.stream(
+            lambda client: client.get_blob_client(self._container_name, blob_path).download_blob().chunks()
+        )
+    
+    def get_blob_info(self, blob_path):
+        """Size in bytes and ETag of a blob, from its properties alone."""
+        with self.pool.client() as client:
             container_client = client.get_container_client(self._container_name)
             blob_client = container_client.get_blob_client(blob_path)
+            props = blob_client.get_blob_properties()
+            return {"size": props.size, "etag": props.etag}
+
+    def stream_range(self, blob_path, offset=0, length=None):
+        """Stream *length* bytes of a blob starting at *offset* (to the end if None)."""
+        return self.pool.stream(
+            lambda client: client.get_blob_client(self._container_name, blob_path)
+            .download_blob(offset=offset, length=length)
+            .chunks()
+        )
 
-            # Stream the blob in chunks
-            stream = blob_client.download_blob()
-            return stream.chunks()
-        finally:
-            self.release_client(client)
-    
     def get_blob_size(self, blob_path):
         """Get the size of a blob in bytes."""
-        client = self.get_client()
-        try:
+        with self.pool.client() as client:
             container_client = client.get_container_client(self._container_name)
             blob_client = container_client.get_blob_client(blob_path)
             props = blob_client.get_blob_properties()
             return props.size
-        finally:
-            self.release_client(client)
     
+    # seconds between copy-status polls while a server-side copy is pending
+    COPY_POLL_SECONDS = 0.5
+
     def copy_blob(self, source_container: str, source_blob: str, dest_container: str, dest_blob: str):
         """
         Copy a blob from one container to another within the same storage account.
         Returns the destination blob path if successful.
+
+        Blocks the calling thread until the copy finishes; async code should use
+        ``StorageFactory.acopy_blob`` instead.
         """
-        client = self.get_client()
-        try:
-            # Get source blob URL with SAS for copy operation
+        for progress in self.iter_copy_blob(source_container, source_blob, dest_container, dest_blob):
+            if progress["status"] == "pending":
+                time.sleep(self.COPY_POLL_SECONDS)
+        return dest_blob
+
+    def iter_copy_blob(self, source_container: str, source_blob: str, dest_container: str, dest_blob: str):
+        """
+        Start a server-side copy and yield its progress, one status check per step.
+
+        Each step holds a pooled client only for a single request and never
+        sleeps, so the caller decides how to wait between ``pending`` steps.
+        Yields ``{"status", "copied", "total"}`` and raises if the copy fails.
+        A copy still pending when the steps are abandoned is aborted.
+        """
+        with self.pool.client() as client:
             source_sas = generate_blob_sas(
                 account_name=client.account_name,
                 container_name=source_container,
                 blob_name=source_blob,
                 account_key=client.credential.account_key,
                 permission=BlobSasPermissions(read=True),
-                expiry=datetime.now() + timedelta(hours=1)
+                expiry=datetime.now(timezone.utc) + timedelta(hours=1)
             )
-            source_url = f"https://{client.account_name}.blob.core.usgovcloudapi.net/{source_container}/{source_blob}?{source_sas}"
-            
-            # Get destination blob client
-            dest_container_client = client.get_container_client(dest_container)
-            dest_blob_client = dest_container_client.get_blob_client(dest_blob)
-            
-            # Start copy operation
-            copy_result = dest_blob_client.start_copy_from_url(source_url)
-            
-            # Wait for copy to complete (it's usually instant for same-account copies)
-            import time
-            props = dest_blob_client.get_blob_properties()
-            while props.copy.status == 'pending':
-                time.sleep(0.5)
-                props = dest_blob_client.get_blob_properties()
-            
-            if props.copy.status == 'success':
-                return dest_blob
-            else:
-                raise Exception(f"Blob copy failed with status: {props.copy.status}")
-        finally:
-            self.release_client(client)
-    
+            source_url = f"{client.get_blob_client(source_container, source_blob).url}?{source_sas}"
+            copy_id = client.get_blob_client(dest_container, dest_blob).start_copy_from_url(source_url)["copy_id"]
+
+        pending = True
+        try:
+            while True:
+                with self.pool.client() as client:
+                    props = client.get_blob_client(dest_container, dest_blob).get_blob_properties()
+
+                copied, total = _parse_copy_progress(props.copy.progress, props.size)
+                pending = props.copy.status == "pending"
+                if props.copy.status not in ("pending", "success"):
+                    raise Exception(f"Blob copy failed with status: {props.copy.status}")
+                yield {"status": props.copy.status, "copied": copied, "total": total}
+                if props.copy.status == "success":
+                    return
+        except BaseException:
+            if pending:
+                self._abort_copy(dest_container, dest_blob, copy_id)
+            raise
+
+    def _abort_copy(self, container_name: str, blob_path: str, copy_id: str):
+        try:
+            with self.pool.client() as client:
+                client.get_blob_client(container_name, blob_path).abort_copy(copy_id)
+        except Exception as e:
+            # most likely the copy finished in the meantime
+            self._logger.warning(f"Could not abort copy {copy_id} to {blob_path!r}: {e}")
+
     def delete_blob(self, container_name: str, blob_path: str):
         """Delete a blob from a specific container."""
-        client = self.get_client()
-        try:
+        with self.pool.client() as client:
             container_client = client.get_container_client(container_name)
             blob_client = container_client.get_blob_client(blob_path)
             blob_client.delete_blob()
-        finally:
-            self.release_client(client)
\ No newline at end of file
+
+
+def _parse_copy_progress(progress, size):
+    """Azure reports copy progress as ``"<bytes copied>/<total bytes>"``."""
+    if progress and "/" in progress:
+        copied, total = progress.split("/", 1)
+        return int(copied), int(total)
+    return size, size
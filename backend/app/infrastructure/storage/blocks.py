@@ -0,0 +1,37 @@
+"""Fixed-size block reading shared by the streaming uploads.
+
+Both backends push large files in blocks (Azure block blobs, S3 multipart
+parts) so memory use is one block per upload, whatever the file size.
+"""
+
+import base64
+
+DEFAULT_BLOCK_SIZE = 8 * 1024 * 1024
+
+
+def iter_blocks(fileobj, block_size: int = DEFAULT_BLOCK_SIZE):
+    """Yield successive ``block_size`` chunks of *fileobj* until EOF.
+
+    Short reads from the underlying file are topped up, so every block but
+    the last is exactly ``block_size`` bytes (S3 rejects undersized parts).
+    """
+    if block_size <= 0:
+        raise ValueError(f"block_size must be positive, got {block_size}")
+    while True:
+        block = fileobj.read(block_size)
+        if not block:
+            return
+        while len(block) < block_size:
+            more = fileobj.read(block_size - len(block))
+            if not more:
+                break
+            block += more
+        yield block
+
+
+def block_id(index: int) -> str:
+    """Azure block id for the *index*-th block.
+
+    Ids must be base64 and all the same length within one blob.
+    """
+    return base64.b64encode(f"{index:08d}".encode()).decode()
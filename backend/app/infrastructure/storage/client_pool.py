@@ -0,0 +1,175 @@
+"""Bounded, lazily grown pool of storage SDK clients.
+
+Shared by ``AzureBlobStorageFactory`` and ``SpacesStorageFactory``:
+
+- Clients are created on demand, up to ``max_size``; idle ones are reused.
+- ``acquire`` waits at most ``acquire_timeout`` seconds and then raises
+  :class:`PoolExhaustedError` instead of blocking forever.
+- Callers run on the storage thread pool (the blocking SDK calls do too),
+  so waiting for a client never blocks the event loop.
+- ``stream`` keeps a client checked out for as long as a download is being
+  iterated, not just while it is started.
+- A client is dropped (and later replaced) when the block using it raises one
+  of ``recycle_on``, or when ``health_check`` rejects it on checkout.
+- ``metrics()`` reports size, in-use, wait times and how often the pool ran
+  dry, for monitoring and sizing.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class PoolExhaustedError(TimeoutError):
+    """No client became available within the acquire timeout."""
+
+
+class ClientPool:
+    def __init__(
+        self,
+        create_client,
+        max_size: int,
+        acquire_timeout: float | None = 30.0,
+        health_check=None,
+        recycle_on: tuple = (),
+        clock=time.monotonic,
+    ):
+        if max_size < 1:
+            raise ValueError(f"max_size must be at least 1, got {max_size}")
+        self._create_client = create_client
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self._health_check = health_check
+        self._recycle_on = tuple(recycle_on)
+        self._clock = clock
+
+        self._condition = threading.Condition()
+        self._idle: deque = deque()
+        self._size = 0
+        self._in_use = 0
+
+        self._acquired = 0
+        self._waited = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._exhausted = 0
+        self._recycled = 0
+
+    # -- checkout ----------------------------------------------------------
+
+    def _take_idle(self):
+        """Pop a healthy idle client, or None. Caller holds the condition."""
+        while self._idle:
+            client = self._idle.pop()
+            if self._health_check is None or self._health_check(client):
+                self._in_use += 1
+                return client
+            self._size -= 1
+            self._recycled += 1
+        return None
+
+    def _record_acquire(self, started, blocked):
+        self._acquired += 1
+        if blocked:
+            waited = self._clock() - started
+            self._waited += 1
+            self._wait_seconds += waited
+            self._max_wait_seconds = max(self._max_wait_seconds, waited)
+
+    def acquire(self, timeout: float | None = None):
+        """Check out a client, creating one if the pool is below ``max_size``."""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        started = self._clock()
+        deadline = None if timeout is None else started + timeout
+        blocked = False
+        with self._condition:
+            while True:
+                client = self._take_idle()
+                if client is not None:
+                    self._record_acquire(started, blocked)
+                    return client
+                if self._size < self.max_size:
+                    self._size += 1
+                    self._in_use += 1
+                    break
+                remaining = None if deadline is None else deadline - self._clock()
+                if remaining is not None and remaining <= 0:
+                    self._exhausted += 1
+                    raise PoolExhaustedError(
+                        f"no storage client available within {timeout}s (pool size {self.max_size})"
+                    )
+                blocked = True
+                self._condition.wait(remaining)
+
+        # build outside the lock; client construction can be slow (boto3)
+        try:
+            client = self._create_client()
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._record_acquire(started, blocked)
+        return client
+
+    def release(self, client, discard: bool = False):
+        """Return a client; ``discard=True`` drops it so a fresh one is built later."""
+        with self._condition:
+            self._in_use -= 1
+            if discard:
+                self._size -= 1
+                self._recycled += 1
+            else:
+                self._idle.append(client)
+            self._condition.notify()
+
+    @contextmanager
+    def client(self, timeout: float | None = None):
+        """``with pool.client() as client:`` - released (or recycled) on exit."""
+        client = self.acquire(timeout)
+        discard = False
+        try:
+            yield client
+        except self._recycle_on:
+            discard = True
+            raise
+        finally:
+            self.release(client, discard=discard)
+
+    def stream(self, open_chunks, timeout: float | None = None):
+        """Iterate over ``open_chunks(client)`` while holding that client.
+
+        ``open_chunks`` runs before this returns, so a failure to start the
+        download (a missing blob, say) raises here rather than on the first
+        chunk. The client goes back to the pool once the chunks are exhausted
+        or the iterator is closed.
+        """
+        chunks = self._hold(open_chunks, timeout)
+        next(chunks)
+        return chunks
+
+    def _hold(self, open_chunks, timeout):
+        with self.client(timeout) as client:
+            chunks = open_chunks(client)
+            yield  # started; stream() returns here
+            yield from chunks
+
+    # -- monitoring --------------------------------------------------------
+
+    def metrics(self) -> dict:
+        with self._condition:
+            return {
+                'size': self._size,
+                'max_size': self.max_size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'acquired': self._acquired,
+                'waited': self._waited,
+                'wait_seconds_total': self._wait_seconds,
+                'wait_seconds_max': self._max_wait_seconds,
+                'exhausted': self._exhausted,
+                'recycled': self._recycled,
+            }
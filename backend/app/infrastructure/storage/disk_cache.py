@@ -0,0 +1,207 @@
+"""Read-through on-disk cache for blobs (lesson audio).
+
+Reviewers replay the same recording many times, so ``StorageFactory`` can
+keep a local copy of each blob it serves. Entries are keyed by blob path *and*
+ETag, so a re-uploaded blob is never served stale; the previous version of a
+path is dropped as soon as a new one is stored.
+
+- Size-bounded: least recently used entries are evicted once the total goes
+  over ``max_bytes``.
+- Atomic: a blob is written to a temporary file and ``os.replace``-d into
+  place, so readers never see a partial file.
+- Range reads are served from an ``mmap`` of the cached file, so only the
+  pages a player actually touches are read.
+- ``stats()`` returns hit / miss / eviction counters for monitoring.
+
+The cache index lives in memory and is rebuilt from the directory (by mtime)
+when the process starts. It is safe to share between threads.
+"""
+
+import hashlib
+import mmap
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+_SUFFIX = '.blob'
+_CHUNK_SIZE = 64 * 1024
+
+
+class DiskCache:
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # cache key -> (blob path, size in bytes), least recently used first
+        self._entries: OrderedDict = OrderedDict()
+        self._key_by_path: dict = {}
+        self._total_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load_existing()
+
+    @staticmethod
+    def _key(blob_path: str, etag: str) -> str:
+        return hashlib.sha256(f'{blob_path}\0{etag}'.encode()).hexdigest()
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def _load_existing(self):
+        # Paths are not recoverable from the hashed names, so entries found on
+        # disk can be hit and evicted but not replaced by path until re-stored.
+        files = []
+        for name in os.listdir(self.directory):
+            full = os.path.join(self.directory, name)
+            if name.endswith(_SUFFIX):
+                stat = os.stat(full)
+                files.append((stat.st_mtime, name[:-len(_SUFFIX)], stat.st_size))
+            elif name.endswith('.tmp'):
+                os.unlink(full)  # left over from an interrupted write
+        for _, key, size in sorted(files):
+            self._entries[key] = (None, size)
+            self._total_bytes += size
+        self._evict_over_budget()
+
+    # -- lookups -----------------------------------------------------------
+
+    def _open(self, blob_path: str, etag: str, count: bool = True):
+        """The cached file opened for reading, or None when it is not cached.
+
+        The file is opened under the lock every eviction takes to unlink it, so
+        once a reader holds the descriptor the data stays readable even if the
+        entry is evicted or replaced straight after.
+        """
+        key = self._key(blob_path, etag)
+        with self._lock:
+            f = None
+            if key in self._entries:
+                try:
+                    f = open(self._file(key), 'rb')
+                except FileNotFoundError:
+                    self._drop(key)
+            if count:
+                if f is not None:
+                    self._hits += 1
+                else:
+                    self._misses += 1
+            if f is None:
+                return None
+            self._entries.move_to_end(key)
+        try:
+            os.utime(f.fileno())  # keep recency across restarts
+        except OSError:
+            pass
+        return f
+
+    def contains(self, blob_path: str, etag: str) -> bool:
+        """Whether the blob version is cached; counts as a hit or a miss."""
+        f = self._open(blob_path, etag)
+        if f is None:
+            return False
+        f.close()
+        return True
+
+    def get(self, blob_path: str, etag: str, count: bool = True) -> bytes | None:
+        """The cached blob version, or None on a miss (counted unless *count* is False)."""
+        f = self._open(blob_path, etag, count)
+        if f is None:
+            return None
+        with f:
+            return f.read()
+
+    def get_range(self, blob_path: str, etag: str, offset: int = 0, length: int | None = None):
+        """An iterator over the bytes ``[offset, offset + length)`` of a cached blob, or None on a miss.
+
+        The file is mapped before this returns, so a later eviction cannot
+        break the iteration.
+        """
+        f = self._open(blob_path, etag)
+        if f is None:
+            return None
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            end = size if length is None else min(size, offset + length)
+            if size == 0 or offset >= end:
+                return iter(())
+            # the mapping keeps its own reference to the file once f is closed
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._iter_mapped(mapped, offset, end)
+
+    @staticmethod
+    def _iter_mapped(mapped, offset: int, end: int):
+        with mapped:
+            for start in range(offset, end, _CHUNK_SIZE):
+                yield mapped[start:min(start + _CHUNK_SIZE, end)]
+
+    # -- writes ------------------------------------------------------------
+
+    def put(self, blob_path: str, etag: str, chunks) -> bool:
+        """Store a blob version from an iterable of byte chunks.
+
+        Returns False (and stores nothing) when the blob is larger than the
+        whole cache.
+        """
+        key = self._key(blob_path, etag)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        size = 0
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        break
+                    f.write(chunk)
+            if size > self.max_bytes:
+                os.unlink(tmp_path)
+                return False
+            os.replace(tmp_path, self._file(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        with self._lock:
+            previous_key = self._key_by_path.get(blob_path)
+            if previous_key is not None and previous_key != key:
+                self._drop(previous_key)
+            if key in self._entries:
+                self._total_bytes -= self._entries[key][1]
+            self._entries[key] = (blob_path, size)
+            self._entries.move_to_end(key)
+            self._key_by_path[blob_path] = key
+            self._total_bytes += size
+            self._evict_over_budget()
+        return True
+
+    def _drop(self, key: str):
+        blob_path, size = self._entries.pop(key, (None, 0))
+        self._total_bytes -= size
+        if blob_path is not None and self._key_by_path.get(blob_path) == key:
+            del self._key_by_path[blob_path]
+        try:
+            os.unlink(self._file(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict_over_budget(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self._evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'hit_ratio': self._hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+            }
@@ -1,5 +1,12 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from app.infrastructure.storage.azure_storage import AzureBlobStorageFactory
 from app.infrastructure.storage.spaces_storage import SpacesStorageFactory
+from app.infrastructure.storage.signed_url_cache import SignedUrlCache
+from app.infrastructure.storage.disk_cache import DiskCache
 from app.config.app_settings import SettingsConfig
 from app.config.app_logging import AppLogging
 
@@ -35,16 +42,50 @@ class StorageFactory:
                 f"Supported: {', '.join(service_providers)}"
             )
         self.factory = provider_cls()
+
+        # The storage SDKs are blocking; the a* methods below run them on this
+        # bounded pool so a slow blob transfer never stalls the event loop.
+        storage_settings = SettingsConfig().settings.Storage.Settings
+        workers = storage_settings.ExecutorWorkers or storage_settings.PoolSize or 5
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='storage')
+        self._read_url_minutes = storage_settings.SignedUrlMinutes
+        self._read_urls = SignedUrlCache(refresh_margin=min(60, self._read_url_minutes * 60 / 4))
+
+        self.disk_cache = None
+        self._cache_executor = None
+        if storage_settings.DiskCacheDir:
+            self.disk_cache = DiskCache(
+                storage_settings.DiskCacheDir,
+                max_bytes=storage_settings.DiskCacheMaxMB * 1024 * 1024,
+            )
+            # whole-blob cache fills get their own threads: on the pool above a
+            # few cold recordings would hold every worker for a full download
+            self._cache_executor = ThreadPoolExecutor(
+                max_workers=storage_settings.DiskCacheWorkers, thread_name_prefix='storage-cache'
+            )
+        self._filling = set()
+        self._filling_lock = threading.Lock()
         self._health = True
 
     def upload(self, file_bytes, path):
         return self.factory.upload(file_bytes, path)
 
+    def upload_stream(self, fileobj, path, block_size=None):
+        """Upload a file-like object in fixed-size blocks without reading it all into memory."""
+        return self.factory.upload_stream(fileobj, path, block_size)
+
     def delete(self, path):
         return self.factory.delete(path)
 
     def read(self, path):
-        return self.factory.read(path)
+        if self.disk_cache is None:
+            return self.factory.read(path)
+        etag = self.factory.get_blob_info(path)['etag']
+        data = self.disk_cache.get(path, etag)
+        if data is None and self.disk_cache.put(path, etag, self.factory.stream_blob(path)):
+            data = self.disk_cache.get(path, etag, count=False)
+        # None when the blob is too large to cache, or was evicted straight away
+        return data if data is not None else self.factory.read(path)
 
     def get_container_url(self):
         return self.factory.get_container_url()
@@ -63,4 +104,184 @@ class StorageFactory:
     
     def get_blob_size(self, blob_path):
         """Get the size of a blob in bytes."""
-        return self.factory.get_blob_size(blob_path)
\ No newline at end of file
+        return self.factory.get_blob_size(blob_path)
+
+    def generate_read_url(self, blob_path, content_type=None):
+        """Signed read-only URL for a blob, reused until shortly before it expires."""
+        key = (blob_path, content_type)
+        url = self._read_urls.get(key)
+        if url is None:
+            url = self.factory.generate_read_url(blob_path, self._read_url_minutes, content_type)
+            self._read_urls.put(key, url, self._read_url_minutes * 60)
+        return url
+
+    def get_blob_info(self, blob_path):
+        """Size in bytes and ETag of a blob: ``{"size": int, "etag": str}``."""
+        return self.factory.get_blob_info(blob_path)
+
+    def stream_range(self, blob_path, offset=0, length=None, etag=None):
+        """Iterate over *length* bytes of a blob from *offset*, fetching nothing else.
+
+        Given the blob's *etag* and with the disk cache on, a cached copy is
+        served locally; on a miss the range comes from storage while the whole
+        blob is copied into the cache in the background.
+        """
+        if self.disk_cache is not None and etag:
+            chunks = self.disk_cache.get_range(blob_path, etag, offset, length)
+            if chunks is not None:
+                return chunks
+            self._schedule_cache_fill(blob_path, etag)
+        return self.factory.stream_range(blob_path, offset, length)
+
+    def _schedule_cache_fill(self, blob_path, etag):
+        key = (blob_path, etag)
+        with self._filling_lock:
+            if key in self._filling:
+                return
+            self._filling.add(key)
+        self._cache_executor.submit(self._fill_cache, blob_path, etag)
+
+    def _fill_cache(self, blob_path, etag):
+        try:
+            self.disk_cache.put(blob_path, etag, self.factory.stream_blob(blob_path))
+        except Exception as e:
+            self._logger.warning(f"Could not cache blob {blob_path!r}: {e}")
+        finally:
+            with self._filling_lock:
+                self._filling.discard((blob_path, etag))
+
+    def shutdown(self, wait=True):
+        """Stop the storage thread pools (request calls and cache fills)."""
+        self._executor.shutdown(wait=wait)
+        if self._cache_executor is not None:
+            self._cache_executor.shutdown(wait=wait)
+
+    @property
+    def container_name(self):
+        """Container (Azure) / bucket (Spaces) the app's blobs live in."""
+        return self.factory.container_name
+
+    def is_not_found(self, error):
+        """Whether *error*, raised by a storage call, means the blob does not exist."""
+        return self.factory.is_not_found(error)
+
+    def pool_stats(self):
+        """Client pool metrics of the active backend."""
+        return self.factory.pool_stats()
+
+    def cache_stats(self):
+        """Disk cache counters, or None when the cache is disabled."""
+        return self.disk_cache.stats() if self.disk_cache is not None else None
+
+    # -- async interface ---------------------------------------------------
+
+    async def _arun(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    async def _adrain(self, iterator):
+        """Drive a blocking chunk iterator from the pool, one chunk at a time."""
+        done = object()
+        while True:
+            chunk = await self._arun(next, iterator, done)
+            if chunk is done:
+                return
+            yield chunk
+
+    async def aupload(self, file_bytes, path):
+        return await self._arun(self.factory.upload, file_bytes, path)
+
+    async def aupload_stream(self, fileobj, path, block_size=None):
+        return await self._arun(self.factory.upload_stream, fileobj, path, block_size)
+
+    async def adelete(self, path):
+        return await self._arun(self.factory.delete, path)
+
+    async def aread(self, path):
+        return await self._arun(self.read, path)
+
+    async def alist_files(self, path):
+        return await self._arun(self.factory.list_files, path)
+
+    async def aget_blob_size(self, blob_path):
+        return await self._arun(self.factory.get_blob_size, blob_path)
+
+    async def aget_blob_info(self, blob_path):
+        return await self._arun(self.factory.get_blob_info, blob_path)
+
+    async def agenerate_read_url(self, blob_path, content_type=None):
+        url = self._read_urls.get((blob_path, content_type))
+        if url is not None:
+            return url
+        return await self._arun(self.generate_read_url, blob_path, content_type)
+
+    async def agenerate_blob_sas_url(self, blob_path, expiry_hours=24, container_name=None):
+        return await self._arun(self.factory.generate_blob_sas_url, blob_path, expiry_hours, container_name)
+
+    async def acopy_blob(self, source_container, source_blob, dest_container, dest_blob, on_progress=None):
+        """Server-side copy that awaits completion without blocking the loop.
+
+        Each backend step (start, status check, part copy) runs on the thread
+        pool; between pending Azure status checks this coroutine sleeps on the
+        loop, so no thread or pooled client is held while storage works.
+        *on_progress*, if given, is called with ``(dest_blob, progress)`` after
+        every step. Returns *dest_blob*; raises if the copy fails.
+        """
+        steps = self.factory.iter_copy_blob(source_container, source_blob, dest_container, dest_blob)
+        done = object()
+        step = None
+        try:
+            while True:
+                # shielded so a cancelled copy still lets the running step finish
+                step = asyncio.ensure_future(self._arun(next, steps, done))
+                progress = await asyncio.shield(step)
+                if progress is done:
+                    return dest_blob
+                if on_progress is not None:
+                    on_progress(dest_blob, progress)
+                if progress['status'] == 'pending':
+                    await asyncio.sleep(self.factory.COPY_POLL_SECONDS)
+        except BaseException:
+            # e.g. cancelled: let the backend clean up (S3 aborts the multipart copy)
+            await asyncio.shield(self._aclose_copy(steps, step))
+            raise
+
+    async def _aclose_copy(self, steps, step):
+        if step is not None and not step.done():
+            await asyncio.wait([step])
+        await self._arun(steps.close)
+
+    async def acopy_blobs(self, copies, max_concurrency=4, on_progress=None):
+        """Copy many blobs concurrently, at most *max_concurrency* at a time.
+
+        *copies* is an iterable of ``(source_container, source_blob,
+        dest_container, dest_blob)``. Returns the destination paths in order;
+        the first failure is raised once every copy has settled.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def copy_one(source_container, source_blob, dest_container, dest_blob):
+            async with semaphore:
+                return await self.acopy_blob(
+                    source_container, source_blob, dest_container, dest_blob, on_progress
+                )
+
+        results = await asyncio.gather(*(copy_one(*copy) for copy in copies), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+    async def astream(self, blob_path):
+        """Open a blob and return an async iterator over its chunks.
+
+        The download is started before this returns, so a missing blob raises
+        here rather than part-way through a streamed response.
+        """
+        iterator = await self._arun(self.factory.stream_blob, blob_path)
+        return self._adrain(iterator)
+
+    async def astream_range(self, blob_path, offset=0, length=None, etag=None):
+        """Like astream, for *length* bytes of a blob from *offset* (see stream_range)."""
+        iterator = await self._arun(self.stream_range, blob_path, offset, length, etag)
+        return self._adrain(iterator)
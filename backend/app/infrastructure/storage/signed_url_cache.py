@@ -0,0 +1,45 @@
+"""Per-blob cache of short-lived signed read URLs.
+
+Signing is cheap but not free (and on Azure needs a pooled client), while the
+player asks for the same recording on every seek/reload. A URL is reused until
+``refresh_margin`` seconds before it expires, so a client that follows the
+redirect always gets at least that much validity.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class SignedUrlCache:
+    def __init__(self, max_entries: int = 1024, refresh_margin: float = 60.0, clock=time.monotonic):
+        self._entries: OrderedDict = OrderedDict()
+        self._max_entries = max_entries
+        self._refresh_margin = refresh_margin
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached URL for *key*, or None if missing or about to expire."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            url, expires_at = entry
+            if expires_at - self._clock() <= self._refresh_margin:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return url
+
+    def put(self, key, url: str, ttl_seconds: float):
+        """Remember *url* for *key*; it stops being valid after *ttl_seconds*."""
+        with self._lock:
+            self._entries[key] = (url, self._clock() + ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
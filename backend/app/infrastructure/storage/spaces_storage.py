@@ -14,14 +14,30 @@ Config comes from ``settings.Storage.Settings`` (see StorageSettings):
   - PublicBaseUrl          : optional CDN/public base for get_container_url()
 """
 
+from contextlib import closing
 from datetime import datetime, timedelta, timezone
-from queue import Queue
+from itertools import chain
 
 import boto3
 from botocore.client import Config
+from botocore.exceptions import ClientError, ConnectionClosedError, EndpointConnectionError
 
 from app.config.app_settings import SettingsConfig
 from app.config.app_logging import AppLogging
+from app.infrastructure.storage.blocks import iter_blocks
+from app.infrastructure.storage.client_pool import ClientPool
+
+# S3 rejects multipart parts (other than the last) smaller than this
+_MIN_PART_SIZE = 5 * 1024 * 1024
+# copy_object handles sources up to 5 GiB; larger ones need a multipart copy
+_MAX_SINGLE_COPY = 5 * 1024 * 1024 * 1024
+_COPY_PART_SIZE = 512 * 1024 * 1024
+
+
+def _iter_body(body):
+    """Chunks of a StreamingBody, closed (freeing its connection) even when abandoned part-way."""
+    with closing(body):
+        yield from body.iter_chunks()
 
 
 class SpacesStorageFactory:
@@ -45,13 +61,17 @@ class SpacesStorageFactory:
         self._access_key = self._settings.AccessKey
         self._secret_key = self._settings.SecretKey
         self._pool_size = self._settings.PoolSize or 5
+        self._block_size = self._settings.UploadBlockSizeMB * 1024 * 1024
 
         # boto3 clients are cheap to reuse and safe to share across threads for
-        # discrete calls, but we mirror the Azure factory's small client pool so
-        # the two backends have the same concurrency characteristics.
-        self.pool = Queue(maxsize=self._pool_size)
-        for _ in range(self._pool_size):
-            self.pool.put(self._create_client())
+        # discrete calls, but we mirror the Azure factory's client pool so the
+        # two backends have the same concurrency characteristics.
+        self.pool = ClientPool(
+            self._create_client,
+            max_size=self._pool_size,
+            acquire_timeout=self._settings.PoolAcquireTimeoutSeconds,
+            recycle_on=(EndpointConnectionError, ConnectionClosedError),
+        )
 
     def _resolve_endpoint(self):
         endpoint = self._settings.Endpoint or self._settings.Url
@@ -74,35 +94,75 @@ class SpacesStorageFactory:
         )
 
     def get_client(self):
-        return self.pool.get()
+        return self.pool.acquire()
+
+    def release_client(self, client, discard=False):
+        self.pool.release(client, discard=discard)
 
-    def release_client(self, client):
-        self.pool.put(client)
+    def pool_stats(self):
+        return self.pool.metrics()
+
+    @staticmethod
+    def is_not_found(error):
+        """Whether *error* means the object does not exist (GET: NoSuchKey, HEAD: bare 404)."""
+        if not isinstance(error, ClientError):
+            return False
+        return error.response.get('Error', {}).get('Code') in ('NoSuchKey', 'NotFound', '404')
+
+    @property
+    def container_name(self):
+        return self._bucket
 
     # -- core operations -----------------------------------------------------
 
     def upload(self, file_bytes, blob_path):
-        client = self.get_client()
-        try:
+        with self.pool.client() as client:
             body = file_bytes.read() if hasattr(file_bytes, 'read') else file_bytes
             return client.put_object(Bucket=self._bucket, Key=blob_path, Body=body)
-        finally:
-            self.release_client(client)
+
+    def upload_stream(self, fileobj, blob_path, block_size=None):
+        """Upload a file-like object as a multipart upload, one part in memory at a time.
+
+        Files that fit in a single part go through a plain put_object. A failed
+        multipart upload is aborted so no orphaned parts are left billed.
+        """
+        part_size = max(block_size or self._block_size, _MIN_PART_SIZE)
+        blocks = iter_blocks(fileobj, part_size)
+        first = next(blocks, b'')
+        with self.pool.client() as client:
+            if len(first) < part_size:
+                return client.put_object(Bucket=self._bucket, Key=blob_path, Body=first)
+
+            upload_id = client.create_multipart_upload(Bucket=self._bucket, Key=blob_path)['UploadId']
+            try:
+                parts = []
+                for part_number, block in enumerate(chain([first], blocks), start=1):
+                    response = client.upload_part(
+                        Bucket=self._bucket,
+                        Key=blob_path,
+                        UploadId=upload_id,
+                        PartNumber=part_number,
+                        Body=block,
+                    )
+                    parts.append({'ETag': response['ETag'], 'PartNumber': part_number})
+                return client.complete_multipart_upload(
+                    Bucket=self._bucket,
+                    Key=blob_path,
+                    UploadId=upload_id,
+                    MultipartUpload={'Parts': parts},
+                )
+            except Exception:
+                client.abort_multipart_upload(Bucket=self._bucket, Key=blob_path, UploadId=upload_id)
+                raise
 
     def delete(self, blob_path):
-        client = self.get_client()
-        try:
+        with self.pool.client() as client:
             return client.delete_object(Bucket=self._bucket, Key=blob_path)
-        finally:
-            self.release_client(client)
 
     def read(self, blob_path):
-        client = self.get_client()
-        try:
+        with self.pool.client() as client:
             obj = client.get_object(Bucket=self._bucket, Key=blob_path)
             return obj['Body'].read()
-        finally:
-            self.release_client(client)
 
     def get_container_url(self):
         if self._public_base_url:
@@ -115,8 +175,7 @@ class SpacesStorageFactory:
         return self.get_container_url()
 
     def generate_blob_sas_url(self, blob_path, expiry_hours=24, container_name=None):
-        client = self.get_client()
-        try:
+        with self.pool.client() as client:
             bucket = container_name or self._bucket
             url = client.generate_presigned_url(
                 'get_object',
@@ -124,12 +183,20 @@ class SpacesStorageFactory:
                 ExpiresIn=int(expiry_hours * 3600),
             )
             return url
-        finally:
-            self.release_client(client)
+
+    def generate_read_url(self, blob_path, expiry_minutes=15, content_type=None):
+        with self.pool.client() as client:
+            params = {'Bucket': self._bucket, 'Key': blob_path}
+            if content_type:
+                params['ResponseContentType'] = content_type
+            return client.generate_presigned_url(
+                'get_object',
+                Params=params,
+                ExpiresIn=int(expiry_minutes * 60),
+            )
 
     def list_files(self, folder_path):
-        client = self.get_client()
-        try:
+        with self.pool.client() as client:
             keys = []
             paginator = client.get_paginator('list_objects_v2')
             for page in paginator.paginate(Bucket=self._bucket, Prefix=folder_path):
@@ -138,42 +205,90 @@ class SpacesStorageFactory:
                     if name != folder_path:
                         keys.append(name)
             return keys
-        finally:
-            self.release_client(client)
 
     def stream_blob(self, blob_path):
-        # Note: the underlying StreamingBody stays open for the lifetime of the
-        # iterator; the caller is responsible for consuming it fully.
-        client = self.get_client()
-        try:
-            obj = client.get_object(Bucket=self._bucket, Key=blob_path)
-            return obj['Body'].iter_chunks()
-        finally:
-            self.release_client(client)
+        # the pooled client stays checked out until the chunks are consumed
+        return self.pool.stream(
+            lambda client: _iter_body(client.get_object(Bucket=self._bucket, Key=blob_path)['Body'])
+        )
+
+    def get_blob_info(self, blob_path):
+        with self.pool.client() as client:
+            head = client.head_object(Bucket=self._bucket, Key=blob_path)
+            return {'size': head['ContentLength'], 'etag': head['ETag']}
+
+    def stream_range(self, blob_path, offset=0, length=None):
+        # Only the requested bytes are fetched, via an S3 ranged GET.
+        end = '' if length is None else offset + length - 1
+        return self.pool.stream(
+            lambda client: _iter_body(
+                client.get_object(Bucket=self._bucket, Key=blob_path, Range=f'bytes={offset}-{end}')['Body']
+            )
+        )
 
     def get_blob_size(self, blob_path):
-        client = self.get_client()
-        try:
+        with self.pool.client() as client:
             head = client.head_object(Bucket=self._bucket, Key=blob_path)
             return head['ContentLength']
-        finally:
-            self.release_client(client)
+
+    # server-side copies make progress on every step, so there is nothing to poll
+    COPY_POLL_SECONDS = 0
 
     def copy_blob(self, source_container, source_blob, dest_container, dest_blob):
-        client = self.get_client()
+        for _ in self.iter_copy_blob(source_container, source_blob, dest_container, dest_blob):
+            pass
+        return dest_blob
+
+    def iter_copy_blob(self, source_container, source_blob, dest_container, dest_blob):
+        """Server-side copy, yielding ``{"status", "copied", "total"}`` per step.
+
+        Objects up to 5 GiB are copied with one copy_object; larger ones with a
+        multipart upload_part_copy, one part per step. An interrupted multipart
+        copy is aborted.
+        """
+        source = {'Bucket': source_container, 'Key': source_blob}
+        with self.pool.client() as client:
+            total = client.head_object(**source)['ContentLength']
+            if total <= _MAX_SINGLE_COPY:
+                client.copy_object(Bucket=dest_container, Key=dest_blob, CopySource=source)
+                upload_id = None
+            else:
+                upload_id = client.create_multipart_upload(Bucket=dest_container, Key=dest_blob)['UploadId']
+
+        if upload_id is None:
+            yield {'status': 'success', 'copied': total, 'total': total}
+            return
+
         try:
-            client.copy_object(
-                Bucket=dest_container,
-                Key=dest_blob,
-                CopySource={'Bucket': source_container, 'Key': source_blob},
-            )
-            return dest_blob
-        finally:
-            self.release_client(client)
+            parts = []
+            for part_number, first in enumerate(range(0, total, _COPY_PART_SIZE), start=1):
+                last = min(first + _COPY_PART_SIZE, total) - 1
+                with self.pool.client() as client:
+                    response = client.upload_part_copy(
+                        Bucket=dest_container,
+                        Key=dest_blob,
+                        UploadId=upload_id,
+                        PartNumber=part_number,
+                        CopySource=source,
+                        CopySourceRange=f'bytes={first}-{last}',
+                    )
+                parts.append({'ETag': response['CopyPartResult']['ETag'], 'PartNumber': part_number})
+                if last + 1 < total:
+                    yield {'status': 'pending', 'copied': last + 1, 'total': total}
+
+            with self.pool.client() as client:
+                client.complete_multipart_upload(
+                    Bucket=dest_container,
+                    Key=dest_blob,
+                    UploadId=upload_id,
+                    MultipartUpload={'Parts': parts},
+                )
+        except BaseException:
+            with self.pool.client() as client:
+                client.abort_multipart_upload(Bucket=dest_container, Key=dest_blob, UploadId=upload_id)
+            raise
+        yield {'status': 'success', 'copied': total, 'total': total}
 
     def delete_blob(self, container_name, blob_path):
-        client = self.get_client()
-        try:
+        with self.pool.client() as client:
             return client.delete_object(Bucket=container_name, Key=blob_path)
-        finally:
-            self.release_client(client)
@@ -1,5 +1,7 @@
 # initialize app imports
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -30,6 +32,12 @@ from app.api_routers.security.group_role import router as group_role_router
 from app.api_routers.security.role_permission import router as role_permission_router
 # admin settings (OAuth provider config)
 from app.api_routers.oauth_settings import router as oauth_settings_router
+# storage monitoring
+from app.api_routers.storage import router as storage_router
+# background jobs
+from app.api_routers.jobs import router as jobs_router
+from app.services.jobs.handlers import register_job_handlers
+from app.infrastructure.storage.factory import StorageFactory
 
 # settings and logging
 from app.config.app_settings import SettingsConfig
@@ -43,7 +51,21 @@ servers = [
     {"url": "/", "description": "Local server"}
 ]
 
-app = FastAPI(title='transcription-services', servers=servers)
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # With the Local broker the ingest workers run here; with Database they
+    # run as separate `python -m app.worker` processes.
+    job_queue = register_job_handlers()
+    if job_queue.is_local:
+        await job_queue.astart_workers()
+    try:
+        yield
+    finally:
+        await job_queue.astop_workers()
+        StorageFactory().shutdown(wait=False)
+
+
+app = FastAPI(title='transcription-services', servers=servers, lifespan=lifespan)
 cors  = settings.RuntimeSettings.CORS
 
 app.add_middleware(
@@ -69,6 +91,8 @@ app.include_router(transcript_speakers_router, tags=["Transcript Speakers"])
 app.include_router(transcript_overview_router, tags=["Transcript Overview"])
 app.include_router(transcript_todos_router, tags=["Transcript Todos"])
 app.include_router(transcript_threads_router, tags=["Transcript Threads"])
+app.include_router(storage_router, tags=["Storage"])
+app.include_router(jobs_router, tags=["Jobs"])
 # notifications
 app.include_router(notification_router, tags=["Notifications"])
 # security routes
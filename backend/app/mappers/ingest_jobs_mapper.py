@@ -0,0 +1,60 @@
+import json
+from datetime import datetime, timezone
+
+from app.data_models.ingest_jobs import IngestJobEntry
+from app.mappers.shared import SharedMapper
+
+
+class IngestJobMapper:
+    def __init__(self):
+        self.shared = SharedMapper()
+
+    @staticmethod
+    def _utc_now_naive() -> datetime:
+        return datetime.now(timezone.utc).replace(tzinfo=None)
+
+    def utc_now(self) -> datetime:
+        return self._utc_now_naive()
+
+    @staticmethod
+    def _load(value):
+        return json.loads(value) if value else None
+
+    def to_create_values(
+        self,
+        job_type: str,
+        payload: dict,
+        transcription_id: int | None = None,
+        idempotency_key: str | None = None,
+        max_attempts: int = 3,
+        user_id: int | None = None,
+    ) -> dict:
+        now = self._utc_now_naive()
+        return {
+            "job_type": job_type,
+            "transcription_id": transcription_id,
+            "idempotency_key": idempotency_key,
+            "status": "queued",
+            "progress": 0,
+            "payload": json.dumps(payload),
+            "attempts": 0,
+            "max_attempts": max_attempts,
+            "run_after": now,
+            "created_by": user_id,
+            "created_at": now,
+        }
+
+    def to_single(self, row: dict) -> IngestJobEntry:
+        row = self.shared.normalize_nulls(row)
+        return IngestJobEntry(**{
+            **row,
+            "result": self._load(row.get("result")),
+            "error": self._load(row.get("error")),
+        })
+
+    def to_payload(self, row: dict) -> dict:
+        return self._load(row.get("payload")) or {}
+
+    @staticmethod
+    def dump(value) -> str | None:
+        return None if value is None else json.dumps(value, default=str)
@@ -0,0 +1,28 @@
+"""Section timestamps: the ``HH:MM:SS.mmm`` display strings and integer milliseconds."""
+
+import math
+
+
+def timestamp_to_ms(value: str | None) -> int | None:
+    """``HH:MM:SS.mmm`` / ``MM:SS`` / seconds as integer milliseconds; None if unparseable."""
+    parts = (value or "").strip().split(":")
+    if not parts[0] or len(parts) > 3:
+        return None
+    try:
+        seconds = 0.0
+        for part in parts:
+            seconds = seconds * 60 + float(part)
+    except ValueError:
+        return None
+    if not math.isfinite(seconds) or seconds < 0:
+        return None
+    return int(round(seconds * 1000))
+
+
+def ms_to_duration(milliseconds: int) -> str:
+    """``M:SS``, or ``H:MM:SS`` from an hour up."""
+    total = max(0, milliseconds) // 1000
+    hours, minutes, seconds = total // 3600, total % 3600 // 60, total % 60
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
@@ -0,0 +1,38 @@
+"""
+Pure helpers for transcript full-text search: page cursors and snippets.
+
+Results are ordered by ``(rank DESC, section id DESC)``; a cursor is the
+position of the last hit of a page and the next page starts after it, so
+pages stay stable and cheap however deep the client scrolls.
+"""
+
+import base64
+import html
+
+# ts_headline wraps matched words in these; they cannot occur in transcript text
+MATCH_START = '\x02'
+MATCH_STOP = '\x03'
+
+
+def encode_cursor(rank: float, section_id: int) -> str:
+    """Opaque token for the position just after the hit ``(rank, section_id)``."""
+    raw = f'{float(rank)!r}:{int(section_id)}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token: str) -> tuple[float, int]:
+    """``(rank, section_id)`` from a token made by encode_cursor; ValueError if it is not one."""
+    try:
+        raw = base64.b64decode(token + '=' * (-len(token) % 4), altchars=b'-_', validate=True).decode()
+        rank, section_id = raw.split(':')
+        return float(rank), int(section_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f'Invalid search cursor: {token!r}') from e
+
+
+def highlight(snippet: str | None) -> str:
+    """HTML for a ts_headline snippet: the text escaped, matched words in ``<mark>``."""
+    if not snippet:
+        return ''
+    escaped = html.escape(snippet, quote=False)
+    return escaped.replace(MATCH_START, '<mark>').replace(MATCH_STOP, '</mark>')
@@ -30,3 +30,13 @@ class TranscriptionMapper:
         # Ensure speaker_id is forwarded even when absent
         mapped.setdefault("speaker_id", None)
         return mapped
+
+    @staticmethod
+    def to_export_block(row: dict) -> str:
+        """Render a section in the plain-text upload format ("speaker timestamp" + text)."""
+        speaker = (row.get("speaker") or "").strip() or "Speaker"
+        timestamp = row.get("begin_timestamp") or "00:00:00.000"
+        text = row.get("edited_text")
+        if text is None:
+            text = row.get("original_text") or ""
+        return f"{speaker} {timestamp}\n{text}\n\n"
@@ -5,6 +5,7 @@ from app.db_models.transcription.transcription import TranscriptActivityLogT, Tr
 from app.db_models.user import UsersT
 from app.data_models.transcript_overview import ActivityLogCreate
 from app.mappers.activity_log_mapper import ActivityLogMapper
+from app.repositories.transcription.controller import section_positions
 
 
 class ActivityLogRepository:
@@ -12,15 +13,17 @@ class ActivityLogRepository:
         self.database = DatabaseFactory()
         self.mapper = ActivityLogMapper()
 
-    async def acreate(self, data: ActivityLogCreate):
+    async def acreate(self, data: ActivityLogCreate, uow=None):
         """Insert a new activity log entry."""
+        database = uow or self.database
         stmt = sqlalchemy.insert(TranscriptActivityLogT).values(
             **data.model_dump()
         )
-        return await self.database.acreate(stmt)
+        return await database.acreate(stmt)
 
     async def alist(self, transcription_id: int, limit: int = 20, actions: list[str] | None = None):
         """Return the most recent activity entries for a transcript, with user display names."""
+        positions = section_positions(transcription_id)
         query = (
             sqlalchemy.select(
                 TranscriptActivityLogT.id,
@@ -34,14 +37,8 @@ class ActivityLogRepository:
                 TranscriptDetailsT.id.label("section_db_id"),
             )
             .outerjoin(UsersT, TranscriptActivityLogT.user_id == UsersT.id)
-            .outerjoin(
-                TranscriptDetailsT,
-                sqlalchemy.and_(
-                    TranscriptDetailsT.transcription_id == TranscriptActivityLogT.transcription_id,
-                    TranscriptDetailsT.section_id == TranscriptActivityLogT.section_id,
-                    TranscriptDetailsT.is_active == 1,
-                ),
-            )
+            .outerjoin(positions, positions.c.position == TranscriptActivityLogT.section_id)
+            .outerjoin(TranscriptDetailsT, TranscriptDetailsT.id == positions.c.id)
             .where(TranscriptActivityLogT.transcription_id == transcription_id)
             .order_by(TranscriptActivityLogT.created_at.desc())
             .limit(limit)
@@ -64,6 +61,7 @@ class ActivityLogRepository:
         "pick up where you left off" list with enough info to scroll to a
         section.
         """
+        positions = section_positions(transcription_id)
         query = (
             sqlalchemy.select(
                 TranscriptActivityLogT.id,
@@ -82,14 +80,8 @@ class ActivityLogRepository:
                 TranscriptDetailsT.begin_timestamp.label("section_begin_timestamp"),
             )
             .outerjoin(UsersT, TranscriptActivityLogT.user_id == UsersT.id)
-            .outerjoin(
-                TranscriptDetailsT,
-                sqlalchemy.and_(
-                    TranscriptDetailsT.transcription_id == TranscriptActivityLogT.transcription_id,
-                    TranscriptDetailsT.section_id == TranscriptActivityLogT.section_id,
-                    TranscriptDetailsT.is_active == 1,
-                ),
-            )
+            .outerjoin(positions, positions.c.position == TranscriptActivityLogT.section_id)
+            .outerjoin(TranscriptDetailsT, TranscriptDetailsT.id == positions.c.id)
             .where(
                 TranscriptActivityLogT.transcription_id == transcription_id,
                 TranscriptActivityLogT.action == "section_edited",
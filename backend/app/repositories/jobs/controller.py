@@ -0,0 +1,140 @@
+import sqlalchemy
+
+from app.infrastructure.databases.factory import DatabaseFactory
+from app.db_models.jobs import IngestJobsT
+
+
+class IngestJobsRepository:
+    """Job table access for the ingestion queue.
+
+    Every state change after the claim is fenced on ``locked_by``, so a worker
+    whose job was presumed lost (and requeued for someone else) cannot
+    overwrite the new owner's progress or outcome.
+    """
+
+    def __init__(self):
+        self.database = DatabaseFactory()
+
+    async def aget(self, job_id: int) -> dict | None:
+        query = sqlalchemy.select(IngestJobsT.__table__).where(IngestJobsT.id == job_id)
+        result = await self.database.aread(query)
+        rows = result.get("data", [])
+        return rows[0] if rows else None
+
+    async def aget_by_key(self, idempotency_key: str) -> dict | None:
+        query = sqlalchemy.select(IngestJobsT.__table__).where(IngestJobsT.idempotency_key == idempotency_key)
+        result = await self.database.aread(query)
+        rows = result.get("data", [])
+        return rows[0] if rows else None
+
+    async def acreate(self, values: dict) -> dict:
+        stmt = sqlalchemy.insert(IngestJobsT).values(**values)
+        return await self.database.acreate(stmt)
+
+    async def aclaim(self, worker_id: str, now) -> dict | None:
+        """Take the oldest runnable queued job, or None.
+
+        ``FOR UPDATE SKIP LOCKED`` makes concurrent workers pass over a row
+        another worker is claiming instead of queueing behind its lock.
+        """
+        async with self.database.aunit_of_work() as uow:
+            query = (
+                sqlalchemy.select(IngestJobsT.id)
+                .where(IngestJobsT.status == "queued", IngestJobsT.run_after <= now)
+                .order_by(IngestJobsT.run_after, IngestJobsT.id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            found = await uow.aread(query)
+            if found.get("status_code") != 200:
+                return None
+            job_id = found["data"][0]["id"]
+            stmt = (
+                sqlalchemy.update(IngestJobsT)
+                .where(IngestJobsT.id == job_id)
+                .values(
+                    status="running",
+                    stage="starting",
+                    attempts=IngestJobsT.attempts + 1,
+                    locked_by=worker_id,
+                    heartbeat_at=now,
+                    started_at=sqlalchemy.func.coalesce(IngestJobsT.started_at, now),
+                )
+            )
+            await uow.aupdate(stmt)
+            if uow.failed:
+                return None
+        return await self.aget(job_id)
+
+    def _owned(self, job_id: int, worker_id: str):
+        return sqlalchemy.update(IngestJobsT).where(
+            IngestJobsT.id == job_id,
+            IngestJobsT.status == "running",
+            IngestJobsT.locked_by == worker_id,
+        )
+
+    async def aset_progress(self, job_id: int, worker_id: str, stage: str, progress: int, now) -> dict:
+        """Record the current step; doubles as the worker's heartbeat.
+
+        404 when the job is no longer this worker's (it was requeued as stale).
+        """
+        stmt = (
+            self._owned(job_id, worker_id)
+            .values(stage=stage, progress=progress, heartbeat_at=now)
+            .returning(IngestJobsT.id)
+        )
+        return await self.database.aread(stmt)
+
+    async def acomplete(self, job_id: int, worker_id: str, result: str | None, now) -> dict:
+        stmt = self._owned(job_id, worker_id).values(
+            status="succeeded",
+            stage="done",
+            progress=100,
+            result=result,
+            error=None,
+            locked_by=None,
+            heartbeat_at=now,
+            finished_at=now,
+        )
+        return await self.database.aupdate(stmt)
+
+    async def afail(self, job_id: int, worker_id: str, error: str, now, retry_at=None) -> dict:
+        """Record a failed attempt: requeue it for *retry_at*, or fail it for good."""
+        if retry_at is not None:
+            values = {"status": "queued", "stage": "waiting to retry", "run_after": retry_at}
+        else:
+            values = {"status": "failed", "finished_at": now}
+        stmt = self._owned(job_id, worker_id).values(
+            error=error, locked_by=None, heartbeat_at=now, **values
+        )
+        return await self.database.aupdate(stmt)
+
+    async def arelease(self, job_id: int, worker_id: str, now) -> dict:
+        """Hand a job back untouched (worker shutting down); the attempt is not counted."""
+        stmt = self._owned(job_id, worker_id).values(
+            status="queued",
+            stage="queued",
+            attempts=IngestJobsT.attempts - 1,
+            locked_by=None,
+            run_after=now,
+        )
+        return await self.database.aupdate(stmt)
+
+    async def arequeue_stale(self, heartbeat_before, now) -> None:
+        """Recover jobs whose worker died: requeue them, or fail those out of attempts."""
+        stale = (
+            sqlalchemy.update(IngestJobsT)
+            .where(IngestJobsT.status == "running", IngestJobsT.heartbeat_at < heartbeat_before)
+        )
+        async with self.database.aunit_of_work() as uow:
+            await uow.aupdate(
+                stale.where(IngestJobsT.attempts >= IngestJobsT.max_attempts).values(
+                    status="failed",
+                    error='{"message": "The worker processing this job stopped responding."}',
+                    locked_by=None,
+                    finished_at=now,
+                )
+            )
+            await uow.aupdate(
+                stale.values(status="queued", stage="queued", locked_by=None, run_after=now)
+            )
@@ -19,28 +19,14 @@ class TranscriptOverviewRepository:
         self.shared = SharedMapper()
         self.transcripts_mapper = TranscriptsMapper()
 
-    async def aget_transcript_meta(self, transcript_id: int) -> dict | None:
-        """Fetch core transcript row."""
-        query = sqlalchemy.select(
-            TranscriptsT.id,
-            TranscriptsT.title,
-            TranscriptsT.description,
-            TranscriptsT.status,
-            TranscriptsT.lesson_subject,
-            TranscriptsT.lesson_number,
-            TranscriptsT.tags,
-            TranscriptsT.created,
-            TranscriptsT.modified,
-        ).where(TranscriptsT.id == transcript_id, TranscriptsT.active == 1)
-        result = await self.database.aread(query)
-        rows = result.get("data", [])
-        if not rows:
-            return None
-        return self.transcripts_mapper.to_transcript(rows[0])
+    async def aget_summary(self, transcript_id: int) -> dict | None:
+        """Core transcript row with its section stats and comment count, in one statement.
 
-    async def aget_section_stats(self, transcript_id: int) -> dict:
-        """Return total sections, edited sections, and duration bounds."""
-        query = sqlalchemy.select(
+        Adds ``total_sections``, ``edited_sections``, ``min_ms``/``max_ms``
+        (duration bounds) and ``comment_count`` to the transcript's columns;
+        None when the transcript does not exist.
+        """
+        stats = sqlalchemy.select(
             func.count(TranscriptDetailsT.id).label("total_sections"),
             func.count(
                 sqlalchemy.case(
@@ -53,28 +39,46 @@ class TranscriptOverviewRepository:
                     )
                 )
             ).label("edited_sections"),
-            func.min(TranscriptDetailsT.begin_timestamp).label("min_ts"),
-            func.max(TranscriptDetailsT.end_timestamp).label("max_ts"),
+            func.min(TranscriptDetailsT.begin_ms).label("min_ms"),
+            func.max(TranscriptDetailsT.end_ms).label("max_ms"),
         ).where(
             TranscriptDetailsT.transcription_id == transcript_id,
             TranscriptDetailsT.is_active == 1,
-        )
-        result = await self.database.aread(query)
-        rows = result.get("data", [])
-        if not rows:
-            return {"total_sections": 0, "edited_sections": 0, "min_ts": None, "max_ts": None}
-        return self.shared.normalize_nulls(rows[0])
-
-    async def aget_comment_count(self, transcript_id: int) -> int:
-        query = sqlalchemy.select(
-            func.count(TranscriptDetailsCommentsT.id).label("cnt")
+        ).subquery()
+        comments = sqlalchemy.select(
+            func.count(TranscriptDetailsCommentsT.id).label("comment_count")
         ).where(
             TranscriptDetailsCommentsT.transcription_id == transcript_id,
             TranscriptDetailsCommentsT.is_active == 1,
+        ).subquery()
+        # both aggregates always yield exactly one row, so joining on true keeps the transcript's
+        query = (
+            sqlalchemy.select(
+                TranscriptsT.id,
+                TranscriptsT.title,
+                TranscriptsT.description,
+                TranscriptsT.status,
+                TranscriptsT.lesson_subject,
+                TranscriptsT.lesson_number,
+                TranscriptsT.tags,
+                TranscriptsT.created,
+                TranscriptsT.modified,
+                stats.c.total_sections,
+                stats.c.edited_sections,
+                stats.c.min_ms,
+                stats.c.max_ms,
+                comments.c.comment_count,
+            )
+            .select_from(TranscriptsT)
+            .join(stats, sqlalchemy.true())
+            .join(comments, sqlalchemy.true())
+            .where(TranscriptsT.id == transcript_id, TranscriptsT.active == 1)
         )
         result = await self.database.aread(query)
         rows = result.get("data", [])
-        return rows[0]["cnt"] if rows else 0
+        if not rows:
+            return None
+        return self.transcripts_mapper.to_transcript(rows[0])
 
     async def aget_speakers(self, transcript_id: int) -> list[dict]:
         """Speakers with their section counts."""
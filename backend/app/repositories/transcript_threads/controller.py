@@ -19,7 +19,8 @@ class TranscriptThreadsRepository:
         """All active threads for a transcript, with post count and latest post date.
 
         When *search* is provided, only threads whose post bodies (or title)
-        contain the search text are returned.
+        contain the search text are returned; on Postgres both ILIKEs can use
+        the trigram indexes.
         """
 
         # Sub-query: count of active posts per thread and latest post timestamp
@@ -190,7 +191,12 @@ class TranscriptThreadsRepository:
     # ── Search ──
 
     async def asearch_posts(self, transcription_id: int, query: str) -> list[PostSearchHit]:
-        """Return posts whose body matches *query*, with thread context."""
+        """Return posts whose body matches *query*, with thread context.
+
+        On Postgres the ILIKE is served by ``ix_thread_posts_body_trgm`` and
+        posts where *query* is (close to) a whole word come first, by pg_trgm
+        ``word_similarity``; otherwise, and among equals, newest first.
+        """
         pattern = f"%{query}%"
         stmt = (
             sqlalchemy.select(
@@ -210,9 +216,11 @@ class TranscriptThreadsRepository:
                 ThreadPostsT.is_active == 1,
                 ThreadPostsT.body.ilike(pattern),
             )
-            .order_by(ThreadPostsT.created_at.desc())
             .limit(50)
         )
+        if self.database.dialect_name == "postgresql":
+            stmt = stmt.order_by(func.word_similarity(query, ThreadPostsT.body).desc())
+        stmt = stmt.order_by(ThreadPostsT.created_at.desc())
         result = await self.database.aread(stmt)
         rows = result.get("data", [])
         return self.mapper.to_search_hit_list(rows)
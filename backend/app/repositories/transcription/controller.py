@@ -1,21 +1,78 @@
 import sqlalchemy
+from sqlalchemy.orm import aliased
 
 from app.infrastructure.databases.factory import DatabaseFactory
-from app.db_models.transcription.transcription import TranscriptDetailsT, TranscriptSpeakersT
+from app.db_models.transcription.transcription import (
+    SEARCH_CONFIG,
+    TranscriptDetailsT,
+    TranscriptSpeakersT,
+    TranscriptsT,
+)
+from app.mappers.timestamps import timestamp_to_ms
+from app.mappers.transcript_search import MATCH_START, MATCH_STOP
+
+# Sections are ordered by a sparse integer sort_key. New keys are spaced this
+# far apart, so roughly log2(SECTION_KEY_GAP) inserts can land between two
+# neighbours before the transcript has to be rebalanced.
+SECTION_KEY_GAP = 1024
+
+# Once an insert leaves less room than this next to a neighbour, a background
+# rebalance is requested so the next insert at that spot stays O(1).
+SECTION_KEY_MIN_GAP = 8
+
+# Dialects that can renumber sections with a window function in UPDATE ... FROM
+_UPDATE_FROM_DIALECTS = {"postgresql", "sqlite"}
+
+# Full-text search: the configuration search_vector is built with (inlined, so
+# it is typed regconfig rather than bound as varchar), and ts_headline options
+# marking matches with the delimiters app.mappers.transcript_search expects.
+# Sections are a few sentences long, so the snippet is one passage around the
+# best match rather than fragments (which would drop a short section's start).
+_SEARCH_CONFIG = sqlalchemy.literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+_HEADLINE_OPTIONS = f"StartSel=\"{MATCH_START}\", StopSel=\"{MATCH_STOP}\", MaxWords=35, MinWords=15"
+
+
+def section_order():
+    """ORDER BY clause for a transcript's sections."""
+    return (TranscriptDetailsT.sort_key.asc(), TranscriptDetailsT.id.asc())
+
+
+def section_positions(transcript_id: int):
+    """Sub-query of a transcript's active sections with their 1-based position.
+
+    Join on ``position`` wherever a stored ``section_id`` (activity log,
+    comments) has to be matched back to the section currently at that spot.
+    """
+    return (
+        sqlalchemy.select(
+            TranscriptDetailsT.id.label("id"),
+            sqlalchemy.func.row_number().over(order_by=section_order()).label("position"),
+        )
+        .where(
+            TranscriptDetailsT.transcription_id == transcript_id,
+            TranscriptDetailsT.is_active == 1,
+        )
+        .subquery("section_positions")
+    )
+
 
 class TranscriptRepository:
     def __init__(self):
         self.database = DatabaseFactory()
 
-    async def aget(self, transcript_id: int):
-        query = sqlalchemy.select(
+    @staticmethod
+    def _sections_query(transcript_id: int):
+        return sqlalchemy.select(
             TranscriptDetailsT.id,
             TranscriptDetailsT.transcription_id,
-            TranscriptDetailsT.section_id,
+            # contiguous 1-based position, independent of gaps in sort_key
+            sqlalchemy.func.row_number().over(order_by=section_order()).label("section_id"),
             TranscriptDetailsT.speaker_id,
             TranscriptSpeakersT.display_name.label("speaker"),
             TranscriptDetailsT.begin_timestamp,
             TranscriptDetailsT.end_timestamp,
+            TranscriptDetailsT.begin_ms,
+            TranscriptDetailsT.end_ms,
             TranscriptDetailsT.original_text,
             TranscriptDetailsT.edited_text,
             TranscriptDetailsT.tags,
@@ -26,27 +83,67 @@ class TranscriptRepository:
         ).where(
             TranscriptDetailsT.transcription_id == transcript_id,
             TranscriptDetailsT.is_active == 1,
-        ).order_by(TranscriptDetailsT.section_id.asc(), TranscriptDetailsT.id.asc())
+        ).order_by(*section_order())
+
+    async def aget(self, transcript_id: int):
+        query = self._sections_query(transcript_id)
         result = await self.database.aread(query)
         return result
 
-    async def acreate_section(self, data: dict):
-        stmt = sqlalchemy.insert(TranscriptDetailsT).values(
-            transcription_id=data["transcription_id"],
-            section_id=data["section_id"],
-            speaker_id=data.get("speaker_id"),
-            speaker=data.get("speaker"),
-            begin_timestamp=data.get("begin_timestamp"),
-            end_timestamp=data.get("end_timestamp"),
-            original_text=data.get("original_text"),
-            edited_text=data.get("edited_text"),
-            tags=data.get("tags"),
-            is_active=1,
-        )
-        return await self.database.acreate(stmt)
-
-    async def adeactivate_by_transcript(self, transcript_id: int):
-        stmt = (
+    async def astream_sections(self, transcript_id: int, batch_size: int = 1000):
+        """Yield a transcript's active sections in order, *batch_size* rows at a time."""
+        query = self._sections_query(transcript_id)
+        async for rows in self.database.astream(query, batch_size=batch_size):
+            yield rows
+
+    @staticmethod
+    def _section_values(data: dict) -> dict:
+        sort_key = data.get("sort_key")
+        if sort_key is None:
+            sort_key = data["section_id"] * SECTION_KEY_GAP
+        return {
+            "transcription_id": data["transcription_id"],
+            "section_id": data["section_id"],
+            "sort_key": sort_key,
+            "speaker_id": data.get("speaker_id"),
+            "speaker": data.get("speaker"),
+            "begin_timestamp": data.get("begin_timestamp"),
+            "end_timestamp": data.get("end_timestamp"),
+            "begin_ms": timestamp_to_ms(data.get("begin_timestamp")),
+            "end_ms": timestamp_to_ms(data.get("end_timestamp")),
+            "original_text": data.get("original_text"),
+            "edited_text": data.get("edited_text"),
+            "tags": data.get("tags"),
+            "is_active": 1,
+        }
+
+    async def acreate_section(self, data: dict, uow=None):
+        database = uow or self.database
+        stmt = sqlalchemy.insert(TranscriptDetailsT).values(**self._section_values(data))
+        return await database.acreate(stmt)
+
+    async def acreate_sections_bulk(self, sections: list[dict], uow=None):
+        """Insert many sections in one round trip (and one transaction, without a *uow*)."""
+        database = uow or self.database
+        stmt = sqlalchemy.insert(TranscriptDetailsT)
+        rows = [self._section_values(section) for section in sections]
+        return await database.acreate_many(stmt, rows)
+
+    async def areplace_sections(self, transcript_id: int, sections: list[dict]):
+        """Atomically swap a transcript's active sections for *sections*.
+
+        The old rows are deactivated and the new ones bulk-inserted in a single
+        transaction, so readers never observe a half-written transcript.
+        """
+        stmt = sqlalchemy.insert(TranscriptDetailsT)
+        rows = [self._section_values(section) for section in sections]
+        return await self.database.acreate_many(
+            stmt, rows, before=[self._deactivate_by_transcript_stmt(transcript_id)]
+        )
+
+    @staticmethod
+    def _deactivate_by_transcript_stmt(transcript_id: int):
+        return (
             sqlalchemy.update(TranscriptDetailsT)
             .where(
                 TranscriptDetailsT.transcription_id == transcript_id,
@@ -54,85 +151,329 @@ class TranscriptRepository:
             )
             .values(is_active=0)
         )
-        return await self.database.aupdate(stmt)
 
-    async def aupdate_section(self, section_id: int, updates: dict):
-        """Update a single transcript section by its primary key."""
+    async def adeactivate_by_transcript(self, transcript_id: int, uow=None):
+        database = uow or self.database
+        stmt = self._deactivate_by_transcript_stmt(transcript_id)
+        return await database.aupdate(stmt)
+
+    async def aupdate_section(self, section_id: int, updates: dict, uow=None):
+        """Update a single transcript section by its primary key.
+
+        Changing a timestamp string also updates its millisecond column.
+        """
+        database = uow or self.database
+        for column in ("begin", "end"):
+            if f"{column}_timestamp" in updates:
+                updates = {
+                    **updates,
+                    f"{column}_ms": timestamp_to_ms(updates[f"{column}_timestamp"]),
+                }
         stmt = (
             sqlalchemy.update(TranscriptDetailsT)
             .where(TranscriptDetailsT.id == section_id)
             .values(**updates)
         )
-        result = await self.database.aupdate(stmt)
+        result = await database.aupdate(stmt)
         return result
 
+    # ── Multi-statement operations ───────────────────────────────────
+
+    def aunit_of_work(self):
+        """Open a unit of work so several calls below share one transaction.
+
+        Pass it as ``uow=`` to the methods that accept one.
+        """
+        return self.database.aunit_of_work()
+
+    async def alock_transcript(self, transcript_id: int, uow):
+        """Lock the parent transcript row until *uow* commits.
+
+        Serialises concurrent section inserts/deletes on the same transcript so
+        their key allocation and rebalancing cannot interleave.
+        """
+        query = (
+            sqlalchemy.select(TranscriptsT.id)
+            .where(TranscriptsT.id == transcript_id)
+            .with_for_update()
+        )
+        return await uow.aread(query)
+
     # ── Section ordering helpers ──────────────────────────────────────
 
-    async def aget_max_section_id(self, transcript_id: int) -> int:
-        """Return the highest section_id for a transcript, or 0 if none."""
+    async def aget_section_count(self, transcript_id: int, uow=None) -> int:
+        """Return the number of active sections (= the last position)."""
+        database = uow or self.database
         query = sqlalchemy.select(
-            sqlalchemy.func.coalesce(
-                sqlalchemy.func.max(TranscriptDetailsT.section_id), 0
-            ).label("max_section_id")
+            sqlalchemy.func.count(TranscriptDetailsT.id).label("section_count")
         ).where(
             TranscriptDetailsT.transcription_id == transcript_id,
             TranscriptDetailsT.is_active == 1,
         )
-        result = await self.database.aread(query)
+        result = await database.aread(query)
         rows = result.get("data", [])
-        return rows[0]["max_section_id"] if rows else 0
+        return rows[0]["section_count"] if rows else 0
 
-    async def ashift_section_ids(self, transcript_id: int, from_position: int, delta: int = 1):
-        """Shift section_ids by *delta* for every active row at or after *from_position*."""
-        stmt = (
-            sqlalchemy.update(TranscriptDetailsT)
+    async def _aneighbour_keys(self, transcript_id: int, position: int, database):
+        """sort_keys of the sections currently at *position* - 1 and *position*."""
+        query = (
+            sqlalchemy.select(TranscriptDetailsT.sort_key)
             .where(
                 TranscriptDetailsT.transcription_id == transcript_id,
-                TranscriptDetailsT.section_id >= from_position,
                 TranscriptDetailsT.is_active == 1,
             )
-            .values(section_id=TranscriptDetailsT.section_id + delta)
+            .order_by(*section_order())
+            .offset(max(position - 2, 0))
+            .limit(2 if position > 1 else 1)
         )
-        return await self.database.aupdate(stmt)
+        result = await database.aread(query)
+        keys = [row["sort_key"] for row in result.get("data", [])]
+        if position == 1:
+            return 0, (keys[0] if keys else None)
+        previous_key = keys[0] if keys else 0
+        next_key = keys[1] if len(keys) > 1 else None
+        return previous_key, next_key
+
+    async def aallocate_sort_key(self, transcript_id: int, position: int, uow=None):
+        """Pick a sort_key that places a new section at 1-based *position*.
+
+        Only the two neighbouring keys are read; no other row is written unless
+        there is no integer left between them, in which case the transcript is
+        rebalanced first. Returns ``(sort_key, crowded)`` where *crowded* means
+        the gap is getting small and a background rebalance is worthwhile.
+        """
+        database = uow or self.database
+        previous_key, next_key = await self._aneighbour_keys(transcript_id, position, database)
+        if next_key is None:
+            return previous_key + SECTION_KEY_GAP, False
+
+        if next_key - previous_key < 2:
+            await self.arebalance_sections(transcript_id, uow=uow)
+            previous_key, next_key = await self._aneighbour_keys(transcript_id, position, database)
+
+        sort_key = (previous_key + next_key) // 2
+        crowded = min(sort_key - previous_key, next_key - sort_key) < SECTION_KEY_MIN_GAP
+        return sort_key, crowded
+
+    async def adeactivate_section(self, section_id: int, uow=None):
+        """Soft-delete a single active section by primary key.
 
-    async def adeactivate_section(self, section_id: int):
-        """Soft-delete a single section by primary key."""
+        404 when the section is already inactive, so two concurrent deletes
+        cannot both succeed.
+        """
+        database = uow or self.database
         stmt = (
             sqlalchemy.update(TranscriptDetailsT)
-            .where(TranscriptDetailsT.id == section_id)
+            .where(TranscriptDetailsT.id == section_id, TranscriptDetailsT.is_active == 1)
             .values(is_active=0)
+            .returning(TranscriptDetailsT.id)
         )
-        return await self.database.aupdate(stmt)
+        return await database.aread(stmt)
 
-    async def aget_section(self, section_id: int):
-        """Fetch a single section row by primary key."""
+    async def aget_section(self, section_id: int, uow=None):
+        """Fetch a single section row by primary key, with its current position."""
+        database = uow or self.database
         query = sqlalchemy.select(
             TranscriptDetailsT.id,
             TranscriptDetailsT.transcription_id,
-            TranscriptDetailsT.section_id,
+            self._position_of_section().label("section_id"),
             TranscriptDetailsT.is_active,
         ).where(TranscriptDetailsT.id == section_id)
-        result = await self.database.aread(query)
+        result = await database.aread(query)
         rows = result.get("data", [])
         return rows[0] if rows else None
 
-    async def acompact_section_ids(self, transcript_id: int):
-        """Re-number section_ids to be contiguous (1, 2, 3, …) for a transcript.
+    @staticmethod
+    def _position_of_section():
+        """Correlated 1-based position of the selected section among its transcript's active ones."""
+        earlier = aliased(TranscriptDetailsT)
+        return (
+            sqlalchemy.select(sqlalchemy.func.count(earlier.id))
+            .where(
+                earlier.transcription_id == TranscriptDetailsT.transcription_id,
+                earlier.is_active == 1,
+                sqlalchemy.or_(
+                    earlier.sort_key < TranscriptDetailsT.sort_key,
+                    sqlalchemy.and_(
+                        earlier.sort_key == TranscriptDetailsT.sort_key,
+                        earlier.id <= TranscriptDetailsT.id,
+                    ),
+                ),
+            )
+            .scalar_subquery()
+        )
+
+    async def aget_section_at(self, transcript_id: int, at_ms: int):
+        """The active section playing at *at_ms*: the last one to begin at or before it.
 
-        Uses a sub-query that ranks rows by their current section_id and
-        primary key, then assigns dense sequential ids.
+        One backward seek on ``ix_transcript_details_transcription_begin_ms``;
+        the position is counted for that single row only. None before the
+        first section.
         """
-        # Fetch active sections in order and re-assign section_ids
-        query = sqlalchemy.select(
-            TranscriptDetailsT.id,
-            TranscriptDetailsT.section_id,
-        ).where(
-            TranscriptDetailsT.transcription_id == transcript_id,
-            TranscriptDetailsT.is_active == 1,
-        ).order_by(TranscriptDetailsT.section_id.asc(), TranscriptDetailsT.id.asc())
+        query = (
+            sqlalchemy.select(
+                TranscriptDetailsT.id,
+                TranscriptDetailsT.transcription_id,
+                self._position_of_section().label("section_id"),
+                TranscriptDetailsT.speaker_id,
+                TranscriptSpeakersT.display_name.label("speaker"),
+                TranscriptDetailsT.begin_timestamp,
+                TranscriptDetailsT.end_timestamp,
+                TranscriptDetailsT.begin_ms,
+                TranscriptDetailsT.end_ms,
+                TranscriptDetailsT.original_text,
+                TranscriptDetailsT.edited_text,
+                TranscriptDetailsT.tags,
+                TranscriptDetailsT.is_active,
+            )
+            .outerjoin(TranscriptSpeakersT, TranscriptDetailsT.speaker_id == TranscriptSpeakersT.id)
+            .where(
+                TranscriptDetailsT.transcription_id == transcript_id,
+                TranscriptDetailsT.is_active == 1,
+                TranscriptDetailsT.begin_ms <= at_ms,
+            )
+            .order_by(TranscriptDetailsT.begin_ms.desc(), TranscriptDetailsT.sort_key.desc(), TranscriptDetailsT.id.desc())
+            .limit(1)
+        )
         result = await self.database.aread(query)
         rows = result.get("data", [])
-        for idx, row in enumerate(rows, start=1):
-            if row["section_id"] != idx:
-                await self.aupdate_section(row["id"], {"section_id": idx})
-    
\ No newline at end of file
+        return rows[0] if rows else None
+
+    async def asearch_sections(
+        self,
+        text: str,
+        limit: int = 20,
+        after: tuple[float, int] | None = None,
+        transcript_id: int | None = None,
+    ):
+        """Active sections of active transcripts matching *text*, best first.
+
+        *text* is web-search syntax (``"exact phrase"``, ``or``, ``-word``).
+        Matches come from the GIN index on ``search_vector``; hits are ordered
+        by ``ts_rank_cd`` and then section id, and *after* — the
+        ``(rank, id)`` of the previous page's last hit — continues from there.
+        Positions and ``ts_headline`` snippets are computed for the returned
+        page only. Postgres only.
+        """
+        tsquery = sqlalchemy.func.websearch_to_tsquery(_SEARCH_CONFIG, text)
+        matches = (
+            sqlalchemy.select(
+                TranscriptDetailsT.id.label("id"),
+                sqlalchemy.func.ts_rank_cd(TranscriptDetailsT.search_vector, tsquery).label("rank"),
+            )
+            .join(TranscriptsT, TranscriptsT.id == TranscriptDetailsT.transcription_id)
+            .where(
+                TranscriptDetailsT.is_active == 1,
+                TranscriptDetailsT.search_vector.op("@@")(tsquery),
+                TranscriptsT.active == 1,
+            )
+        )
+        if transcript_id is not None:
+            matches = matches.where(TranscriptDetailsT.transcription_id == transcript_id)
+        matches = matches.subquery("matches")
+
+        page = sqlalchemy.select(matches.c.id, matches.c.rank)
+        if after is not None:
+            page = page.where(sqlalchemy.tuple_(matches.c.rank, matches.c.id) < sqlalchemy.tuple_(*after))
+        page = page.order_by(matches.c.rank.desc(), matches.c.id.desc()).limit(limit).subquery("page")
+
+        shown_text = sqlalchemy.func.coalesce(TranscriptDetailsT.edited_text, TranscriptDetailsT.original_text)
+        query = (
+            sqlalchemy.select(
+                TranscriptDetailsT.id,
+                TranscriptDetailsT.transcription_id,
+                TranscriptsT.title.label("transcript_title"),
+                self._position_of_section().label("section_id"),
+                TranscriptDetailsT.speaker_id,
+                TranscriptSpeakersT.display_name.label("speaker"),
+                TranscriptDetailsT.begin_timestamp,
+                TranscriptDetailsT.begin_ms,
+                sqlalchemy.func.ts_headline(_SEARCH_CONFIG, shown_text, tsquery, _HEADLINE_OPTIONS).label("snippet"),
+                page.c.rank,
+            )
+            .select_from(page)
+            .join(TranscriptDetailsT, TranscriptDetailsT.id == page.c.id)
+            .join(TranscriptsT, TranscriptsT.id == TranscriptDetailsT.transcription_id)
+            .outerjoin(TranscriptSpeakersT, TranscriptDetailsT.speaker_id == TranscriptSpeakersT.id)
+            .order_by(page.c.rank.desc(), page.c.id.desc())
+        )
+        result = await self.database.aread(query)
+        return result.get("data", [])
+
+    async def arebalance_sections(self, transcript_id: int, uow=None):
+        """Re-space sort_keys SECTION_KEY_GAP apart and refresh stored section_ids.
+
+        A single set-based UPDATE: rows are ranked by their current sort_key and
+        primary key, and only rows whose key or position actually changed are
+        written. Postgres (and SQLite) use ``row_number()`` in an
+        ``UPDATE ... FROM``; other dialects such as AzureSQL fall back to a
+        correlated count, which is portable but does more work per row.
+
+        Without a *uow* this runs in its own transaction holding the transcript
+        lock, which is how the background rebalance calls it.
+        """
+        if uow is None:
+            async with self.aunit_of_work() as own_uow:
+                await self.alock_transcript(transcript_id, own_uow)
+                return await self.arebalance_sections(transcript_id, uow=own_uow)
+
+        if uow.dialect_name in _UPDATE_FROM_DIALECTS:
+            stmt = self._rebalance_with_window_stmt(transcript_id)
+        else:
+            stmt = self._rebalance_with_correlated_count_stmt(transcript_id)
+        return await uow.aupdate(stmt)
+
+    @staticmethod
+    def _rebalance_with_window_stmt(transcript_id: int):
+        ranked = (
+            sqlalchemy.select(
+                TranscriptDetailsT.id.label("id"),
+                sqlalchemy.func.row_number().over(order_by=section_order()).label("position"),
+            )
+            .where(
+                TranscriptDetailsT.transcription_id == transcript_id,
+                TranscriptDetailsT.is_active == 1,
+            )
+            .subquery("ranked")
+        )
+        return (
+            sqlalchemy.update(TranscriptDetailsT)
+            .where(
+                TranscriptDetailsT.id == ranked.c.id,
+                sqlalchemy.or_(
+                    TranscriptDetailsT.sort_key.is_distinct_from(ranked.c.position * SECTION_KEY_GAP),
+                    TranscriptDetailsT.section_id.is_distinct_from(ranked.c.position),
+                ),
+            )
+            .values(
+                sort_key=ranked.c.position * SECTION_KEY_GAP,
+                section_id=ranked.c.position,
+            )
+        )
+
+    @staticmethod
+    def _rebalance_with_correlated_count_stmt(transcript_id: int):
+        earlier = aliased(TranscriptDetailsT)
+        position = (
+            sqlalchemy.select(sqlalchemy.func.count(earlier.id))
+            .where(
+                earlier.transcription_id == TranscriptDetailsT.transcription_id,
+                earlier.is_active == 1,
+                sqlalchemy.or_(
+                    earlier.sort_key < TranscriptDetailsT.sort_key,
+                    sqlalchemy.and_(
+                        earlier.sort_key == TranscriptDetailsT.sort_key,
+                        earlier.id <= TranscriptDetailsT.id,
+                    ),
+                ),
+            )
+            .scalar_subquery()
+        )
+        return (
+            sqlalchemy.update(TranscriptDetailsT)
+            .where(
+                TranscriptDetailsT.transcription_id == transcript_id,
+                TranscriptDetailsT.is_active == 1,
+            )
+            .values(sort_key=position * SECTION_KEY_GAP, section_id=position)
+        )
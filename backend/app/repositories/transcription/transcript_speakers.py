@@ -40,10 +40,11 @@ class TranscriptSpeakersRepository:
         mapped_data = self.mapper.to_list_values(result.get("data", []))
         return mapped_data[0] if mapped_data else None
 
-    async def acreate(self, data: TranscriptSpeakerCreate):
+    async def acreate(self, data: TranscriptSpeakerCreate, uow=None):
         """Insert a new speaker and return the result."""
+        database = uow or self.database
         stmt = sqlalchemy.insert(TranscriptSpeakersT).values(**data.model_dump())
-        result = await self.database.acreate(stmt)
+        result = await database.acreate(stmt)
         return result
 
     async def aupdate(self, speaker_id: int, updates: dict):
@@ -56,8 +57,9 @@ class TranscriptSpeakersRepository:
         result = await self.database.aupdate(stmt)
         return result
 
-    async def adeactivate_by_transcript(self, transcription_id: int):
+    async def adeactivate_by_transcript(self, transcription_id: int, uow=None):
         """Soft-delete all speakers for a transcript."""
+        database = uow or self.database
         stmt = (
             sqlalchemy.update(TranscriptSpeakersT)
             .where(
@@ -66,7 +68,7 @@ class TranscriptSpeakersRepository:
             )
             .values(is_active=0)
         )
-        return await self.database.aupdate(stmt)
+        return await database.aupdate(stmt)
 
     async def aget_or_create(self, transcription_id: int, speaker_label: str):
         """
@@ -94,13 +96,65 @@ class TranscriptSpeakersRepository:
         create_result = await self.acreate(create_data)
         return create_result.get("data", {}).get("id")
 
-    async def aget_or_create_by_name(self, transcription_id: int, name: str):
+    async def aget_or_create_many(self, transcription_id: int, labels: list[str], uow=None) -> dict:
+        """
+        Resolve many speaker labels for a transcript at once.
+
+        One SELECT finds the labels that already have an active speaker, and
+        one multi-row INSERT creates the rest. On success ``data`` is
+        ``{label: speaker_id}`` for every label given; if either statement
+        fails its failure envelope is returned instead. Without a *uow* both
+        statements share their own transaction.
+        """
+        labels = list(dict.fromkeys(labels))
+        if not labels:
+            return {"status_code": 200, "message": "Success", "data": {}}
+        if uow is None:
+            async with self.database.aunit_of_work() as own_uow:
+                return await self.aget_or_create_many(transcription_id, labels, uow=own_uow)
+
+        query = sqlalchemy.select(
+            TranscriptSpeakersT.id,
+            TranscriptSpeakersT.speaker_label,
+        ).where(
+            TranscriptSpeakersT.transcription_id == transcription_id,
+            TranscriptSpeakersT.speaker_label.in_(labels),
+            TranscriptSpeakersT.is_active == 1,
+        ).order_by(TranscriptSpeakersT.id.asc())
+        result = await uow.aread(query)
+        if result.get("status_code", 500) >= 400 and result.get("status_code") != 404:
+            return result
+
+        speaker_id_map: dict[str, int] = {}
+        for row in result.get("data", []):
+            speaker_id_map.setdefault(row["speaker_label"], row["id"])
+
+        missing = [label for label in labels if label not in speaker_id_map]
+        if missing:
+            rows = [
+                TranscriptSpeakerCreate(
+                    transcription_id=transcription_id,
+                    speaker_label=label,
+                    display_name=label,
+                    is_active=1,
+                ).model_dump()
+                for label in missing
+            ]
+            create_result = await uow.acreate_many(sqlalchemy.insert(TranscriptSpeakersT), rows)
+            if create_result.get("status_code", 500) >= 400:
+                return create_result
+            speaker_id_map.update(zip(missing, create_result["data"]["ids"]))
+
+        return {"status_code": 200, "message": "Success", "data": speaker_id_map}
+
+    async def aget_or_create_by_name(self, transcription_id: int, name: str, uow=None):
         """
         Look up an active speaker for a transcript by its display name
         (or label). If none matches, create one. Returns the speaker id.
 
         Used when a user assigns/types a speaker on an individual section.
         """
+        database = uow or self.database
         query = sqlalchemy.select(
             TranscriptSpeakersT.id,
         ).where(
@@ -111,7 +165,7 @@ class TranscriptSpeakersRepository:
                 TranscriptSpeakersT.speaker_label == name,
             ),
         ).order_by(TranscriptSpeakersT.id.asc())
-        result = await self.database.aread(query)
+        result = await database.aread(query)
         rows = result.get("data", [])
         if rows:
             return rows[0]["id"]
@@ -122,5 +176,5 @@ class TranscriptSpeakersRepository:
             display_name=name,
             is_active=1,
         )
-        create_result = await self.acreate(create_data)
+        create_result = await self.acreate(create_data, uow=uow)
         return create_result.get("data", {}).get("id")
@@ -1,5 +1,5 @@
 import sqlalchemy
-from sqlalchemy import or_
+from sqlalchemy import func, or_
 
 from app.infrastructure.databases.factory import DatabaseFactory
 
@@ -12,6 +12,16 @@ from app.db_models.security.permissions import PermissionsT
 from app.data_models.user import UserCreate, UserUpdate
 from app.mappers.user_mapper import UserMapper
 from app.auth.security import hash_password
+from app.repositories.user.search_cache import (
+    CANDIDATES,
+    UserSearchCache,
+    like_escape,
+    normalize_query,
+    rank_users,
+)
+
+# one per worker process, shared by every UserRepository
+_search_cache = UserSearchCache()
 
 class UserRepository:
     def __init__(self):
@@ -64,7 +74,34 @@ class UserRepository:
         return {"permissions": codes}
 
     async def search_users(self, query: str = "", limit: int = 10):
-        """Search users by user_name or display_name (ILIKE). Used for @mention autocomplete."""
+        """Active users whose user_name or display_name contains *query*, best match first.
+
+        Used for the @mention autocomplete, so answers go through the
+        per-process ``UserSearchCache`` (see ``search_cache.py`` for the
+        ranking). On Postgres the lookup is served by the trigram indexes and
+        ranked with ``similarity()``; other dialects fall back to ILIKE and
+        rank in Python. An empty *query* lists users by display name.
+        """
+        text = normalize_query(query)
+        cached = _search_cache.get(text, limit)
+        if cached is not None:
+            return {
+                "status_code": 200 if cached else 404,
+                "message": "Success" if cached else "No records were found that match the query criteria.",
+                "data": cached,
+            }
+
+        generation = _search_cache.generation
+        result = await self.database.aread(self._search_users_query(text))
+        if result.get("status_code") not in (200, 404):
+            return result
+        rows = result.get("data", [])
+        if text:
+            rows = rank_users(text, rows)
+        _search_cache.put(text, rows, complete=len(rows) < CANDIDATES, generation=generation)
+        return {**result, "data": rows[:limit]}
+
+    def _search_users_query(self, text: str):
         q = sqlalchemy.select(
             UsersT.id,
             UsersT.user_name,
@@ -72,18 +109,27 @@ class UserRepository:
             UsersT.user_email,
         ).where(UsersT.active == 1)
 
-        if query.strip():
-            pattern = f"%{query.strip()}%"
-            q = q.where(
-                or_(
-                    UsersT.user_name.ilike(pattern),
-                    UsersT.display_name.ilike(pattern),
-                )
+        if not text:
+            return q.order_by(UsersT.display_name.asc(), UsersT.id.asc()).limit(CANDIDATES)
+
+        pattern = f"%{like_escape(text)}%"
+        prefix = f"{like_escape(text)}%"
+        user_name = func.coalesce(UsersT.user_name, "")
+        display_name = func.coalesce(UsersT.display_name, "")
+        q = q.where(
+            or_(
+                UsersT.user_name.ilike(pattern, escape="\\"),
+                UsersT.display_name.ilike(pattern, escape="\\"),
             )
-
-        q = q.order_by(UsersT.display_name.asc()).limit(limit)
-        result = await self.database.aread(q)
-        return result
+        )
+        if self.database.dialect_name != "postgresql":
+            return q.order_by(UsersT.id.asc()).limit(CANDIDATES)
+        # the order rank_users applies, so the CANDIDATES kept are the best ones
+        return q.order_by(
+            or_(user_name.ilike(prefix, escape="\\"), display_name.ilike(prefix, escape="\\")).desc(),
+            func.greatest(func.similarity(text, user_name), func.similarity(text, display_name)).desc(),
+            UsersT.id.asc(),
+        ).limit(CANDIDATES)
 
     async def list_users(self, limit: int, offset: int = 0):
         query = sqlalchemy.select(
@@ -141,17 +187,20 @@ class UserRepository:
         user_data = UserMapper.to_create_values(user)
         stmt = sqlalchemy.insert(UsersT).values(user_data)
         result = await self.database.acreate(stmt)
+        _search_cache.invalidate()
         return result
     
     async def update_user(self, user: UserUpdate,user_id: int):
         user_data = UserMapper.to_update_values(user)
         stmt = sqlalchemy.update(UsersT).where(UsersT.id == user_id).values(user_data)
         result = await self.database.aupdate(stmt)
+        _search_cache.invalidate()
         return result
     
     async def delete_user(self, user_id: int):
         stmt = sqlalchemy.delete(UsersT).where(UsersT.id == user_id)
         result = await self.database.adelete(stmt)
+        _search_cache.invalidate()
         return result
 
     async def set_password(self, user_id: int, plain_password: str, modified_by: int = 1):
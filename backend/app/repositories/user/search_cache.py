@@ -0,0 +1,135 @@
+"""
+Per-process cache and ranking for the @mention autocomplete (``GET /users/search``).
+
+The autocomplete asks again on every keystroke, and the answers for "jo",
+"joh" and "john" overlap: a name containing "john" also contains "jo". Each
+answer is cached under the typed text. Once the database has returned every
+match for a text (fewer than ``CANDIDATES`` rows), the answers for longer
+texts that start with it are filtered from those rows without a query.
+
+Matches are ranked the same way whether they come from the database or the
+cache: names starting with the text first, then pg_trgm ``similarity()`` to
+the text (``trigram_similarity`` is a port of it), then id.
+
+The cache lives in one worker process. User changes made through this
+process clear it; other workers pick them up within ``ttl_seconds``.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# Rows fetched per lookup. An answer with fewer rows holds every match, so
+# the cache can narrow it down for longer texts.
+CANDIDATES = 200
+
+_WORD = re.compile(r'[^\W_]+')
+
+
+def normalize_query(text: str | None) -> str:
+    return (text or '').strip().lower()
+
+
+def like_escape(text: str) -> str:
+    """*text* with LIKE wildcards escaped (``\\`` is the escape character)."""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _trigrams(text: str) -> set[str]:
+    trigrams = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f'  {word} '
+        trigrams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+
+def trigram_similarity(a: str | None, b: str | None) -> float:
+    """pg_trgm's ``similarity(a, b)``: shared trigrams over all trigrams of both."""
+    left, right = _trigrams(a or ''), _trigrams(b or '')
+    if not left or not right:
+        return 0.0
+    shared = len(left & right)
+    return shared / (len(left) + len(right) - shared)
+
+
+def _names(row: dict) -> tuple[str, str]:
+    return (row.get('user_name') or '').lower(), (row.get('display_name') or '').lower()
+
+
+def matches(text: str, row: dict) -> bool:
+    """Whether *row*'s user_name or display_name contains the normalized *text*."""
+    return any(text in name for name in _names(row))
+
+
+def rank_users(text: str, rows: list[dict]) -> list[dict]:
+    """*rows* best match for the normalized *text* first."""
+    def key(row):
+        names = _names(row)
+        prefix = any(name.startswith(text) for name in names)
+        similarity = max(trigram_similarity(text, name) for name in names)
+        return (not prefix, -similarity, row['id'])
+
+    return sorted(rows, key=key)
+
+
+class UserSearchCache:
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 60.0, clock=time.monotonic):
+        self._entries: OrderedDict = OrderedDict()
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """Read before querying and pass to ``put``, so an answer that raced a change is dropped."""
+        return self._generation
+
+    def get(self, text: str, limit: int) -> list[dict] | None:
+        """The first *limit* ranked users for the normalized *text*, or None on a miss."""
+        with self._lock:
+            entry = self._entry(text)
+            if entry is not None:
+                return entry[0][:limit]
+            # narrow down the longest cached complete answer for a prefix; the
+            # result is as old as that answer, so it expires with it
+            for end in range(len(text) - 1, -1, -1):
+                entry = self._entry(text[:end])
+                if entry is not None and entry[1]:
+                    rows = rank_users(text, [row for row in entry[0] if matches(text, row)])
+                    self._store(text, rows, True, expires_at=entry[2])
+                    return rows[:limit]
+            return None
+
+    def put(self, text: str, rows: list[dict], complete: bool, generation: int):
+        """Cache the ranked *rows* for *text*; *complete* when they are every match."""
+        with self._lock:
+            if generation == self._generation:
+                self._store(text, rows, complete)
+
+    def invalidate(self):
+        """Forget every answer; call after users are created, changed or removed."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def _entry(self, text):
+        entry = self._entries.get(text)
+        if entry is None:
+            return None
+        rows, complete, expires_at = entry
+        if expires_at <= self._clock():
+            del self._entries[text]
+            return None
+        self._entries.move_to_end(text)
+        return rows, complete, expires_at
+
+    def _store(self, text, rows, complete, expires_at=None):
+        if expires_at is None:
+            expires_at = self._clock() + self._ttl_seconds
+        self._entries[text] = (rows, complete, expires_at)
+        self._entries.move_to_end(text)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,13 @@
+"""Wire job types to the services that run them (API process and worker alike)."""
+
+from app.services.jobs.queue import JobQueue
+from app.services.transcript_process.exceptions import TranscriptUploadError
+from app.services.transcript_process.service import TRANSCRIPT_UPLOAD_JOB, TranscriptProcessService
+
+
+def register_job_handlers(queue: JobQueue | None = None) -> JobQueue:
+    queue = queue or JobQueue()
+    transcripts = TranscriptProcessService()
+    # a file that fails validation will fail every attempt; don't retry it
+    queue.register(TRANSCRIPT_UPLOAD_JOB, transcripts.aingest_upload, permanent_errors=(TranscriptUploadError,))
+    return queue
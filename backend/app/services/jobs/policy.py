@@ -0,0 +1,66 @@
+"""
+Retry and heartbeat policy for background jobs.
+
+Kept free of database and framework imports so it can be reasoned about (and
+tested) on its own.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+MAX_RETRY_SECONDS = 15 * 60
+
+
+def retry_delay(attempt: int, base_seconds: float, cap_seconds: float = MAX_RETRY_SECONDS) -> float:
+    """Exponential backoff before retry number *attempt* (1 = first retry)."""
+    if attempt < 1:
+        return 0.0
+    return min(cap_seconds, base_seconds * 2 ** (attempt - 1))
+
+
+def should_retry(attempts: int, max_attempts: int, error: BaseException, permanent_errors: tuple = ()) -> bool:
+    """Whether a job that just failed its *attempts*-th run goes back on the queue.
+
+    Errors in *permanent_errors* (bad input, e.g. an unparseable transcript)
+    fail the job immediately: running it again would fail the same way.
+    """
+    if permanent_errors and isinstance(error, permanent_errors):
+        return False
+    return attempts < max_attempts
+
+
+def error_payload(error: BaseException) -> dict:
+    """JSON-able ``{message, code, file}`` describing why a job attempt failed.
+
+    Errors that carry their own user-facing payload (``to_dict()``, like the
+    transcript upload errors) keep it, so the client sees the same structured
+    message it would have got from a synchronous request.
+    """
+    to_dict = getattr(error, "to_dict", None)
+    if callable(to_dict):
+        payload = to_dict()
+        if isinstance(payload, dict) and payload.get("message"):
+            return payload
+    return {"message": str(error) or type(error).__name__, "code": "job_failed", "file": None}
+
+
+async def heartbeat_while(work: Awaitable[T], beat: Callable[[], Awaitable], interval: float) -> T:
+    """Await *work*, calling ``await beat()`` every *interval* seconds until it finishes.
+
+    For job steps that run longer than the queue's stale timeout in one go
+    (transcribing a long recording). If *beat* raises (e.g. the job was
+    lost), *work* is cancelled and the error propagates.
+    """
+    task = asyncio.ensure_future(work)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=interval)
+            if done:
+                return task.result()
+            await beat()
+    finally:
+        task.cancel()
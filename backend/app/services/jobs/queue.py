@@ -0,0 +1,244 @@
+"""
+Background job queue (audio / transcript ingestion).
+
+Jobs live in ``ingest_jobs_t``; that table is the single source of truth for
+status, progress and retries whichever broker is configured
+(``settings.Jobs.Broker``):
+
+- ``Local``: ``JobQueue.astart_workers`` runs worker tasks inside the API
+  process and ``aenqueue`` wakes them at once. Nothing else to deploy.
+- ``Database``: the API process only enqueues; one or more ``python -m
+  app.worker`` processes poll the table and claim jobs with ``FOR UPDATE SKIP
+  LOCKED``, so any number of them can run side by side.
+
+A handler is ``async def handler(payload: dict, progress) -> dict | None``;
+``await progress(stage, percent)`` records a step and is the worker's
+heartbeat. Failed attempts are retried with exponential backoff up to
+``MaxAttempts`` unless the error is one of the handler's ``permanent_errors``.
+A job whose worker stops heart-beating for ``StaleAfterSeconds`` is requeued;
+the old worker's next ``progress`` call then raises ``JobLostError`` and it
+stops without touching the job again.
+"""
+
+import asyncio
+import os
+import socket
+import uuid
+from datetime import timedelta
+
+from app.config.app_logging import AppLogging
+from app.config.app_settings import SettingsConfig
+from app.data_models.ingest_jobs import IngestJobEntry
+from app.mappers.ingest_jobs_mapper import IngestJobMapper
+from app.repositories.jobs.controller import IngestJobsRepository
+from app.services.jobs.policy import error_payload, retry_delay, should_retry
+
+
+class JobLostError(Exception):
+    """The job was requeued to another worker while this one was running it."""
+
+
+class JobProgress:
+    """``await progress(stage, percent)`` callable handed to a job handler."""
+
+    def __init__(self, worker, job_id: int):
+        self._worker = worker
+        self.job_id = job_id
+
+    async def __call__(self, stage: str, percent: int):
+        result = await self._worker.repo.aset_progress(
+            self.job_id, self._worker.worker_id, stage, max(0, min(100, int(percent))),
+            self._worker.mapper.utc_now(),
+        )
+        # a failed write (500) is only a missed heartbeat; no row means the job is gone
+        if result.get("status_code") == 404:
+            raise JobLostError(f"Job {self.job_id} is no longer held by {self._worker.worker_id}")
+
+
+class JobWorker:
+    """Claims jobs one at a time and runs them through the registered handlers."""
+
+    def __init__(self, queue, worker_id: str):
+        self.queue = queue
+        self.repo = queue.repo
+        self.mapper = queue.mapper
+        self.logger = queue.logger
+        self.settings = queue.settings
+        self.worker_id = worker_id
+
+    async def arun_once(self) -> bool:
+        """Claim and run one job; False when there was nothing to do."""
+        job = await self.repo.aclaim(self.worker_id, self.mapper.utc_now())
+        if job is None:
+            return False
+        await self._arun_job(job)
+        return True
+
+    async def _arun_job(self, job: dict):
+        job_id, job_type = job["id"], job["job_type"]
+        handler, permanent_errors = self.queue.handler_for(job_type)
+        self.logger.info(f"Job {job_id} ({job_type}) attempt {job['attempts']} started by {self.worker_id}")
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job type {job_type!r}")
+            result = await handler(self.mapper.to_payload(job), JobProgress(self, job_id))
+        except asyncio.CancelledError:
+            # shutting down: hand the job to the next worker instead of waiting
+            # for it to go stale
+            await asyncio.shield(self.repo.arelease(job_id, self.worker_id, self.mapper.utc_now()))
+            raise
+        except JobLostError:
+            # the new owner records the outcome; anything written now would race it
+            self.logger.warning(f"Job {job_id} ({job_type}) was requeued while {self.worker_id} ran it; stopping")
+        except Exception as e:
+            now = self.mapper.utc_now()
+            retry = handler is not None and should_retry(
+                job["attempts"], job["max_attempts"], e, permanent_errors
+            )
+            retry_at = None
+            if retry:
+                retry_at = now + timedelta(seconds=retry_delay(job["attempts"], self.settings.RetryBaseSeconds))
+            self.logger.warning(
+                f"Job {job_id} ({job_type}) attempt {job['attempts']} failed: {e}"
+                + (f"; retrying at {retry_at}" if retry else "; giving up")
+            )
+            await self.repo.afail(job_id, self.worker_id, self.mapper.dump(error_payload(e)), now, retry_at)
+        else:
+            await self.repo.acomplete(job_id, self.worker_id, self.mapper.dump(result), self.mapper.utc_now())
+            self.logger.info(f"Job {job_id} ({job_type}) succeeded")
+
+    async def arun(self, stop: asyncio.Event):
+        """Work until *stop* is set, sleeping between polls when the queue is empty."""
+        while not stop.is_set():
+            try:
+                if await self.arun_once():
+                    continue
+                stale_before = self.mapper.utc_now() - timedelta(seconds=self.settings.StaleAfterSeconds)
+                await self.repo.arequeue_stale(stale_before, self.mapper.utc_now())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Job worker {self.worker_id} poll failed: {e}")
+            await self.queue.await_work(stop, self.settings.PollSeconds)
+
+
+class JobQueue:
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            print('creating instance of Job Queue')
+            cls._instance = super(JobQueue, cls).__new__(cls)
+            cls._instance._initialize(*args, **kwargs)
+        return cls._instance
+
+    def _initialize(self):
+        self.settings = SettingsConfig().settings.Jobs
+        self.logger = AppLogging().logger
+        self.repo = IngestJobsRepository()
+        self.mapper = IngestJobMapper()
+        self._handlers = {}
+        self._wake = asyncio.Event()
+        self._stop = None
+        self._tasks = []
+
+    @property
+    def is_local(self) -> bool:
+        return self.settings.Broker.lower() == 'local'
+
+    def register(self, job_type: str, handler, permanent_errors: tuple = ()):
+        self._handlers[job_type] = (handler, tuple(permanent_errors))
+
+    def handler_for(self, job_type: str):
+        return self._handlers.get(job_type, (None, ()))
+
+    # -- producers -----------------------------------------------------------
+
+    async def aenqueue(
+        self,
+        job_type: str,
+        payload: dict,
+        transcription_id: int | None = None,
+        idempotency_key: str | None = None,
+        user_id: int | None = None,
+    ) -> tuple[IngestJobEntry, bool]:
+        """Queue a job; returns ``(job, created)``.
+
+        With an *idempotency_key* that was seen before, the existing job is
+        returned with ``created=False`` and nothing new is queued.
+        """
+        if idempotency_key:
+            existing = await self.repo.aget_by_key(idempotency_key)
+            if existing is not None:
+                return self.mapper.to_single(existing), False
+
+        values = self.mapper.to_create_values(
+            job_type,
+            payload,
+            transcription_id=transcription_id,
+            idempotency_key=idempotency_key,
+            max_attempts=self.settings.MaxAttempts,
+            user_id=user_id,
+        )
+        result = await self.repo.acreate(values)
+        if result.get("status_code", 500) >= 400:
+            # lost a race with a concurrent request carrying the same key
+            existing = await self.repo.aget_by_key(idempotency_key) if idempotency_key else None
+            if existing is not None:
+                return self.mapper.to_single(existing), False
+            raise RuntimeError(result.get("message", "Failed to queue job"))
+
+        job = await self.repo.aget(result["data"]["id"])
+        self.notify()
+        return self.mapper.to_single(job), True
+
+    async def aget(self, job_id: int) -> IngestJobEntry | None:
+        row = await self.repo.aget(job_id)
+        return None if row is None else self.mapper.to_single(row)
+
+    async def aget_by_key(self, idempotency_key: str) -> IngestJobEntry | None:
+        row = await self.repo.aget_by_key(idempotency_key)
+        return None if row is None else self.mapper.to_single(row)
+
+    # -- workers -------------------------------------------------------------
+
+    def notify(self):
+        """Wake idle in-process workers (no-op for out-of-process workers, which poll)."""
+        self._wake.set()
+
+    async def await_work(self, stop: asyncio.Event, timeout: float):
+        """Sleep until notified, stopped, or *timeout* seconds pass."""
+        waiters = [asyncio.ensure_future(self._wake.wait()), asyncio.ensure_future(stop.wait())]
+        try:
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+        self._wake.clear()
+
+    def _worker_id(self, index: int) -> str:
+        return f"{socket.gethostname()}:{os.getpid()}:{index}:{uuid.uuid4().hex[:6]}"
+
+    async def arun_workers(self, count: int, stop: asyncio.Event):
+        """Run *count* workers in this process until *stop* is set."""
+        workers = [JobWorker(self, self._worker_id(i)) for i in range(count)]
+        self.logger.info(f"Starting {count} job worker(s): {', '.join(w.worker_id for w in workers)}")
+        await asyncio.gather(*(worker.arun(stop) for worker in workers))
+
+    async def astart_workers(self, count: int | None = None):
+        """Start in-process workers in the background (the ``Local`` broker)."""
+        if self._tasks:
+            return
+        self._stop = asyncio.Event()
+        self._tasks = [asyncio.create_task(self.arun_workers(count or self.settings.Workers, self._stop))]
+
+    async def astop_workers(self, timeout: float = 10.0):
+        """Ask in-process workers to stop; jobs still running after *timeout* are released."""
+        if not self._tasks:
+            return
+        self._stop.set()
+        done, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
@@ -0,0 +1,227 @@
+"""
+Pluggable speech-to-text + diarization engines.
+
+An engine turns audio files into the ``combined_diarized_segments`` structure
+the upload pipeline already writes for uploaded transcripts. Engines run inside
+``TranscriptionPool`` worker processes: ``load()`` is called once per worker,
+then ``transcribe()`` once per batch of audio windows and ``diarize()`` once
+per recording.
+
+- ``nemo``: NVIDIA Parakeet ASR + NeMo clustering diarizer on CPU. Needs
+  ``nemo-toolkit[asr]`` (not in the default image); imported lazily so the
+  rest of the app never pays for it.
+- ``stub``: deterministic fake transcript, no model, for tests and local runs.
+  For 16 kHz WAV input it "hears" runs of constant amplitude as words, so the
+  windowing and stitching can be checked without a model.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import wave
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from app.services.transcript_process.audio_analyzer import parse_rttm
+from app.services.transcript_process.chunking import frame_peak, is_model_ready_wav, segments_from_words
+
+DEFAULT_NEMO_MODEL = "nvidia/parakeet-tdt-0.6b-v3"
+
+
+class TranscriptionEngine(ABC):
+    """Interface every engine implements; an engine missing a method cannot be created."""
+
+    name = "base"
+
+    def load(self) -> None:
+        """Load model weights. Called once per worker process, before any batch."""
+
+    @abstractmethod
+    def transcribe(self, audio_paths: list[str]) -> list[dict[str, Any]]:
+        """One ``{text, segments, words}`` per path; segments/words carry ``start``/``end`` seconds."""
+
+    @abstractmethod
+    def diarize(self, audio_path: str, work_dir: str) -> list[dict[str, Any]]:
+        """Speaker turns ``{speaker, start, end}`` for one file."""
+
+
+class StubEngine(TranscriptionEngine):
+    """Fake transcript per file.
+
+    A 16 kHz mono WAV is "heard": every run of 10 ms frames with the same
+    non-zero peak amplitude is one word, ``w<peak // 100>``. Anything else gets
+    ``segments`` fixed segments. Speaker turns change every two segments.
+
+    Each result also reports the worker pid, how many times this engine was
+    loaded and the batch size, so tests can check the pool's behaviour.
+    """
+
+    name = "stub"
+
+    def __init__(self, segments: int = 4, segment_seconds: float = 5.0, speakers: int = 2):
+        self.segments = segments
+        self.segment_seconds = segment_seconds
+        self.speakers = speakers
+        self.loads = 0
+
+    def load(self) -> None:
+        self.loads += 1
+
+    @staticmethod
+    def _hear(wav_path: str) -> list[dict[str, Any]]:
+        words, current = [], None
+        with wave.open(wav_path, "rb") as wav:
+            rate, width = wav.getframerate(), wav.getsampwidth()
+            frame_len = rate // 100
+            position = 0
+            while frames := wav.readframes(frame_len):
+                peak = frame_peak(frames)
+                start, position = position, position + len(frames) // width
+                if current is not None and current["peak"] == peak:
+                    current["end"] = position / rate
+                    continue
+                if current is not None:
+                    words.append(current)
+                current = {"peak": peak, "start": start / rate, "end": position / rate} if peak else None
+        if current is not None:
+            words.append(current)
+        return [{"text": f"w{w['peak'] // 100}", "start": w["start"], "end": w["end"]} for w in words]
+
+    def _fixed(self, audio_path: str) -> list[dict[str, Any]]:
+        stem = Path(audio_path).stem
+        words = []
+        for i in range(self.segments):
+            start = i * self.segment_seconds
+            tokens = f"{stem} segment {i + 1}.".split()
+            step = self.segment_seconds / len(tokens)
+            words.extend(
+                {"text": token, "start": start + j * step, "end": start + (j + 1) * step}
+                for j, token in enumerate(tokens)
+            )
+        return words
+
+    def transcribe(self, audio_paths):
+        results = []
+        for audio_path in audio_paths:
+            words = self._hear(audio_path) if is_model_ready_wav(audio_path) else self._fixed(audio_path)
+            segments = segments_from_words(words)
+            results.append({
+                "text": " ".join(s["text"] for s in segments),
+                "segments": segments,
+                "words": words,
+                "engine": {
+                    "name": self.name,
+                    "worker_pid": os.getpid(),
+                    "model_loads": self.loads,
+                    "batch_size": len(audio_paths),
+                },
+            })
+        return results
+
+    def diarize(self, audio_path, work_dir):
+        turn = 2 * self.segment_seconds
+        turns = (self.segments + 1) // 2
+        if is_model_ready_wav(audio_path):
+            with wave.open(audio_path, "rb") as wav:
+                turns = math.ceil(wav.getnframes() / wav.getframerate() / turn)
+        return [
+            {"speaker": f"speaker_{i % self.speakers}", "start": i * turn, "end": (i + 1) * turn}
+            for i in range(turns)
+        ]
+
+
+@lru_cache(maxsize=1)
+def get_asr_model(model_name: str):
+    """The ASR model, loaded once per process."""
+    import nemo.collections.asr as nemo_asr
+
+    return nemo_asr.models.ASRModel.from_pretrained(model_name, map_location="cpu")
+
+
+class NemoEngine(TranscriptionEngine):
+    """Parakeet TDT transcription + clustering diarization, on CPU."""
+
+    name = "nemo"
+
+    def __init__(self, model: str = DEFAULT_NEMO_MODEL, max_speakers: int = 8, threads: int | None = None):
+        self.model_name = model
+        self.max_speakers = max_speakers
+        self.threads = threads
+
+    def load(self) -> None:
+        import torch
+
+        if self.threads:
+            # several workers share the CPU; don't let each grab every core
+            torch.set_num_threads(self.threads)
+        self._asr = get_asr_model(self.model_name)
+        self._asr.eval()
+        self._diarizer = self._build_diarizer()
+
+    def transcribe(self, audio_paths):
+        hypotheses = self._asr.transcribe(
+            list(audio_paths),
+            batch_size=len(audio_paths),
+            return_hypotheses=True,
+            timestamps=True,
+        )
+        results = []
+        for hyp in hypotheses:
+            data = hyp.timestamp if hasattr(hyp, "timestamp") else hyp.timestep
+            results.append({
+                "text": hyp.text,
+                "segments": [
+                    {"text": seg["segment"], "start": seg["start"], "end": seg["end"]}
+                    for seg in data["segment"]
+                ],
+                "words": [
+                    {"text": word["word"], "start": word["start"], "end": word["end"]}
+                    for word in data["word"]
+                ],
+            })
+        return results
+
+    def _build_diarizer(self):
+        """The clustering diarizer with its VAD and speaker models loaded; ``diarize`` points it at each file."""
+        from nemo.collections.asr.models import ClusteringDiarizer
+        from nemo.collections.asr.models.configs.diarizer_config import NeuralDiarizerInferenceConfig
+        from omegaconf import OmegaConf
+
+        cfg = OmegaConf.structured(NeuralDiarizerInferenceConfig())
+        cfg.device = "cpu"
+        cfg.verbose = False
+        cfg.num_workers = 0
+        cfg.batch_size = 1
+        cfg.diarizer.manifest_filepath = None
+        cfg.diarizer.out_dir = None
+        cfg.diarizer.oracle_vad = False
+        cfg.diarizer.vad.model_path = "vad_multilingual_marblenet"
+        cfg.diarizer.speaker_embeddings.model_path = "titanet_large"
+        cfg.diarizer.clustering.parameters.max_num_speakers = self.max_speakers
+        return ClusteringDiarizer(cfg=cfg)
+
+    def diarize(self, audio_path, work_dir):
+        # the diarizer reads its config on every call; it writes the manifest for
+        # paths2audio_files into out_dir itself
+        params = self._diarizer._cfg.diarizer
+        params.out_dir = work_dir
+        params.manifest_filepath = None
+        self._diarizer.diarize(paths2audio_files=[audio_path])
+        return parse_rttm(Path(work_dir) / "pred_rttms" / f"{Path(audio_path).stem}.rttm")
+
+
+ENGINES = {
+    StubEngine.name: StubEngine,
+    NemoEngine.name: NemoEngine,
+}
+
+
+def create_engine(name: str, **options) -> TranscriptionEngine:
+    try:
+        engine_cls = ENGINES[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown transcription engine {name!r}. Supported: {', '.join(ENGINES)}") from None
+    return engine_cls(**options)
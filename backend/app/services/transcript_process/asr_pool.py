@@ -0,0 +1,139 @@
+"""
+CPU process pool for transcription engines.
+
+Inference is CPU-bound and holds the GIL, so it runs in worker processes
+rather than threads. Each worker builds its engine and loads the model once, in
+the pool initializer, and then serves batches for its whole life.
+
+``atranscribe`` cuts a recording into overlapping windows (``chunking.py``)
+so a model call never sees more than ``window_seconds`` of audio. Windows are
+batched: a batch is sent to a worker as soon as ``batch_size`` windows are
+waiting, or ``batch_window`` seconds after the first one arrived. A long
+recording therefore fills several batches that run on all workers at once,
+and windows of uploads queued close together share model calls. Diarization
+needs the whole recording to cluster speakers, so it runs once per file, next
+to the window batches.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from app.services.transcript_process import chunking
+from app.services.transcript_process.asr_engines import create_engine
+from app.services.transcript_process.audio_analyzer import add_speakers
+
+# the engine of this worker process, set by _init_worker
+_engine = None
+
+
+def _init_worker(engine_name: str, options: dict):
+    global _engine
+    _engine = create_engine(engine_name, **options)
+    _engine.load()
+
+
+def _transcribe_batch(audio_paths: list[str]) -> list[dict]:
+    return _engine.transcribe(audio_paths)
+
+
+def _diarize(audio_path: str, work_dir: str) -> list[dict]:
+    return _engine.diarize(audio_path, work_dir)
+
+
+class TranscriptionPool:
+    def __init__(
+        self,
+        engine_name: str,
+        options: dict | None = None,
+        workers: int = 1,
+        batch_size: int = 4,
+        batch_window: float = 2.0,
+        window_seconds: float = 60.0,
+        overlap_seconds: float = 4.0,
+        word_level_speakers: bool = False,
+    ):
+        self.engine_name = engine_name
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.window_seconds = window_seconds
+        self.overlap_seconds = overlap_seconds
+        self.word_level_speakers = word_level_speakers
+        # spawn, not fork: model libraries (torch) don't survive a fork of a
+        # process that already started threads
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(engine_name, options or {}),
+        )
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._flush_handle = None
+
+    async def atranscribe(self, audio_path: str) -> dict:
+        """Transcribe and diarize one local audio file; returns the engine's parsed result."""
+        loop = asyncio.get_running_loop()
+        work_dir = tempfile.mkdtemp(prefix="asr-")
+        try:
+            wav_path, windows = await asyncio.to_thread(
+                chunking.prepare, audio_path, work_dir, self.window_seconds, self.overlap_seconds
+            )
+            diarize_dir = os.path.join(work_dir, "diarization")
+            os.makedirs(diarize_dir)
+            speaker_turns = loop.run_in_executor(self._executor, _diarize, wav_path, diarize_dir)
+            try:
+                transcripts = await asyncio.gather(*(self._aqueue(window["path"]) for window in windows))
+            finally:
+                speaker_turns = await speaker_turns
+        finally:
+            await asyncio.to_thread(shutil.rmtree, work_dir, True)
+
+        parsed = chunking.stitch(windows, transcripts)
+        parsed["windows"] = len(windows)
+        if transcripts and "engine" in transcripts[0]:
+            parsed["engine"] = transcripts[0]["engine"]
+        return add_speakers(parsed, speaker_turns, word_level=self.word_level_speakers)
+
+    def _aqueue(self, window_path: str) -> asyncio.Future:
+        """Add one window to the next batch; resolves to its ``{text, segments, words}``."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((window_path, future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch = [(path, future) for path, future in self._pending if not future.cancelled()]
+        self._pending = []
+        if not batch:
+            return
+
+        done = asyncio.get_running_loop().run_in_executor(
+            self._executor, _transcribe_batch, [path for path, _ in batch]
+        )
+
+        def settle(task):
+            error = task.exception() if not task.cancelled() else asyncio.CancelledError()
+            for index, (_, future) in enumerate(batch):
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(task.result()[index])
+
+        done.add_done_callback(settle)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
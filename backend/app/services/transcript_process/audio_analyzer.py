@@ -1,159 +1,199 @@
-# from __future__ import annotations
+"""
+Speaker attribution for machine transcripts.
 
-# from functools import lru_cache
-# from pathlib import Path
-# from typing import Any
-
-# import nemo.collections.asr as nemo_asr
-# import torch
-# from nemo.collections.asr.models import ClusteringDiarizer
-# from nemo.collections.asr.models.configs.diarizer_config import NeuralDiarizerInferenceConfig
-# from omegaconf import OmegaConf
-
-
-# @lru_cache(maxsize=1)
-# def get_asr_model():
-#     return nemo_asr.models.ASRModel.from_pretrained("nvidia/parakeet-tdt-0.6b-v3")
-
-
-# def parse_rttm(rttm_file: Path) -> list[dict[str, Any]]:
-#     speakers: list[dict[str, Any]] = []
-
-#     for line in rttm_file.read_text(encoding="utf-8").splitlines():
-#         if not line.strip() or line.startswith("#"):
-#             continue
-
-#         parts = line.split()
-#         if len(parts) < 8 or parts[0] != "SPEAKER":
-#             continue
-
-#         start = float(parts[3])
-#         duration = float(parts[4])
-#         speakers.append(
-#             {
-#                 "speaker": parts[7],
-#                 "start": start,
-#                 "end": start + duration,
-#             }
-#         )
-
-#     return speakers
-
-
-# def get_overlap(start_a: float, end_a: float, start_b: float, end_b: float) -> float:
-#     return max(0.0, min(end_a, end_b) - max(start_a, start_b))
-
-
-# def attach_speakers(segments: list[dict[str, Any]], speakers: list[dict[str, Any]]) -> list[dict[str, Any]]:
-#     diarized_segments: list[dict[str, Any]] = []
-
-#     for segment in segments:
-#         best_speaker = "UNKNOWN"
-#         best_overlap = 0.0
-
-#         for speaker_turn in speakers:
-#             overlap = get_overlap(
-#                 segment["start"],
-#                 segment["end"],
-#                 speaker_turn["start"],
-#                 speaker_turn["end"],
-#             )
-#             if overlap > best_overlap:
-#                 best_overlap = overlap
-#                 best_speaker = speaker_turn["speaker"]
-
-#         diarized_segments.append({**segment, "speaker": best_speaker})
-
-#     return diarized_segments
-
-
-# def combine_consecutive_speakers(segments: list[dict[str, Any]]) -> list[dict[str, Any]]:
-#     if not segments:
-#         return []
-
-#     combined_segments = [segments[0].copy()]
-
-#     for segment in segments[1:]:
-#         previous = combined_segments[-1]
-
-#         if previous["speaker"] == segment["speaker"]:
-#             previous["text"] = f'{previous["text"]} {segment["text"]}'
-#             previous["end"] = segment["end"]
-#         else:
-#             combined_segments.append(segment.copy())
-
-#     return combined_segments
-
-
-# def build_diarizer(out_dir: Path) -> ClusteringDiarizer:
-#     cfg = OmegaConf.structured(NeuralDiarizerInferenceConfig())
-#     cfg.device = "cuda" if torch.cuda.is_available() else "cpu"
-#     cfg.verbose = False
-#     cfg.num_workers = 0
-#     cfg.batch_size = 1
-#     cfg.diarizer.manifest_filepath = None
-#     cfg.diarizer.out_dir = str(out_dir)
-#     cfg.diarizer.oracle_vad = False
-#     cfg.diarizer.vad.model_path = "vad_multilingual_marblenet"
-#     cfg.diarizer.speaker_embeddings.model_path = "titanet_large"
-#     cfg.diarizer.clustering.parameters.max_num_speakers = 8
-
-#     return ClusteringDiarizer(cfg=cfg)
-
-
-# def build_transcript(audio_path: Path) -> dict[str, Any]:
-#     model = get_asr_model()
-#     hyp = model.transcribe(
-#         [str(audio_path)],
-#         batch_size=1,
-#         return_hypotheses=True,
-#         timestamps=True,
-#     )[0]
-
-#     data = hyp.timestamp if hasattr(hyp, "timestamp") else hyp.timestep
-
-#     return {
-#         "text": hyp.text,
-#         "segments": [
-#             {
-#                 "text": seg["segment"],
-#                 "start": seg["start"],
-#                 "end": seg["end"],
-#             }
-#             for seg in data["segment"]
-#         ],
-#         "words": [
-#             {
-#                 "text": word["word"],
-#                 "start": word["start"],
-#                 "end": word["end"],
-#             }
-#             for word in data["word"]
-#         ],
-#     }
-
-
-# def add_speakers(parsed: dict[str, Any], audio_path: Path, out_dir: Path) -> dict[str, Any]:
-#     diarizer = build_diarizer(out_dir)
-#     diarizer.diarize(paths2audio_files=[str(audio_path)])
-
-#     rttm_file = out_dir / "pred_rttms" / f"{audio_path.stem}.rttm"
-#     speaker_turns = parse_rttm(rttm_file)
-#     parsed["speaker_turns"] = speaker_turns
-#     parsed["diarized_segments"] = attach_speakers(parsed["segments"], speaker_turns)
-#     parsed["combined_diarized_segments"] = combine_consecutive_speakers(parsed["diarized_segments"])
-#     return parsed
-
-
-# def format_timestamp(seconds: float) -> str:
-#     total_milliseconds = int(round(seconds * 1000))
-#     hours, remainder = divmod(total_milliseconds, 3_600_000)
-#     minutes, remainder = divmod(remainder, 60_000)
-#     secs, milliseconds = divmod(remainder, 1000)
-#     return f"{hours:02}:{minutes:02}:{secs:02}.{milliseconds:03}"
-
-
-# def analyze_audio(audio_path: Path, working_directory: Path) -> dict[str, Any]:
-#     parsed = build_transcript(audio_path)
-#     parsed = add_speakers(parsed, audio_path, working_directory)
-#     return parsed
+An ASR engine produces timed ``segments`` (and ``words``); a diarizer produces
+``speaker_turns`` (who spoke when, as RTTM). The helpers here merge the two
+into the ``combined_diarized_segments`` shape that ``parse_transcript_file``
+returns for uploaded transcripts, so both feed the same section writer.
+
+Importing this module stays cheap: engines (``asr_engines.py``) import the
+heavy model libraries, and NumPy is only imported when speakers are attached.
+Without NumPy, ``attach_speakers`` falls back to the pairwise loop.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+
+def parse_rttm(rttm_file: Path) -> list[dict[str, Any]]:
+    """Read the ``SPEAKER`` lines of an RTTM file as ``{speaker, start, end}`` turns."""
+    speakers: list[dict[str, Any]] = []
+
+    for line in Path(rttm_file).read_text(encoding="utf-8").splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+
+        parts = line.split()
+        if len(parts) < 8 or parts[0] != "SPEAKER":
+            continue
+
+        start = float(parts[3])
+        duration = float(parts[4])
+        speakers.append(
+            {
+                "speaker": parts[7],
+                "start": start,
+                "end": start + duration,
+            }
+        )
+
+    return speakers
+
+
+def get_overlap(start_a: float, end_a: float, start_b: float, end_b: float) -> float:
+    return max(0.0, min(end_a, end_b) - max(start_a, start_b))
+
+
+def attach_speakers_naive(segments: list[dict[str, Any]], speakers: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Label each segment with the speaker whose turns overlap it the most.
+
+    Ties go to the earliest turn; a segment no turn overlaps is ``UNKNOWN``.
+    Compares every segment with every turn; ``attach_speakers`` gives the same
+    labels without doing so.
+    """
+    diarized_segments: list[dict[str, Any]] = []
+
+    for segment in segments:
+        best_speaker = "UNKNOWN"
+        best_overlap = 0.0
+
+        for speaker_turn in speakers:
+            overlap = get_overlap(
+                segment["start"],
+                segment["end"],
+                speaker_turn["start"],
+                speaker_turn["end"],
+            )
+            if overlap > best_overlap:
+                best_overlap = overlap
+                best_speaker = speaker_turn["speaker"]
+
+        diarized_segments.append({**segment, "speaker": best_speaker})
+
+    return diarized_segments
+
+
+# overlap pairs scored at once; bounds memory when turns nest deeply
+_PAIRS_PER_BLOCK = 1 << 20
+
+
+def _best_turns(np, seg_start, seg_end, turn_start, turn_end):
+    """Index of the best turn for every segment (-1 when none overlaps).
+
+    Turns are sorted by start. A turn can only overlap ``[s, e)`` if it starts
+    before ``e`` and some turn up to it ends after ``s``; the running maximum of
+    the ends makes both bounds a binary search, so only the turns between them
+    are scored instead of all of them.
+    """
+    order = np.argsort(turn_start, kind="stable")
+    starts, ends = turn_start[order], turn_end[order]
+    max_end = np.maximum.accumulate(ends)
+    lo = np.searchsorted(max_end, seg_start, side="right")
+    hi = np.searchsorted(starts, seg_end, side="left")
+    counts = np.maximum(hi - lo, 0)
+
+    best = np.full(len(seg_start), -1, dtype=np.int64)
+    cumulative = np.cumsum(counts)
+    first = 0
+    while first < len(seg_start):
+        # a block of segments with about _PAIRS_PER_BLOCK candidate pairs
+        done = int(cumulative[first - 1]) if first else 0
+        last = max(first + 1, int(np.searchsorted(cumulative, done + _PAIRS_PER_BLOCK, side="right")))
+        block_counts = counts[first:last]
+        total = int(block_counts.sum())
+        if total:
+            seg = np.repeat(np.arange(first, last), block_counts)
+            offsets = np.arange(total) - np.repeat(np.cumsum(block_counts) - block_counts, block_counts)
+            turn = np.repeat(lo[first:last], block_counts) + offsets
+            # same float operations as get_overlap, so the same ties
+            overlap = np.minimum(seg_end[seg], ends[turn]) - np.maximum(seg_start[seg], starts[turn])
+            original = order[turn]
+            # per segment: largest overlap first, then the earliest turn of the input
+            ranked = np.lexsort((original, -overlap, seg))
+            seg, overlap, original = seg[ranked], overlap[ranked], original[ranked]
+            head = np.ones(total, dtype=bool)
+            head[1:] = seg[1:] != seg[:-1]
+            hit = head & (overlap > 0)
+            best[seg[hit]] = original[hit]
+        first = last
+    return best
+
+
+def attach_speakers(segments: list[dict[str, Any]], speakers: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Label each segment with the speaker whose turns overlap it the most.
+
+    Same result as ``attach_speakers_naive`` (ties go to the earliest turn, no
+    overlap is ``UNKNOWN``) in O((segments + turns) log turns) for diarizations
+    whose turns rarely nest. Also labels words: anything with ``start``/``end``.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return attach_speakers_naive(segments, speakers)
+    if not segments or not speakers:
+        return attach_speakers_naive(segments, speakers)
+
+    best = _best_turns(
+        np,
+        np.fromiter((s["start"] for s in segments), dtype=np.float64, count=len(segments)),
+        np.fromiter((s["end"] for s in segments), dtype=np.float64, count=len(segments)),
+        np.fromiter((t["start"] for t in speakers), dtype=np.float64, count=len(speakers)),
+        np.fromiter((t["end"] for t in speakers), dtype=np.float64, count=len(speakers)),
+    )
+    return [
+        {**segment, "speaker": speakers[index]["speaker"] if index >= 0 else "UNKNOWN"}
+        for segment, index in zip(segments, best.tolist())
+    ]
+
+
+def segments_by_word_speaker(words: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Group speaker-labelled words into segments wherever the speaker changes."""
+    segments: list[dict[str, Any]] = []
+    for word in words:
+        if segments and segments[-1]["speaker"] == word["speaker"]:
+            segments[-1]["text"] = f'{segments[-1]["text"]} {word["text"]}'
+            segments[-1]["end"] = word["end"]
+        else:
+            segments.append({"text": word["text"], "start": word["start"], "end": word["end"], "speaker": word["speaker"]})
+    return segments
+
+
+def combine_consecutive_speakers(segments: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Merge runs of segments by the same speaker into one segment."""
+    if not segments:
+        return []
+
+    combined_segments = [segments[0].copy()]
+
+    for segment in segments[1:]:
+        previous = combined_segments[-1]
+
+        if previous["speaker"] == segment["speaker"]:
+            previous["text"] = f'{previous["text"]} {segment["text"]}'
+            previous["end"] = segment["end"]
+        else:
+            combined_segments.append(segment.copy())
+
+    return combined_segments
+
+
+def add_speakers(
+    parsed: dict[str, Any],
+    speaker_turns: list[dict[str, Any]],
+    word_level: bool = False,
+) -> dict[str, Any]:
+    """Attach diarization to an engine transcript (``{text, segments, words}``).
+
+    With *word_level*, every word gets its own speaker and segments are split
+    where the speaker changes, instead of one speaker per ASR segment.
+    """
+    parsed["speaker_turns"] = speaker_turns
+    if word_level and parsed.get("words"):
+        parsed["words"] = attach_speakers(parsed["words"], speaker_turns)
+        parsed["diarized_segments"] = segments_by_word_speaker(parsed["words"])
+    else:
+        parsed["diarized_segments"] = attach_speakers(parsed["segments"], speaker_turns)
+    parsed["combined_diarized_segments"] = combine_consecutive_speakers(parsed["diarized_segments"])
+    return parsed
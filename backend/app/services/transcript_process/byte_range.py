@@ -0,0 +1,73 @@
+"""
+Parsing of HTTP ``Range`` request headers for audio playback.
+
+Browsers seek inside an ``<audio>`` element by asking for a byte range
+(``Range: bytes=1048576-``). Only single ``bytes`` ranges are honoured; per
+RFC 9110 anything else (multiple ranges, other units, bad syntax) may be
+ignored, in which case the whole file is served with ``200``.
+
+``If-None-Match`` is answered alongside, so a cached copy is revalidated
+with ``304`` instead of being downloaded again.
+"""
+
+from __future__ import annotations
+
+
+class RangeNotSatisfiableError(ValueError):
+    """The requested range starts beyond the end of the file (HTTP 416)."""
+
+
+def parse_range_header(header: str | None, size: int) -> tuple[int, int] | None:
+    """Resolve a ``Range`` header against a file of *size* bytes.
+
+    Returns the inclusive ``(start, end)`` byte offsets to serve, or ``None``
+    when the whole file should be returned instead. Raises
+    :class:`RangeNotSatisfiableError` when the range lies outside the file.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, dash, last = spec.strip().partition("-")
+    first, last = first.strip(), last.strip()
+    if not dash or not (first or last):
+        return None
+    if not all(part.isdigit() for part in (first, last) if part):
+        return None
+    start = int(first) if first else None
+    end = int(last) if last else None
+
+    if start is None:
+        # suffix range: the final *end* bytes
+        if end == 0 or size == 0:
+            raise RangeNotSatisfiableError(header)
+        return max(size - end, 0), size - 1
+    if end is not None and end < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiableError(header)
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+def content_range(start: int, end: int, size: int) -> str:
+    """``Content-Range`` value for a served range."""
+    return f"bytes {start}-{end}/{size}"
+
+
+def etag_matches(header: str | None, etag: str | None) -> bool:
+    """Whether an ``If-None-Match`` header matches the current *etag*.
+
+    Uses the weak comparison RFC 9110 prescribes for ``If-None-Match``: a
+    ``W/`` prefix is ignored on either side, and ``*`` matches any existing
+    file.
+    """
+    if not header or not etag:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or _opaque(etag) in (_opaque(tag) for tag in tags)
+
+
+def _opaque(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
@@ -0,0 +1,278 @@
+"""
+Split long recordings into overlapping windows for transcription, and stitch
+the per-window results back together.
+
+Transcribing a 90-minute lesson in one model call needs memory in proportion
+to its length. Instead the audio is decoded once to 16 kHz mono WAV, cut into
+windows of ``window`` seconds that overlap by ``overlap`` seconds, and each
+window is transcribed on its own (in parallel, see ``asr_pool.py``), so memory
+is bounded by the window size.
+
+Every window owns the part of the timeline between the midpoints of its
+overlaps (``keep_from`` .. ``keep_to``); stitching keeps a word only from the
+window that owns the word's centre, so words heard twice in an overlap appear
+once. Cuts are moved into nearby silences found by a simple energy VAD when
+there are any, so that boundary rarely falls inside a word.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import sys
+import wave
+from array import array
+from typing import Any, Iterable
+
+from app.services.transcript_process.waveform import decode_pcm
+
+SAMPLE_RATE = 16000  # what the ASR models expect
+_SAMPLE_WIDTH = 2
+_VAD_FRAME_MS = 30
+_VAD_BLOCK_FRAMES = 1000  # VAD frames read from the WAV per step
+_COPY_FRAMES = SAMPLE_RATE * 10
+
+
+# --------------------------------------------------------------------------- #
+#  Audio preparation                                                           #
+# --------------------------------------------------------------------------- #
+
+
+def is_model_ready_wav(audio_path: str, sample_rate: int = SAMPLE_RATE) -> bool:
+    """Whether *audio_path* is already 16-bit mono PCM WAV at *sample_rate*."""
+    try:
+        with wave.open(audio_path, "rb") as wav:
+            return (
+                wav.getnchannels() == 1
+                and wav.getsampwidth() == _SAMPLE_WIDTH
+                and wav.getframerate() == sample_rate
+            )
+    except (wave.Error, EOFError, OSError):
+        return False
+
+
+def decode_to_wav(audio_path: str, wav_path: str, sample_rate: int = SAMPLE_RATE) -> None:
+    """Decode any audio file to 16-bit mono WAV with ffmpeg, streaming."""
+    with open(audio_path, "rb") as source, wave.open(wav_path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(_SAMPLE_WIDTH)
+        wav.setframerate(sample_rate)
+        for chunk in decode_pcm(source, sample_rate):
+            wav.writeframesraw(chunk)
+
+
+def wav_duration(wav_path: str) -> float:
+    with wave.open(wav_path, "rb") as wav:
+        return wav.getnframes() / wav.getframerate()
+
+
+def pcm16_samples(data: bytes) -> array:
+    """16-bit little-endian PCM (what ``decode_to_wav`` writes) as signed samples."""
+    samples = array("h", data[:len(data) - len(data) % _SAMPLE_WIDTH])
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return samples
+
+
+def frame_peak(data: bytes) -> int:
+    """Largest absolute sample of 16-bit PCM *data*."""
+    return max((abs(sample) for sample in pcm16_samples(data)), default=0)
+
+
+def frame_rms(data: bytes, frame_len: int) -> list[int]:
+    """RMS (truncated) of every *frame_len*-sample frame of 16-bit PCM *data*; the last may be short."""
+    samples = pcm16_samples(data)
+    try:
+        import numpy as np
+    except ImportError:
+        frames = (samples[i:i + frame_len] for i in range(0, len(samples), frame_len))
+        return [int(math.sqrt(sum(s * s for s in frame) / len(frame))) for frame in frames]
+
+    values = np.frombuffer(samples, dtype=np.int16).astype(np.float64)
+    whole = len(values) - len(values) % frame_len
+    energies = np.sqrt(np.square(values[:whole]).reshape(-1, frame_len).mean(axis=1)).astype(np.int64).tolist()
+    if whole < len(values):
+        energies.append(int(math.sqrt(np.square(values[whole:]).mean())))
+    return energies
+
+
+def find_silences(
+    wav_path: str,
+    min_silence: float = 0.3,
+    threshold_ratio: float = 0.1,
+    frame_ms: int = _VAD_FRAME_MS,
+) -> list[tuple[float, float]]:
+    """Energy VAD: ``(start, end)`` stretches of at least *min_silence* seconds.
+
+    A frame is silent when its RMS is below *threshold_ratio* of the loud end
+    (95th percentile) of the recording's frame energies. *wav_path* is 16-bit
+    mono, as ``decode_to_wav`` writes it.
+    """
+    with wave.open(wav_path, "rb") as wav:
+        rate = wav.getframerate()
+        frame_len = rate * frame_ms // 1000
+        energies = []
+        while block := wav.readframes(frame_len * _VAD_BLOCK_FRAMES):
+            energies.extend(frame_rms(block, frame_len))
+    if not energies:
+        return []
+
+    loud = sorted(energies)[int(0.95 * (len(energies) - 1))]
+    threshold = max(1, loud * threshold_ratio)
+    frame_seconds = frame_len / rate
+
+    silences, run_start = [], None
+    for index, energy in enumerate(energies + [threshold]):  # sentinel closes a trailing run
+        if energy < threshold:
+            if run_start is None:
+                run_start = index
+        elif run_start is not None:
+            start, end = run_start * frame_seconds, index * frame_seconds
+            if end - start >= min_silence:
+                silences.append((start, min(end, len(energies) * frame_seconds)))
+            run_start = None
+    return silences
+
+
+def plan_windows(
+    duration: float,
+    window: float,
+    overlap: float,
+    silences: Iterable[tuple[float, float]] = (),
+    search: float | None = None,
+) -> list[dict[str, float]]:
+    """Overlapping ``{start, end, keep_from, keep_to}`` windows covering ``[0, duration]``.
+
+    The boundary between two windows (the middle of their overlap) is moved
+    back, by at most *search* seconds, to the middle of the closest silence.
+    ``keep_from``/``keep_to`` partition the timeline between the windows.
+    """
+    if window <= overlap:
+        raise ValueError(f"window ({window}s) must be longer than the overlap ({overlap}s)")
+    search = window / 4 if search is None else search
+    silences = sorted(silences)
+    half = overlap / 2
+
+    windows, start, keep_from = [], 0.0, 0.0
+    while start + window < duration:
+        nominal = start + window - half
+        boundary = nominal
+        midpoints = [
+            (s + e) / 2 for s, e in silences
+            if nominal - search <= (s + e) / 2 <= nominal and (s + e) / 2 - half > start
+        ]
+        if midpoints:
+            boundary = max(midpoints)
+        windows.append({"start": start, "end": boundary + half, "keep_from": keep_from, "keep_to": boundary})
+        start, keep_from = boundary - half, boundary
+    windows.append({"start": start, "end": duration, "keep_from": keep_from, "keep_to": duration})
+    return windows
+
+
+def split_wav(wav_path: str, windows: list[dict], out_dir: str) -> list[str]:
+    """Write each window to its own WAV file; at most a few seconds of audio in memory."""
+    paths = []
+    with wave.open(wav_path, "rb") as source:
+        rate = source.getframerate()
+        for index, window in enumerate(windows):
+            path = os.path.join(out_dir, f"window_{index:05d}.wav")
+            first = int(round(window["start"] * rate))
+            remaining = int(round(window["end"] * rate)) - first
+            source.setpos(min(first, source.getnframes()))
+            with wave.open(path, "wb") as out:
+                out.setparams(source.getparams())
+                while remaining > 0:
+                    frames = source.readframes(min(remaining, _COPY_FRAMES))
+                    if not frames:
+                        break
+                    out.writeframesraw(frames)
+                    remaining -= len(frames) // (source.getsampwidth() * source.getnchannels())
+            paths.append(path)
+    return paths
+
+
+def prepare(
+    audio_path: str,
+    work_dir: str,
+    window: float,
+    overlap: float,
+    search: float | None = None,
+) -> tuple[str, list[dict]]:
+    """Decode (if needed), plan and cut windows; returns ``(wav_path, windows)``.
+
+    Each window dict also gets the ``path`` of its WAV file.
+    """
+    if is_model_ready_wav(audio_path):
+        wav_path = audio_path
+    else:
+        wav_path = os.path.join(work_dir, "audio.wav")
+        decode_to_wav(audio_path, wav_path)
+
+    windows = plan_windows(wav_duration(wav_path), window, overlap, find_silences(wav_path), search)
+    for window_info, path in zip(windows, split_wav(wav_path, windows, work_dir)):
+        window_info["path"] = path
+    return wav_path, windows
+
+
+# --------------------------------------------------------------------------- #
+#  Stitching                                                                   #
+# --------------------------------------------------------------------------- #
+
+
+def segments_from_words(
+    words: list[dict[str, Any]],
+    max_gap: float = 1.0,
+    max_seconds: float = 30.0,
+) -> list[dict[str, Any]]:
+    """Group timed words into segments at pauses, sentence ends and *max_seconds*."""
+    segments: list[dict[str, Any]] = []
+    current: list[dict[str, Any]] = []
+
+    def flush():
+        if current:
+            segments.append({
+                "text": " ".join(w["text"] for w in current),
+                "start": current[0]["start"],
+                "end": current[-1]["end"],
+            })
+
+    for word in words:
+        if current and (
+            word["start"] - current[-1]["end"] > max_gap
+            or word["end"] - current[0]["start"] > max_seconds
+            or current[-1]["text"].endswith((".", "?", "!"))
+        ):
+            flush()
+            current = []
+        current.append(word)
+    flush()
+    return segments
+
+
+def stitch(windows: list[dict], transcripts: list[dict[str, Any]]) -> dict[str, Any]:
+    """Merge per-window ``{words}`` (window-relative times) into one transcript.
+
+    Word times are shifted by the window start, and a word is kept only by the
+    window that owns its centre, which drops the copies heard in overlaps.
+    Segments are rebuilt from the stitched words.
+    """
+    words: list[dict[str, Any]] = []
+    last = len(windows) - 1
+    for index, (window, transcript) in enumerate(zip(windows, transcripts)):
+        offset = window["start"]
+        for word in transcript.get("words", []):
+            start, end = word["start"] + offset, word["end"] + offset
+            centre = (start + end) / 2
+            if centre < window["keep_from"]:
+                continue
+            if centre >= window["keep_to"] and index != last:
+                continue
+            words.append({**word, "start": start, "end": end})
+
+    words.sort(key=lambda w: (w["start"], w["end"]))
+    segments = segments_from_words(words)
+    return {
+        "text": " ".join(s["text"] for s in segments),
+        "segments": segments,
+        "words": words,
+    }
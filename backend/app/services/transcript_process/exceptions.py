@@ -106,6 +106,19 @@ class EmptyTranscriptFileError(TranscriptFileError):
         )
 
 
+class MissingTranscriptFileError(TranscriptFileError):
+    """No transcript was uploaded and this server can't transcribe audio itself."""
+
+    code = "transcript_missing"
+
+    def __init__(self, message: str | None = None, *, detail: str | None = None):
+        super().__init__(
+            message
+            or "Please attach the transcript .txt file for this recording.",
+            detail=detail,
+        )
+
+
 class TranscriptDecodeError(TranscriptFileError):
     """The transcript file isn't valid UTF-8 text (e.g. a binary/odd-encoding file)."""
 
@@ -1,22 +1,70 @@
+import asyncio
 import os
+import shutil
+import tempfile
+import uuid
+from functools import lru_cache
+from typing import AsyncIterable, AsyncIterator
 
 from fastapi import UploadFile
 
 from app.config.app_logging import AppLogging
+from app.config.app_settings import SettingsConfig
 from app.infrastructure.storage.factory import StorageFactory
+from app.services.jobs.policy import heartbeat_while
 from app.repositories.transcription.controller import TranscriptRepository
 from app.repositories.transcription.transcript_speakers import TranscriptSpeakersRepository
 from app.repositories.transcripts.transcript_files import TranscriptFilesRepository
-from app.services.transcript_process.transcript_parser import parse_transcript_file, format_timestamp
+from app.services.transcript_process.transcript_parser import aiter_transcript_segments, format_timestamp
+from app.services.transcript_process import waveform
+from app.services.transcript_process.asr_pool import TranscriptionPool
 from app.services.transcript_process.exceptions import (
     EmptyAudioFileError,
     InvalidAudioFileError,
     EmptyTranscriptFileError,
+    MissingTranscriptFileError,
     TranscriptDecodeError,
     TranscriptParseError,
     EmptyTranscriptError,
 )
 
+# enough leading bytes for _validate_audio_bytes to recognise WAV / MP3
+_AUDIO_HEADER_SIZE = 12
+# uploads wait here (one folder per upload) until their ingest job runs
+_STAGING_PREFIX = "ingest"
+# transcript bytes read per step, and sections inserted per statement, while a
+# transcript is parsed and written as a stream
+_TRANSCRIPT_CHUNK_SIZE = 64 * 1024
+_SECTION_BATCH_SIZE = 500
+
+TRANSCRIPT_UPLOAD_JOB = "transcript_upload"
+
+# audio path -> task building its missing waveform, shared by concurrent requests
+_waveform_builds: dict[str, asyncio.Future] = {}
+
+
+@lru_cache(maxsize=1)
+def get_transcription_pool() -> TranscriptionPool:
+    """The process's ASR worker pool, started on first use."""
+    settings = SettingsConfig().settings.Transcription
+    options = {}
+    if settings.Engine.lower() == "nemo":
+        options = {
+            "model": settings.Model,
+            "max_speakers": settings.MaxSpeakers,
+            "threads": max(1, (os.cpu_count() or 1) // settings.Workers),
+        }
+    return TranscriptionPool(
+        settings.Engine,
+        options,
+        workers=settings.Workers,
+        batch_size=settings.BatchSize,
+        batch_window=settings.BatchWindowSeconds,
+        window_seconds=settings.WindowSeconds,
+        overlap_seconds=settings.OverlapSeconds,
+        word_level_speakers=settings.WordLevelSpeakers,
+    )
+
 
 class TranscriptProcessService:
     def __init__(self):
@@ -25,6 +73,10 @@ class TranscriptProcessService:
         self.transcript_repo = TranscriptRepository()
         self.speakers_repo = TranscriptSpeakersRepository()
         self.logger = AppLogging().logger
+        self.audio_redirect = SettingsConfig().settings.Storage.Settings.AudioRedirect
+        self.transcription_enabled = bool(SettingsConfig().settings.Transcription.Engine)
+        # a job must heartbeat well within this, or it is handed to another worker
+        self.job_stale_after = SettingsConfig().settings.Jobs.StaleAfterSeconds
 
     @staticmethod
     def _validate_audio_bytes(audio_bytes: bytes, filename: str | None) -> None:
@@ -50,7 +102,9 @@ class TranscriptProcessService:
             )
 
     @staticmethod
-    def _build_transcript_sections(transcription_id: int, parsed: dict, speaker_id_map: dict) -> list[dict]:
+    def _build_transcript_sections(
+        transcription_id: int, segments: list[dict], speaker_id_map: dict, first_section_id: int = 1
+    ) -> list[dict]:
         return [
             {
                 "transcription_id": transcription_id,
@@ -63,116 +117,297 @@ class TranscriptProcessService:
                 "edited_text": segment["text"],
                 "tags": None,
             }
-            for index, segment in enumerate(parsed.get("combined_diarized_segments", []), start=1)
+            for index, segment in enumerate(segments, start=first_section_id)
+        ]
+
+    async def _ainsert_sections(self, uow, transcription_id: int, segments: list[dict], speaker_id_map: dict, written: int) -> int:
+        """Create the speakers not seen yet, then insert one batch of sections."""
+        new_labels = [
+            segment["speaker"] for segment in segments
+            if segment.get("speaker") and segment["speaker"] not in speaker_id_map
         ]
+        result = await self.speakers_repo.aget_or_create_many(transcription_id, new_labels, uow=uow)
+        if result.get("status_code", 500) >= 400:
+            raise RuntimeError(result.get("message", "Failed to save transcript speakers"))
+        speaker_id_map.update(result["data"])
 
-    async def _create_speakers(self, transcription_id: int, parsed: dict) -> dict:
+        sections = self._build_transcript_sections(transcription_id, segments, speaker_id_map, written + 1)
+        result = await self.transcript_repo.acreate_sections_bulk(sections, uow=uow)
+        if result.get("status_code", 500) >= 400:
+            raise RuntimeError(result.get("message", "Failed to save transcript details"))
+        return len(sections)
+
+    async def _replace_transcript_details(self, transcription_id: int, segments: AsyncIterable[dict]) -> int:
         """
-        Extract unique speaker labels from the parsed output, create rows in
-        transcript_speakers_t and return a mapping {label: speaker_id}.
+        Swap a transcript's speakers and sections for *segments*; returns how many were written.
+
+        Segments are inserted in batches as they arrive, so a long transcript
+        is never held in memory whole, but everything happens in one
+        transaction: readers see the old sections or the new ones, and an error
+        part-way through (or a transcript without segments, which raises
+        EmptyTranscriptError) leaves the old ones in place.
         """
-        segments = parsed.get("combined_diarized_segments", [])
-        unique_labels = list(dict.fromkeys(seg.get("speaker") for seg in segments if seg.get("speaker")))
-        speaker_id_map: dict[str, int] = {}
-        for label in unique_labels:
-            speaker_id = await self.speakers_repo.aget_or_create(transcription_id, label)
-            speaker_id_map[label] = speaker_id
-        return speaker_id_map
-
-    async def _replace_transcript_details(self, transcription_id: int, parsed: dict):
-        # Deactivate old speakers and create fresh ones
-        await self.speakers_repo.adeactivate_by_transcript(transcription_id)
-        speaker_id_map = await self._create_speakers(transcription_id, parsed)
-
-        sections = self._build_transcript_sections(transcription_id, parsed, speaker_id_map)
-        await self.transcript_repo.adeactivate_by_transcript(transcription_id)
-
-        for section in sections:
-            result = await self.transcript_repo.acreate_section(section)
-            if result.get("status_code", 500) >= 400:
-                raise RuntimeError(result.get("message", "Failed to save transcript details"))
-
-        return sections
-
-    async def upload_transcript(
+        async with self.transcript_repo.aunit_of_work() as uow:
+            await self.speakers_repo.adeactivate_by_transcript(transcription_id, uow=uow)
+            await self.transcript_repo.adeactivate_by_transcript(transcription_id, uow=uow)
+
+            speaker_id_map: dict = {}
+            written = 0
+            batch: list[dict] = []
+            async for segment in segments:
+                batch.append(segment)
+                if len(batch) >= _SECTION_BATCH_SIZE:
+                    written += await self._ainsert_sections(uow, transcription_id, batch, speaker_id_map, written)
+                    batch = []
+            if batch:
+                written += await self._ainsert_sections(uow, transcription_id, batch, speaker_id_map, written)
+
+            if not written:
+                raise EmptyTranscriptError()
+            if uow.failed:
+                raise RuntimeError("Failed to save transcript details")
+        return written
+
+    async def astage_upload(
         self,
         transcription_id: int,
         audio_file: UploadFile,
-        transcript_file: UploadFile,
+        transcript_file: UploadFile | None,
         user_id: int = 1,
-    ):
+    ) -> dict:
         """
-        Upload an audio file together with a pre-made transcript text file.
+        Check an upload and park its files in blob storage for the ingest job.
 
-        Steps:
-            1. Read both files
-            2. Parse the transcript text into speaker/timestamp segments
-            3. Upload the audio to blob storage
-            4. Record file metadata in transcript_files_t
-            5. Replace transcript_details_t rows with parsed segments
+        Only the cheap checks run here, so a bad file is still rejected in the
+        request itself with a friendly error:
+            1. Sniff the audio header
+            2. Decode and parse the transcript file as it is read
+            3. Stream the audio and the transcript text to a staging prefix
+
+        Without a transcript file the job transcribes the audio instead, if a
+        transcription engine is configured (``Transcription.Engine``).
+
+        Returns the job payload for :meth:`aingest_upload`.
         """
-        # -- read & validate audio --
-        audio_bytes = await audio_file.read()
-        if not audio_bytes:
+        # -- validate audio from its first bytes; the body is streamed later --
+        audio_header = await audio_file.read(_AUDIO_HEADER_SIZE)
+        if not audio_header:
             raise EmptyAudioFileError()
-        self._validate_audio_bytes(audio_bytes, audio_file.filename)
+        self._validate_audio_bytes(audio_header, audio_file.filename)
+        await audio_file.seek(0)
+
+        # -- check the transcript, parsing it chunk by chunk --
+        if transcript_file is not None:
+            if not await transcript_file.read(1):
+                raise EmptyTranscriptFileError()
+            await transcript_file.seek(0)
+            segments = 0
+            async for _ in self._aparse_transcript(self._aiter_upload(transcript_file)):
+                segments += 1
+            if not segments:
+                raise EmptyTranscriptError()
+            await transcript_file.seek(0)
+        elif not self.transcription_enabled:
+            raise MissingTranscriptFileError()
 
-        # -- read transcript --
-        transcript_bytes = await transcript_file.read()
-        if not transcript_bytes:
-            raise EmptyTranscriptFileError()
+        # -- stage both files for the worker --
+        audio_name = audio_file.filename or f"transcript_{transcription_id}.wav"
+        audio_ext = os.path.splitext(audio_name)[1].lstrip(".")
+        staging = f"{_STAGING_PREFIX}/{transcription_id}/{uuid.uuid4().hex}"
+        payload = {
+            "transcription_id": transcription_id,
+            "user_id": user_id,
+            "audio_name": audio_name,
+            "audio_ext": audio_ext,
+            "staged_audio": f"{staging}/audio.{audio_ext}",
+            "staged_transcript": f"{staging}/transcript.txt" if transcript_file is not None else None,
+        }
+        try:
+            # block-by-block from the upload spool, so memory stays at one
+            # block per upload however large the file is
+            await self.storage.aupload_stream(audio_file.file, payload["staged_audio"])
+            if transcript_file is not None:
+                await self.storage.aupload_stream(transcript_file.file, payload["staged_transcript"])
+            self.logger.info(f"Staged upload for transcript {transcription_id}: {staging}")
+        except Exception as e:
+            self.logger.error(f"Failed to stage upload in blob storage: {e}")
+            raise
+        return payload
+
+    def _download_to(self, blob_path: str, local_path: str):
+        with open(local_path, "wb") as f:
+            for chunk in self.storage.stream_blob(blob_path):
+                f.write(chunk)
+
+    async def _atranscribe_blob(self, blob_path: str) -> dict:
+        """Run speech-to-text + diarization on a stored recording."""
+        work_dir = tempfile.mkdtemp(prefix="transcribe-")
+        try:
+            local_path = os.path.join(work_dir, os.path.basename(blob_path))
+            await asyncio.to_thread(self._download_to, blob_path, local_path)
+            parsed = await get_transcription_pool().atranscribe(local_path)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        if not parsed.get("combined_diarized_segments"):
+            raise EmptyTranscriptError("No speech was found in this recording.")
+        return parsed
+
+    @staticmethod
+    async def _aiter_upload(upload: UploadFile) -> AsyncIterator[bytes]:
+        while chunk := await upload.read(_TRANSCRIPT_CHUNK_SIZE):
+            yield chunk
+
+    @staticmethod
+    async def _aiter_segments(segments: list[dict]) -> AsyncIterator[dict]:
+        for segment in segments:
+            yield segment
 
-        # utf-8-sig transparently strips a BOM if present, otherwise == utf-8
+    async def _aparse_transcript(self, chunks: AsyncIterable[bytes]) -> AsyncIterator[dict]:
+        """Segments of a transcript file streamed as bytes, with parse failures as upload errors."""
         try:
-            transcript_text = transcript_bytes.decode("utf-8-sig")
+            async for segment in aiter_transcript_segments(chunks):
+                yield segment
         except UnicodeDecodeError as e:
             self.logger.error(f"Transcript file is not valid UTF-8 text: {e}")
             raise TranscriptDecodeError(detail=str(e))
-
-        # -- parse transcript --
-        try:
-            parsed = parse_transcript_file(transcript_text)
-        except Exception as e:
+        except ValueError as e:
             self.logger.error(f"Failed to parse transcript file: {e}")
             raise TranscriptParseError(detail=str(e))
 
-        segments = parsed.get("combined_diarized_segments", [])
-        if not segments:
-            raise EmptyTranscriptError()
+    async def aingest_upload(self, payload: dict, progress) -> dict:
+        """
+        Background job body for a staged upload (job type ``transcript_upload``).
 
-        # -- upload audio to blob storage --
-        audio_name = audio_file.filename or f"transcript_{transcription_id}.wav"
-        audio_ext = os.path.splitext(audio_name)[1].lstrip(".")
-        blob_path = f"audio/{transcription_id}.{audio_ext}"
+        Steps:
+            1. Transcribe the audio, if no transcript was uploaded
+            2. Copy the staged audio to its final path (server side)
+            3. Decode it into waveform peaks stored beside it
+            4. Replace transcript_details_t rows with the segments, streaming
+               and parsing the staged transcript as they are written
+            5. Record file metadata in transcript_files_t
+            6. Remove the staged files
 
-        try:
-            self.storage.upload(audio_bytes, blob_path)
-            self.logger.info(f"Uploaded audio file to blob: {blob_path}")
-        except Exception as e:
-            self.logger.error(f"Failed to upload audio to blob storage: {e}")
-            raise
+        Every step can be repeated, so a retried job simply runs again from the
+        top; the file record is written last so a failed attempt leaves none.
+        """
+        transcription_id = payload["transcription_id"]
+        blob_path = f"audio/{transcription_id}.{payload['audio_ext']}"
+
+        parsed = None
+        if not payload.get("staged_transcript"):
+            await progress("transcribing audio", 5)
+            # one long step (download, ASR, diarization): keep the job's heartbeat going
+            parsed = await heartbeat_while(
+                self._atranscribe_blob(payload["staged_audio"]),
+                lambda: progress("transcribing audio", 5),
+                self.job_stale_after / 3,
+            )
 
-        # -- record audio file metadata --
+        await progress("storing audio", 15)
+        container = self.storage.container_name
+        await self.storage.acopy_blob(container, payload["staged_audio"], container, blob_path)
+        self.logger.info(f"Stored audio file in blob: {blob_path}")
+
+        await progress("building waveform", 35)
+        await self._store_waveform_from_blob(blob_path)
+
+        await progress("writing sections", 70)
+        if parsed is None:
+            segments = self._aparse_transcript(await self.storage.astream(payload["staged_transcript"]))
+        else:
+            segments = self._aiter_segments(parsed["combined_diarized_segments"])
+        sections_created = await self._replace_transcript_details(transcription_id, segments)
+
+        await progress("recording file", 90)
         file_record = {
             "transcription_id": transcription_id,
-            "file_name": audio_name,
-            "file_type": audio_ext,
+            "file_name": payload["audio_name"],
+            "file_type": payload["audio_ext"],
             "file_path": blob_path,
-            "created_by": user_id,
+            "created_by": payload["user_id"],
         }
         result = await self.file_repo.create(file_record)
         if result.get("status_code", 500) >= 400:
             raise RuntimeError(result.get("message", "Failed to create transcript file record"))
 
-        # -- persist transcript sections --
-        sections = await self._replace_transcript_details(transcription_id, parsed)
-
-        result["data"] = {
+        await self.adiscard_staged(payload)
+        return {
             **result.get("data", {}),
             "file_path": blob_path,
-            "sections_created": len(sections),
+            "sections_created": sections_created,
         }
-        return result
 
-    def get_audio(self, file_path: str):
-        return self.storage.read(file_path)
\ No newline at end of file
+    async def adiscard_staged(self, payload: dict):
+        """Best effort: delete a staged upload's files."""
+        for path in filter(None, (payload["staged_audio"], payload.get("staged_transcript"))):
+            try:
+                await self.storage.adelete(path)
+            except Exception as e:
+                self.logger.warning(f"Could not delete staged file {path!r}: {e}")
+
+    async def aget_audio(self, file_path: str):
+        return await self.storage.aread(file_path)
+
+    async def aget_audio_info(self, file_path: str) -> dict:
+        return await self.storage.aget_blob_info(file_path)
+
+    async def astream_audio(self, file_path: str, offset: int = 0, length: int | None = None, etag: str | None = None):
+        return await self.storage.astream_range(file_path, offset, length, etag)
+
+    async def aget_audio_url(self, file_path: str, content_type: str | None = None) -> str:
+        """Short-lived signed read-only URL the client can fetch the audio from directly."""
+        return await self.storage.agenerate_read_url(file_path, content_type)
+
+    # -- waveform ------------------------------------------------------------
+
+    @staticmethod
+    def waveform_path(audio_path: str) -> str:
+        return f"{os.path.splitext(audio_path)[0]}.peaks"
+
+    async def _store_waveform_from_blob(self, audio_path: str) -> bytes | None:
+        """Best effort: a missing waveform must not fail the upload itself."""
+        try:
+            peaks = await asyncio.to_thread(self._generate_waveform_from_blob, audio_path)
+            await self.storage.aupload(peaks, self.waveform_path(audio_path))
+            return peaks
+        except Exception as e:
+            self.logger.warning(f"Could not build waveform for {audio_path!r}: {e}")
+            return None
+
+    def _generate_waveform_from_blob(self, audio_path: str) -> bytes:
+        with tempfile.TemporaryFile() as spool:
+            for chunk in self.storage.stream_blob(audio_path):
+                spool.write(chunk)
+            spool.seek(0)
+            return waveform.generate(spool)
+
+    async def aget_waveform(self, audio_path: str) -> bytes:
+        """Peaks file for an audio blob, built (and stored) on first use for older uploads.
+
+        Only a missing or corrupt peaks file starts a build; any other storage
+        error is raised. Concurrent requests for the same recording share one
+        build.
+        """
+        try:
+            peaks = await self.storage.aread(self.waveform_path(audio_path))
+            waveform.read_header(peaks)
+            return peaks
+        except waveform.WaveformError as e:
+            self.logger.warning(f"Stored waveform for {audio_path!r} is unreadable ({e}); rebuilding it")
+        except Exception as e:
+            if not self.storage.is_not_found(e):
+                raise
+            self.logger.info(f"No stored waveform for {audio_path!r}; generating it")
+        build = _waveform_builds.get(audio_path)
+        if build is None:
+            build = asyncio.ensure_future(self._abuild_waveform(audio_path))
+            _waveform_builds[audio_path] = build
+            build.add_done_callback(lambda _: _waveform_builds.pop(audio_path, None))
+        # shielded: a client that disconnects must not cancel the others' build
+        return await asyncio.shield(build)
+
+    async def _abuild_waveform(self, audio_path: str) -> bytes:
+        peaks = await asyncio.to_thread(self._generate_waveform_from_blob, audio_path)
+        await self.storage.aupload(peaks, self.waveform_path(audio_path))
+        return peaks
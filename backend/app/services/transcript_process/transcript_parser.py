@@ -13,12 +13,17 @@ lines.
 
 Returns a list of segment dicts compatible with the rest of the
 transcript-process pipeline (keys: speaker, start, end, text).
+
+``aiter_transcript_segments`` parses the same format from an async stream of
+bytes and yields segments one at a time, so a large upload never has to be
+held in memory whole; ``parse_transcript_file`` is the whole-text version.
 """
 
 from __future__ import annotations
 
+import codecs
 import re
-from typing import Any
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator
 
 
 # Matches timestamps like 00:01:23, 00:01:23.456, 1:23, 1:23.456, 01:23
@@ -68,58 +73,95 @@ def _parse_header_line(line: str) -> tuple[str, float] | None:
     return speaker, seconds
 
 
-def parse_transcript_file(content: str) -> dict[str, Any]:
-    """
-    Parse transcript text content and return a dict with:
-      - combined_diarized_segments: list of {speaker, start, end, text}
+class _SegmentBuilder:
+    """Line-by-line parser state shared by the whole-text and streaming parsers.
 
-    The ``end`` of each segment is set to the ``start`` of the next segment.
-    For the last segment, ``end`` equals ``start`` (the caller / player can
-    handle this gracefully).
+    A segment is handed out once its ``end`` is known, which is when the next
+    block turns out to have text: the ``end`` of each segment is the ``start``
+    of the next one (blocks without text are dropped, so they don't count).
     """
-    lines = content.splitlines()
-
-    raw_segments: list[dict[str, Any]] = []
-    current_speaker: str | None = None
-    current_start: float | None = None
-    current_text_lines: list[str] = []
-
-    def _flush():
-        if current_speaker is not None and current_start is not None:
-            text = " ".join(t.strip() for t in current_text_lines if t.strip())
-            if text:
-                raw_segments.append({
-                    "speaker": current_speaker,
-                    "start": current_start,
-                    "text": text,
-                })
 
-    for line in lines:
-        stripped = line.strip()
+    def __init__(self):
+        self._pending: dict[str, Any] | None = None
+        self._speaker: str | None = None
+        self._start: float | None = None
+        self._text_lines: list[str] = []
+
+    def _close_block(self) -> None:
+        if self._speaker is not None and self._text_lines:
+            self._pending = {"speaker": self._speaker, "start": self._start, "text": " ".join(self._text_lines)}
+        self._speaker, self._text_lines = None, []
 
-        # Skip blank lines (but flush any current block first)
+    def feed(self, line: str) -> Iterator[dict[str, Any]]:
+        stripped = line.strip()
+        # Skip blank lines
         if not stripped:
-            continue
+            return
 
         header = _parse_header_line(stripped)
         if header:
-            # Flush the previous block
-            _flush()
-            current_speaker, current_start = header
-            current_text_lines = []
-        else:
+            self._close_block()
+            self._speaker, self._start = header
+        elif self._speaker is not None:
+            if not self._text_lines and self._pending is not None:
+                # this block has text, so the previous segment ends where it starts
+                self._pending["end"] = self._start
+                yield self._pending
+                self._pending = None
             # Accumulate text for the current block
-            current_text_lines.append(stripped)
+            self._text_lines.append(stripped)
+
+    def finish(self) -> Iterator[dict[str, Any]]:
+        self._close_block()
+        if self._pending is not None:
+            # the last segment has no successor: it ends where it starts (the
+            # caller / player can handle this gracefully)
+            self._pending["end"] = self._pending["start"]
+            yield self._pending
+            self._pending = None
+
+
+def iter_transcript_segments(lines: Iterable[str]) -> Iterator[dict[str, Any]]:
+    """Yield ``{speaker, start, end, text}`` segments from transcript lines."""
+    builder = _SegmentBuilder()
+    for line in lines:
+        yield from builder.feed(line)
+    yield from builder.finish()
 
-    # Flush the last block
-    _flush()
 
-    # Assign end timestamps: each segment ends when the next begins
-    for i in range(len(raw_segments) - 1):
-        raw_segments[i]["end"] = raw_segments[i + 1]["start"]
-    if raw_segments:
-        raw_segments[-1]["end"] = raw_segments[-1]["start"]
+async def aiter_transcript_segments(chunks: AsyncIterable[bytes]) -> AsyncIterator[dict[str, Any]]:
+    """Yield segments from an async stream of UTF-8 bytes, as they complete.
+
+    Decoding is incremental (``utf-8-sig``, so a BOM is dropped) and lines are
+    split across chunk boundaries the same way ``str.splitlines`` would split
+    the whole text. Raises ``UnicodeDecodeError`` on invalid UTF-8.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    builder = _SegmentBuilder()
+    tail = ""
+    async for chunk in chunks:
+        lines = (tail + decoder.decode(chunk)).splitlines(keepends=True)
+        # the last piece may be a line still being written
+        tail = lines.pop() if lines and lines[-1] == lines[-1].rstrip("\r\n") else ""
+        for line in lines:
+            for segment in builder.feed(line):
+                yield segment
+    for line in (tail + decoder.decode(b"", final=True)).splitlines():
+        for segment in builder.feed(line):
+            yield segment
+    for segment in builder.finish():
+        yield segment
+
+
+def parse_transcript_file(content: str) -> dict[str, Any]:
+    """
+    Parse transcript text content and return a dict with:
+      - combined_diarized_segments: list of {speaker, start, end, text}
 
+    The ``end`` of each segment is set to the ``start`` of the next segment.
+    For the last segment, ``end`` equals ``start`` (the caller / player can
+    handle this gracefully).
+    """
     return {
-        "combined_diarized_segments": raw_segments,
+        "combined_diarized_segments": list(iter_transcript_segments(content.splitlines())),
     }
@@ -0,0 +1,194 @@
+"""
+Waveform overview ("peaks") for the editor's audio player.
+
+The upload pipeline decodes each recording once with ffmpeg and stores a
+compact multi-resolution peaks file next to the audio blob, so the player can
+draw a waveform without downloading and decoding the whole recording.
+
+Level 0 holds one signed 8-bit ``(min, max)`` pair per ``SAMPLES_PER_BUCKET``
+mono samples at ``SAMPLE_RATE``; every following level halves the resolution
+by merging neighbouring buckets, down to ``MIN_BUCKETS`` buckets.
+
+File layout (little-endian)::
+
+    magic     4s   b"PEAK"
+    version   B    1
+    bits      B    8
+    levels    H    number of levels
+    rate      I    decoded sample rate (Hz)
+    base      I    samples per bucket at level 0
+    counts    I * levels   bucket count of each level
+    data      level 0 pairs, then level 1, ... as interleaved int8 min,max
+"""
+
+from __future__ import annotations
+
+import shutil
+import struct
+import subprocess
+import threading
+from array import array
+from typing import BinaryIO, Iterable, Iterator
+
+SAMPLE_RATE = 8000
+SAMPLES_PER_BUCKET = 256  # ~31 buckets per second at level 0
+MIN_BUCKETS = 256
+
+_MAGIC = b"PEAK"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBBHII")
+_READ_SIZE = 64 * 1024
+
+
+class WaveformError(RuntimeError):
+    """The audio could not be decoded into peaks."""
+
+
+# --------------------------------------------------------------------------- #
+#  Decoding                                                                    #
+# --------------------------------------------------------------------------- #
+
+
+def decode_pcm(audio: BinaryIO, sample_rate: int = SAMPLE_RATE) -> Iterator[bytes]:
+    """Decode *audio* to mono signed 16-bit PCM with ffmpeg, chunk by chunk.
+
+    The file is piped through ffmpeg's stdin/stdout, so neither the encoded
+    nor the decoded audio is ever held in memory as a whole.
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise WaveformError("ffmpeg is not installed")
+
+    process = subprocess.Popen(
+        [ffmpeg, "-v", "error", "-i", "pipe:0", "-ac", "1", "-ar", str(sample_rate), "-f", "s16le", "pipe:1"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+
+    def feed():
+        try:
+            while chunk := audio.read(_READ_SIZE):
+                process.stdin.write(chunk)
+        except (BrokenPipeError, ValueError):
+            pass  # ffmpeg exited early; its return code says why
+        finally:
+            process.stdin.close()
+
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+    try:
+        while chunk := process.stdout.read(_READ_SIZE):
+            yield chunk
+    except GeneratorExit:
+        process.kill()  # consumer stopped early; no need to decode the rest
+        raise
+    finally:
+        process.stdout.close()
+        feeder.join()
+        stderr = process.stderr.read().decode(errors="replace").strip()
+        process.stderr.close()
+        returncode = process.wait()
+    if returncode != 0:
+        raise WaveformError(f"ffmpeg failed: {stderr or returncode}")
+
+
+# --------------------------------------------------------------------------- #
+#  Peaks                                                                       #
+# --------------------------------------------------------------------------- #
+
+
+def compute_peaks(pcm_chunks: Iterable[bytes], samples_per_bucket: int = SAMPLES_PER_BUCKET) -> array:
+    """Level-0 peaks: interleaved int8 ``min, max`` per bucket of int16 samples."""
+    peaks = array("b")
+    pending = b""
+    bucket_bytes = samples_per_bucket * 2
+    for chunk in pcm_chunks:
+        data = pending + chunk
+        usable = len(data) - len(data) % bucket_bytes
+        samples = array("h", data[:usable])
+        pending = data[usable:]
+        for start in range(0, len(samples), samples_per_bucket):
+            bucket = samples[start:start + samples_per_bucket]
+            peaks.append(min(bucket) >> 8)
+            peaks.append(max(bucket) >> 8)
+    if len(pending) >= 2:
+        bucket = array("h", pending[:len(pending) - len(pending) % 2])
+        peaks.append(min(bucket) >> 8)
+        peaks.append(max(bucket) >> 8)
+    return peaks
+
+
+def downsample(peaks: array) -> array:
+    """Halve the resolution: merge each pair of buckets into one."""
+    merged = array("b")
+    for start in range(0, len(peaks), 4):
+        pair = peaks[start:start + 4]
+        merged.append(min(pair[0::2]))
+        merged.append(max(pair[1::2]))
+    return merged
+
+
+def build_levels(level0: array, min_buckets: int = MIN_BUCKETS) -> list[array]:
+    """Level 0 plus coarser levels, while a level still has ``min_buckets``."""
+    levels = [level0]
+    while (len(levels[-1]) // 2 + 1) // 2 >= min_buckets:
+        levels.append(downsample(levels[-1]))
+    return levels
+
+
+def encode(levels: list[array], sample_rate: int = SAMPLE_RATE, samples_per_bucket: int = SAMPLES_PER_BUCKET) -> bytes:
+    header = _HEADER.pack(_MAGIC, _VERSION, 8, len(levels), sample_rate, samples_per_bucket)
+    counts = struct.pack(f"<{len(levels)}I", *(len(level) // 2 for level in levels))
+    return header + counts + b"".join(level.tobytes() for level in levels)
+
+
+def generate(audio: BinaryIO) -> bytes:
+    """Decode *audio* and return the encoded multi-resolution peaks file."""
+    return encode(build_levels(compute_peaks(decode_pcm(audio))))
+
+
+# --------------------------------------------------------------------------- #
+#  Reading                                                                     #
+# --------------------------------------------------------------------------- #
+
+
+def read_header(blob: bytes) -> dict:
+    """Header of a peaks file; WaveformError if *blob* is not a complete one."""
+    try:
+        magic, version, bits, level_count, sample_rate, samples_per_bucket = _HEADER.unpack_from(blob)
+        counts = struct.unpack_from(f"<{level_count}I", blob, _HEADER.size)
+    except struct.error as e:
+        raise WaveformError(f"truncated peaks file: {e}") from e
+    if magic != _MAGIC or version != _VERSION:
+        raise WaveformError("not a peaks file")
+    data_offset = _HEADER.size + 4 * level_count
+    if not counts or len(blob) < data_offset + 2 * sum(counts):
+        raise WaveformError("truncated peaks file")
+    return {
+        "bits": bits,
+        "sample_rate": sample_rate,
+        "samples_per_bucket": samples_per_bucket,
+        "bucket_counts": list(counts),
+        "data_offset": data_offset,
+    }
+
+
+def extract_level(blob: bytes, zoom: int) -> tuple[bytes, dict]:
+    """Return one level's int8 ``min, max`` pairs and its metadata.
+
+    *zoom* 0 is the finest level; each step up halves the resolution. Values
+    beyond the coarsest level are clamped to it.
+    """
+    header = read_header(blob)
+    counts = header["bucket_counts"]
+    zoom = max(0, min(zoom, len(counts) - 1))
+    start = header["data_offset"] + 2 * sum(counts[:zoom])
+    data = blob[start:start + 2 * counts[zoom]]
+    return data, {
+        "zoom": zoom,
+        "zoom_levels": len(counts),
+        "sample_rate": header["sample_rate"],
+        "samples_per_bucket": header["samples_per_bucket"] << zoom,
+        "buckets": counts[zoom],
+    }
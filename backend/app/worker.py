@@ -0,0 +1,38 @@
+"""
+Ingestion worker process.
+
+    python -m app.worker [--workers N]
+
+Claims jobs from ``ingest_jobs_t`` (see ``app/services/jobs/queue.py``) until
+SIGINT / SIGTERM, then hands any job it is still running back to the queue.
+Run as many of these as needed with ``Jobs.Broker`` set to ``Database``; with
+the ``Local`` broker the API process runs its own workers instead.
+"""
+
+import argparse
+import asyncio
+import signal
+
+from app.config.app_settings import SettingsConfig
+from app.services.jobs.handlers import register_job_handlers
+
+
+async def amain(workers: int):
+    queue = register_job_handlers()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await queue.arun_workers(workers, stop)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run background ingestion workers.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=SettingsConfig().settings.Jobs.Workers,
+        help="concurrent jobs in this process (default: Jobs.Workers)",
+    )
+    args = parser.parse_args()
+    asyncio.run(amain(args.workers))
@@ -0,0 +1,79 @@
+"""
+Shared database setup for the benchmarks.
+
+Builds a ``DatabaseFactory`` bound to an arbitrary async SQLAlchemy URL and
+installs it as the process-wide singleton, so repositories and routes imported
+afterwards run against it unchanged.
+
+By default this is an in-memory SQLite database (via aiosqlite) with a
+``public`` schema attached, which is enough to compare query *shapes* (round
+trips, statement counts). Pass ``--url postgresql+asyncpg://...`` to the
+benchmarks to measure against a real, throwaway Postgres database; tables are
+created there with ``create_all`` if they do not exist yet.
+"""
+
+import argparse
+import logging
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.db_models.base import Base
+from app.infrastructure.databases.factory import DatabaseFactory
+from app.infrastructure.databases.row_mapper import RowMapper
+from app.infrastructure.databases.sql import SQLFactory
+
+# register every table on Base.metadata
+import app.db_models.transcription.transcription  # noqa: F401
+import app.db_models.user  # noqa: F401
+import app.db_models.notifications  # noqa: F401
+
+SQLITE_URL = 'sqlite+aiosqlite://'
+
+
+def add_url_argument(parser: argparse.ArgumentParser):
+    parser.add_argument('--url', default=SQLITE_URL, help='async SQLAlchemy URL (default: in-memory SQLite)')
+
+
+def _create_engine(url: str, pool_size: int, max_overflow: int):
+    if not url.startswith('sqlite'):
+        return create_async_engine(url, pool_size=pool_size, max_overflow=max_overflow)
+
+    engine = create_async_engine(url, poolclass=StaticPool)
+
+    @event.listens_for(engine.sync_engine, 'connect')
+    def _attach_public_schema(dbapi_connection, connection_record):
+        dbapi_connection.execute("ATTACH DATABASE ':memory:' AS public")
+        # transcript_details_t.search_vector is generated with to_tsvector();
+        # SQLite just stores the text
+        dbapi_connection.create_function('to_tsvector', 2, lambda config, text: text, deterministic=True)
+        # let SQLAlchemy (not pysqlite) control BEGIN so SAVEPOINTs work
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, 'begin')
+    def _begin(conn):
+        conn.exec_driver_sql('BEGIN')
+
+    return engine
+
+
+async def install_database(url: str = SQLITE_URL, pool_size: int = 20, max_overflow: int = 40) -> DatabaseFactory:
+    """Create the schema at *url* and make it the ``DatabaseFactory`` singleton.
+
+    *pool_size* and *max_overflow* apply to Postgres; SQLite shares one connection.
+    """
+    engine = _create_engine(url, pool_size, max_overflow)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    provider = object.__new__(SQLFactory)
+    provider._logger = logging.getLogger('benchmarks')
+    provider.row_mapper = RowMapper()
+    provider.aengine = engine
+
+    database = object.__new__(DatabaseFactory)
+    database.database_provider = provider
+    database._health = True
+    DatabaseFactory._instance = database
+    return database
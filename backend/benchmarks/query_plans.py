@@ -0,0 +1,241 @@
+"""
+Benchmark: query plans of the hot section / activity log / notification reads.
+
+Seeds synthetic data shaped like a busy deployment (every transcript uploaded
+twice, so half of its sections are inactive; a long activity log per
+transcript; mostly-read notifications per user), then runs the real
+repository methods and captures the SQL they send. Each statement is
+explained twice: with the indexes as of revision 16, and with the indexes
+added by revision 17 (``alembic/versions/17_add_hot_path_indexes.py``). The
+run fails if a query does not use the index it was added for.
+
+On Postgres the plan is ``EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`` and its
+execution time is reported; on the default in-memory SQLite it is
+``EXPLAIN QUERY PLAN``. Both report the median wall time of the repository
+call. ``--save DIR`` writes every captured plan to a file.
+
+The benchmark creates and drops indexes itself, so point ``--url`` at a
+throwaway database only.
+
+Run from the backend folder:
+
+    python -m benchmarks.query_plans
+    python -m benchmarks.query_plans --url postgresql+asyncpg://... --save plans/
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import sqlalchemy
+from sqlalchemy import event
+
+from app.db_models.notifications import NotificationsT
+from app.db_models.transcription.transcription import TranscriptActivityLogT, TranscriptDetailsT
+from app.db_models.user import UsersT
+from benchmarks._db import add_url_argument, install_database
+
+ACTIONS = ['section_edited', 'comment_added', 'speaker_renamed', 'section_added', 'section_deleted', 'tag_added']
+
+
+def _index(name, *columns, where=None):
+    options = {}
+    if where is not None:
+        options = {'postgresql_where': where, 'sqlite_where': where}
+    return sqlalchemy.Index(name, *columns, **options)
+
+
+# Indexes on these tables as of revision 16 (migrations 08, 11, 14, 16) ...
+BASELINE_INDEXES = [
+    _index('ix_transcript_details_transcription_sort_key', TranscriptDetailsT.transcription_id, TranscriptDetailsT.sort_key),
+    _index(
+        'ix_transcript_details_transcription_begin_ms',
+        TranscriptDetailsT.transcription_id, TranscriptDetailsT.begin_ms,
+        where=TranscriptDetailsT.is_active == 1,
+    ),
+    _index('ix_activity_log_transcription_id', TranscriptActivityLogT.transcription_id, TranscriptActivityLogT.created_at),
+    _index('ix_notifications_user_unread', NotificationsT.user_id, NotificationsT.is_read),
+    _index('ix_notifications_created', NotificationsT.created_at),
+]
+# ... and what revision 17 changes.
+ADDED_INDEXES = [
+    _index(
+        'ix_transcript_details_active_order',
+        TranscriptDetailsT.transcription_id, TranscriptDetailsT.sort_key, TranscriptDetailsT.id,
+        where=TranscriptDetailsT.is_active == 1,
+    ),
+    _index(
+        'ix_activity_log_transcription_action_created',
+        TranscriptActivityLogT.transcription_id, TranscriptActivityLogT.action, TranscriptActivityLogT.created_at.desc(),
+    ),
+    _index('ix_notifications_user_created', NotificationsT.user_id, NotificationsT.created_at.desc()),
+    _index(
+        'ix_notifications_user_unread_created',
+        NotificationsT.user_id, NotificationsT.created_at.desc(),
+        where=NotificationsT.is_read == 0,
+    ),
+]
+DROPPED_INDEXES = ['ix_notifications_user_unread']
+
+
+def _queries(transcript_id, user_id):
+    """(name, repository call, index revision 17 added for it)."""
+    from app.repositories.activity_log.controller import ActivityLogRepository
+    from app.repositories.notifications.controller import NotificationRepository
+    from app.repositories.transcription.controller import TranscriptRepository
+
+    sections, activity, notifications = TranscriptRepository(), ActivityLogRepository(), NotificationRepository()
+    return [
+        ('sections', lambda: sections.aget(transcript_id), 'ix_transcript_details_active_order'),
+        ('recent_edits', lambda: activity.alist_recent_edits(transcript_id),
+         'ix_activity_log_transcription_action_created'),
+        ('activity_by_action', lambda: activity.alist(transcript_id, actions=['comment_added']),
+         'ix_activity_log_transcription_action_created'),
+        ('notifications', lambda: notifications.alist(user_id), 'ix_notifications_user_created'),
+        ('notifications_unread', lambda: notifications.alist(user_id, unread_only=True),
+         'ix_notifications_user_unread_created'),
+        ('unread_count', lambda: notifications.acount_unread(user_id), 'ix_notifications_user_unread_created'),
+    ]
+
+
+async def _insert(conn, table, rows, batch=5000):
+    for i in range(0, len(rows), batch):
+        await conn.execute(sqlalchemy.insert(table), rows[i:i + batch])
+
+
+async def _seed(engine, args):
+    rnd = random.Random(3)
+    start = datetime(2025, 1, 1)
+    async with engine.begin() as conn:
+        await _insert(conn, UsersT, [
+            {'id': u, 'display_name': f'user {u}', 'created': start, 'created_by': 1, 'modified': start,
+             'modified_by': 1, 'active': 1}
+            for u in range(1, args.users + 1)
+        ])
+        sections, activity = [], []
+        for t in range(1, args.transcripts + 1):
+            # an older upload (deactivated) and the current one
+            for is_active in (0, 1):
+                sections.extend(
+                    {'transcription_id': t, 'section_id': s, 'sort_key': s * 1024, 'is_active': is_active,
+                     'begin_ms': s * 4000, 'end_ms': s * 4000 + 3500, 'original_text': f'section {s}'}
+                    for s in range(1, args.sections + 1)
+                )
+            activity.extend(
+                {'transcription_id': t, 'action': rnd.choice(ACTIONS), 'section_id': rnd.randint(1, args.sections),
+                 'user_id': rnd.randint(1, args.users), 'created_at': start + timedelta(minutes=rnd.randrange(500_000))}
+                for _ in range(args.activity)
+            )
+        await _insert(conn, TranscriptDetailsT, sections)
+        await _insert(conn, TranscriptActivityLogT, activity)
+        await _insert(conn, NotificationsT, [
+            {'user_id': u, 'title': 'You were mentioned', 'is_read': int(rnd.random() < 0.8),
+             'created_at': start + timedelta(minutes=rnd.randrange(500_000))}
+            for u in range(1, args.users + 1)
+            for _ in range(args.notifications)
+        ])
+    return len(sections), len(activity), args.users * args.notifications
+
+
+async def _set_indexes(engine, create, drop):
+    async with engine.begin() as conn:
+        for name in drop:
+            await conn.exec_driver_sql(f'DROP INDEX IF EXISTS public.{name}')
+        for index in create:
+            await conn.run_sync(lambda sync_conn, index=index: index.create(sync_conn, checkfirst=True))
+        await conn.exec_driver_sql('ANALYZE')
+
+
+async def _explain(engine, statement, parameters):
+    """Plan of *statement* as ``(index names, execution ms or None, plan text)``."""
+    async with engine.connect() as conn:
+        if engine.dialect.name == 'postgresql':
+            result = await conn.exec_driver_sql(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}', parameters)
+            plan = result.scalar()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            text = json.dumps(plan, indent=2)
+            return set(re.findall(r'"Index Name": "(\w+)"', text)), plan[0]['Execution Time'], text
+        result = await conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters)
+        text = '\n'.join(row[-1] for row in result.fetchall())
+        return set(re.findall(r'USING (?:COVERING )?INDEX (\w+)', text)), None, text
+
+
+async def _measure(engine, name, call, repeat, save_dir, phase):
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', capture)
+    try:
+        await call()
+    finally:
+        event.remove(engine.sync_engine, 'before_cursor_execute', capture)
+    statement, parameters = next((s, p) for s, p in captured if s.lstrip().upper().startswith('SELECT'))
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    indexes, execution_ms, plan = await _explain(engine, statement, parameters)
+    if save_dir:
+        with open(os.path.join(save_dir, f'{name}.{phase}.txt'), 'w') as f:
+            f.write(f'{statement}\n-- {parameters}\n\n{plan}\n')
+    return indexes, execution_ms, statistics.median(timings)
+
+
+async def _run(args):
+    database = await install_database(args.url)
+    engine = database.database_provider.aengine
+    if args.save:
+        os.makedirs(args.save, exist_ok=True)
+
+    added = [index.name for index in ADDED_INDEXES]
+    await _set_indexes(engine, BASELINE_INDEXES, added)
+    counts = await _seed(engine, args)
+    print(f'{engine.dialect.name}: {counts[0]} sections, {counts[1]} activity entries, {counts[2]} notifications')
+
+    queries = _queries(transcript_id=args.transcripts // 2 or 1, user_id=args.users // 2 or 1)
+    before = {}
+    await _set_indexes(engine, [], [])
+    for name, call, _ in queries:
+        before[name] = await _measure(engine, name, call, args.repeat, args.save, 'before')
+
+    await _set_indexes(engine, ADDED_INDEXES, DROPPED_INDEXES)
+    missing = []
+    print(f"{'query':<22} {'before ms':>10} {'after ms':>10} {'exec ms':>16}  index used")
+    for name, call, expected in queries:
+        indexes, execution_ms, median = await _measure(engine, name, call, args.repeat, args.save, 'after')
+        _, before_execution_ms, before_median = before[name]
+        execution = f'{before_execution_ms:.2f} -> {execution_ms:.2f}' if execution_ms is not None else '-'
+        print(f'{name:<22} {before_median:>10.2f} {median:>10.2f} {execution:>16}  {", ".join(sorted(indexes))}')
+        if expected not in indexes:
+            missing.append(f'{name}: expected {expected}, plan used {sorted(indexes) or "no index"}')
+
+    if missing:
+        raise SystemExit('index not used:\n  ' + '\n  '.join(missing))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--transcripts', type=int, default=200)
+    parser.add_argument('--sections', type=int, default=300, help='sections per upload; each transcript has two uploads')
+    parser.add_argument('--activity', type=int, default=500, help='activity log entries per transcript')
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--notifications', type=int, default=200, help='notifications per user')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--save', metavar='DIR', help='write every captured statement and plan to DIR')
+    add_url_argument(parser)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
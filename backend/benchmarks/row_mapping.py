@@ -0,0 +1,136 @@
+"""
+Benchmark: DB row -> dict materialisation in SQLFactory.
+
+Compares the previous pandas path (``DataFrame(rows).astype(object)`` +
+``where(notnull)`` + ``to_dict('records')``) against ``RowMapper`` for result
+sets shaped like ``transcript_details_t``. Each (implementation, size) pair
+runs in a fresh process so the reported peak RSS is not polluted by earlier
+runs.
+
+Run from the backend folder:
+
+    python -m benchmarks.row_mapping
+    python -m benchmarks.row_mapping --sizes 100 10000 100000 --repeat 5
+"""
+
+import argparse
+import multiprocessing as mp
+import resource
+import time
+
+import sqlalchemy
+
+from app.infrastructure.databases.row_mapper import RowMapper
+
+_metadata = sqlalchemy.MetaData()
+_sections = sqlalchemy.Table(
+    'transcript_details_t',
+    _metadata,
+    sqlalchemy.Column('id', sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column('transcription_id', sqlalchemy.Integer),
+    sqlalchemy.Column('section_id', sqlalchemy.Integer),
+    sqlalchemy.Column('speaker_id', sqlalchemy.Integer, nullable=True),
+    sqlalchemy.Column('begin_timestamp', sqlalchemy.String(50)),
+    sqlalchemy.Column('end_timestamp', sqlalchemy.String(50)),
+    sqlalchemy.Column('original_text', sqlalchemy.Text),
+    sqlalchemy.Column('edited_text', sqlalchemy.Text),
+    sqlalchemy.Column('tags', sqlalchemy.Text, nullable=True),
+    sqlalchemy.Column('modified_at', sqlalchemy.DateTime, nullable=True),
+    sqlalchemy.Column('is_active', sqlalchemy.Integer),
+)
+
+_TEXT = 'so if we take the numerator and the denominator and we multiply both by three '
+
+
+def _fetch_rows(size):
+    engine = sqlalchemy.create_engine('sqlite://')
+    _metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            sqlalchemy.insert(_sections),
+            [
+                {
+                    'id': i,
+                    'transcription_id': 1,
+                    'section_id': i,
+                    # every 7th section has no speaker, every 3rd no tags
+                    'speaker_id': None if i % 7 == 0 else i % 4,
+                    'begin_timestamp': '00:01:23.456',
+                    'end_timestamp': '00:01:27.000',
+                    'original_text': _TEXT,
+                    'edited_text': _TEXT,
+                    'tags': None if i % 3 == 0 else 'question,math',
+                    'modified_at': None,
+                    'is_active': 1,
+                }
+                for i in range(1, size + 1)
+            ],
+        )
+    with engine.connect() as conn:
+        result = conn.execute(sqlalchemy.select(_sections))
+        return list(result.keys()), result.fetchall()
+
+
+def _pandas_map(keys, rows):
+    import pandas as pd
+
+    df = pd.DataFrame(rows).astype(object)
+    return df.where(df.notnull(), None).to_dict(orient='records')
+
+
+def _row_mapper_map(keys, rows):
+    return RowMapper().map_rows(keys, rows)
+
+
+IMPLEMENTATIONS = {
+    'pandas': _pandas_map,
+    'row_mapper': _row_mapper_map,
+}
+
+
+def _run_case(name, size, repeat, queue):
+    keys, rows = _fetch_rows(size)
+    mapper = IMPLEMENTATIONS[name]
+    if name == 'pandas':
+        import pandas  # noqa: F401 - import cost must not land inside the timing
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        records = mapper(keys, rows)
+        best = min(best, time.perf_counter() - start)
+        del records
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put({
+        'impl': name,
+        'rows': size,
+        'rows_per_sec': size / best if best else float('inf'),
+        'peak_rss_mb': rss_after / 1024,
+        'mapping_rss_mb': (rss_after - rss_before) / 1024,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    ctx = mp.get_context('spawn')
+    print(f"{'impl':<12} {'rows':>8} {'rows/sec':>14} {'peak RSS MB':>12} {'mapping +MB':>12}")
+    for size in args.sizes:
+        for name in IMPLEMENTATIONS:
+            queue = ctx.Queue()
+            proc = ctx.Process(target=_run_case, args=(name, size, args.repeat, queue))
+            proc.start()
+            stats = queue.get()
+            proc.join()
+            print(
+                f"{stats['impl']:<12} {stats['rows']:>8} {stats['rows_per_sec']:>14,.0f} "
+                f"{stats['peak_rss_mb']:>12.1f} {stats['mapping_rss_mb']:>12.1f}"
+            )
+
+
+if __name__ == '__main__':
+    main()
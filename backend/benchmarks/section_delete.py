@@ -0,0 +1,108 @@
+"""
+Benchmark: DELETE /transcriptions/sections/{id} latency vs transcript length.
+
+Deletes section #2 of transcripts of growing length and times the soft-delete
+plus any renumbering, comparing the old row-by-row compaction (one SELECT,
+then one UPDATE + commit per out-of-place section), a set-based compaction in
+one statement (``TranscriptRepository.arebalance_sections``) and the current
+gap-key ordering, where positions are computed on read and the delete writes
+only the deleted row.
+
+Run from the backend folder:
+
+    python -m benchmarks.section_delete
+    python -m benchmarks.section_delete --lengths 100 1000 5000 --url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import sqlalchemy
+
+from benchmarks._db import add_url_argument, install_database
+
+
+async def _compact_row_by_row(repository, transcript_id):
+    from app.db_models.transcription.transcription import TranscriptDetailsT
+
+    query = sqlalchemy.select(
+        TranscriptDetailsT.id,
+        TranscriptDetailsT.section_id,
+    ).where(
+        TranscriptDetailsT.transcription_id == transcript_id,
+        TranscriptDetailsT.is_active == 1,
+    ).order_by(TranscriptDetailsT.sort_key.asc(), TranscriptDetailsT.id.asc())
+    result = await repository.database.aread(query)
+    for idx, row in enumerate(result.get('data', []), start=1):
+        if row['section_id'] != idx:
+            await repository.aupdate_section(row['id'], {'section_id': idx})
+
+
+async def _delete_row_by_row(repository, transcript_id, section_db_id):
+    await repository.adeactivate_section(section_db_id)
+    await _compact_row_by_row(repository, transcript_id)
+
+
+async def _delete_set_based(repository, transcript_id, section_db_id):
+    async with repository.aunit_of_work() as uow:
+        await repository.alock_transcript(transcript_id, uow)
+        await repository.adeactivate_section(section_db_id, uow=uow)
+        await repository.arebalance_sections(transcript_id, uow=uow)
+
+
+async def _delete_gap_keys(repository, transcript_id, section_db_id):
+    async with repository.aunit_of_work() as uow:
+        await repository.alock_transcript(transcript_id, uow)
+        await repository.adeactivate_section(section_db_id, uow=uow)
+
+
+STRATEGIES = {
+    'row_by_row': _delete_row_by_row,
+    'set_based': _delete_set_based,
+    'gap_keys': _delete_gap_keys,
+}
+
+
+async def _seed(repository, transcript_id, length):
+    sections = [
+        {'transcription_id': transcript_id, 'section_id': i, 'original_text': f'section {i}'}
+        for i in range(1, length + 1)
+    ]
+    result = await repository.acreate_sections_bulk(sections)
+    return result['data']['ids']
+
+
+async def _run(args):
+    await install_database(args.url)
+    from app.repositories.transcription.controller import TranscriptRepository
+
+    repository = TranscriptRepository()
+    transcript_id = 0
+    print(f"{'strategy':<12} {'sections':>9} {'median ms':>10} {'max ms':>10}")
+    for length in args.lengths:
+        for name, strategy in STRATEGIES.items():
+            timings = []
+            for _ in range(args.repeat):
+                transcript_id += 1
+                ids = await _seed(repository, transcript_id, length)
+                start = time.perf_counter()
+                await strategy(repository, transcript_id, ids[1])
+                timings.append((time.perf_counter() - start) * 1000)
+
+                rows = (await repository.aget(transcript_id))['data']
+                assert [r['section_id'] for r in rows] == list(range(1, length)), name
+            print(f'{name:<12} {length:>9} {statistics.median(timings):>10.1f} {max(timings):>10.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lengths', type=int, nargs='+', default=[100, 500, 2000])
+    parser.add_argument('--repeat', type=int, default=3)
+    add_url_argument(parser)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
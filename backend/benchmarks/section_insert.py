@@ -0,0 +1,116 @@
+"""
+Benchmark: POST /transcriptions/{id}/sections latency vs transcript length.
+
+Inserts a section at position #2 of transcripts of growing length, comparing
+the old scheme (shift every following ``section_id`` by one in a single
+UPDATE, then insert) with sparse sort keys, where the new row takes a key
+between its two neighbours and nothing else is written. Also reports how
+many existing rows each strategy rewrote.
+
+Run from the backend folder:
+
+    python -m benchmarks.section_insert
+    python -m benchmarks.section_insert --lengths 100 1000 5000 --url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import sqlalchemy
+
+from benchmarks._db import add_url_argument, install_database
+
+POSITION = 2
+
+
+def _new_section(transcript_id, position, sort_key=None):
+    return {
+        'transcription_id': transcript_id,
+        'section_id': position,
+        'sort_key': sort_key,
+        'original_text': 'inserted',
+    }
+
+
+async def _insert_shift(repository, transcript_id, length):
+    from app.db_models.transcription.transcription import TranscriptDetailsT
+    from app.repositories.transcription.controller import SECTION_KEY_GAP
+
+    async with repository.aunit_of_work() as uow:
+        await repository.alock_transcript(transcript_id, uow)
+        await uow.aupdate(
+            sqlalchemy.update(TranscriptDetailsT)
+            .where(
+                TranscriptDetailsT.transcription_id == transcript_id,
+                TranscriptDetailsT.is_active == 1,
+                TranscriptDetailsT.section_id >= POSITION,
+            )
+            .values(
+                section_id=TranscriptDetailsT.section_id + 1,
+                sort_key=TranscriptDetailsT.sort_key + SECTION_KEY_GAP,
+            )
+        )
+        await repository.acreate_section(_new_section(transcript_id, POSITION), uow=uow)
+    return length - POSITION + 1
+
+
+async def _insert_gap_keys(repository, transcript_id, length):
+    async with repository.aunit_of_work() as uow:
+        await repository.alock_transcript(transcript_id, uow)
+        sort_key, _ = await repository.aallocate_sort_key(transcript_id, POSITION, uow=uow)
+        await repository.acreate_section(_new_section(transcript_id, POSITION, sort_key), uow=uow)
+    return 0
+
+
+STRATEGIES = {
+    'shift': _insert_shift,
+    'gap_keys': _insert_gap_keys,
+}
+
+
+async def _seed(repository, transcript_id, length):
+    sections = [
+        {'transcription_id': transcript_id, 'section_id': i, 'original_text': f'section {i}'}
+        for i in range(1, length + 1)
+    ]
+    await repository.acreate_sections_bulk(sections)
+
+
+async def _run(args):
+    await install_database(args.url)
+    from app.repositories.transcription.controller import TranscriptRepository
+
+    repository = TranscriptRepository()
+    transcript_id = 0
+    print(f"{'strategy':<10} {'sections':>9} {'median ms':>10} {'max ms':>10} {'rows rewritten':>15}")
+    for length in args.lengths:
+        for name, strategy in STRATEGIES.items():
+            timings = []
+            for _ in range(args.repeat):
+                transcript_id += 1
+                await _seed(repository, transcript_id, length)
+                start = time.perf_counter()
+                rewritten = await strategy(repository, transcript_id, length)
+                timings.append((time.perf_counter() - start) * 1000)
+
+                rows = (await repository.aget(transcript_id))['data']
+                assert [r['section_id'] for r in rows] == list(range(1, length + 2)), name
+                assert rows[POSITION - 1]['original_text'] == 'inserted', name
+            print(
+                f'{name:<10} {length:>9} {statistics.median(timings):>10.1f} '
+                f'{max(timings):>10.1f} {rewritten:>15}'
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lengths', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=3)
+    add_url_argument(parser)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: speaker attribution (``attach_speakers``) for long recordings.
+
+Compares the pairwise loop (``attach_speakers_naive``, every segment against
+every turn) with the sorted-interval NumPy version on synthetic diarizations
+shaped like a lesson: alternating turns of 1-8 s with occasional overlapping
+speech, and ASR segments of 2-12 s across the same timeline. Word-level
+attribution (about 2.5 words per second) is timed for the NumPy version only.
+
+The loop is quadratic, so above ``--naive-limit`` turns it is timed on a
+sample of segments and scaled up; those rows are marked ``est.``. Every run
+also checks that both versions agree on the sampled segments.
+
+Run from the backend folder:
+
+    python -m benchmarks.speaker_attribution
+    python -m benchmarks.speaker_attribution --naive-limit 10000   # time the loop for real at 10k (~1 min)
+"""
+
+import argparse
+import random
+import time
+
+from app.services.transcript_process.audio_analyzer import attach_speakers, attach_speakers_naive
+
+
+def _diarization(turns, seed=7):
+    rnd = random.Random(seed)
+    speaker_turns, t = [], 0.0
+    for i in range(turns):
+        length = rnd.uniform(1.0, 8.0)
+        # every 10th turn starts inside the previous one (people talking over each other)
+        start = t - rnd.uniform(0.2, 1.0) if i % 10 == 9 and t > 1 else t
+        speaker_turns.append({"speaker": f"speaker_{rnd.randrange(4)}", "start": start, "end": start + length})
+        t = start + length + rnd.uniform(0.0, 0.5)
+    duration = t
+
+    segments, t = [], 0.0
+    while t < duration:
+        length = rnd.uniform(2.0, 12.0)
+        segments.append({"text": "so if we multiply both by three", "start": t, "end": t + length})
+        t += length + rnd.uniform(0.0, 0.4)
+
+    words, t = [], 0.0
+    while t < duration:
+        words.append({"text": "three", "start": t, "end": t + 0.3})
+        t += 0.4
+    return speaker_turns, segments, words
+
+
+def _best_of(repeat, fn, *args):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--naive-limit", type=int, default=1_000)
+    parser.add_argument("--sample", type=int, default=500, help="segments timed for the loop above --naive-limit")
+    args = parser.parse_args()
+
+    print(f"{'turns':>8} {'segments':>9} {'loop s':>12} {'numpy s':>10} {'speedup':>9} {'words':>9} {'words s':>9}")
+    for turns in args.turns:
+        speaker_turns, segments, words = _diarization(turns)
+        fast_time, fast = _best_of(args.repeat, attach_speakers, segments, speaker_turns)
+
+        if turns <= args.naive_limit:
+            loop_time, loop = _best_of(args.repeat, attach_speakers_naive, segments, speaker_turns)
+            assert loop == fast, "implementations disagree"
+            loop_label = f"{loop_time:>12.3f}"
+        else:
+            sample = random.Random(1).sample(range(len(segments)), min(args.sample, len(segments)))
+            sampled = [segments[i] for i in sample]
+            sample_time, loop = _best_of(1, attach_speakers_naive, sampled, speaker_turns)
+            assert loop == [fast[i] for i in sample], "implementations disagree"
+            loop_time = sample_time * len(segments) / len(sampled)
+            loop_label = f"{loop_time:>7.1f} est."
+
+        words_time, _ = _best_of(args.repeat, attach_speakers, words, speaker_turns)
+        print(
+            f"{turns:>8} {len(segments):>9} {loop_label} {fast_time:>10.3f} "
+            f"{loop_time / fast_time:>8.0f}x {len(words):>9} {words_time:>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Benchmark: latency of a lightweight endpoint while large audio downloads run.
+
+A fake storage backend stands in for Azure/S3: every chunk it returns costs a
+blocking ``time.sleep``, like a socket read inside the real SDKs. Several
+clients download a large "recording" while a probe keeps calling a trivial
+endpoint at a fixed rate, and the probe's p50/p99 latency is reported for each way of
+calling storage from an ``async def`` handler:
+
+  blocking  - the old path: ``StorageFactory.read`` called directly
+  aread     - ``await StorageFactory.aread`` (bounded thread pool)
+  astream   - ``StorageFactory.astream_range`` streamed chunk by chunk
+
+Requests go through httpx's in-process ASGI transport, so the app, the
+downloads and the probe share one event loop just as they share a uvicorn
+worker.
+
+Run from the backend folder:
+
+    python -m benchmarks.storage_concurrency
+    python -m benchmarks.storage_concurrency --downloads 16 --chunks 200 --chunk-ms 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+
+from app.infrastructure.storage.factory import StorageFactory
+
+CHUNK = b'\0' * 64 * 1024
+
+
+class SlowBackend:
+    """Blocking backend: each chunk takes *chunk_ms* to 'arrive'."""
+
+    def __init__(self, chunks, chunk_ms):
+        self.chunks = chunks
+        self.delay = chunk_ms / 1000
+
+    def _iter(self, count):
+        for _ in range(count):
+            time.sleep(self.delay)
+            yield CHUNK
+
+    def read(self, path):
+        return b''.join(self._iter(self.chunks))
+
+    def stream_range(self, path, offset=0, length=None):
+        return self._iter(self.chunks)
+
+
+def _make_storage(backend, workers):
+    storage = object.__new__(StorageFactory)
+    storage.factory = backend
+    storage._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='storage')
+    storage.disk_cache = None
+    storage._cache_executor = None
+    return storage
+
+
+def _make_app(storage):
+    app = FastAPI()
+
+    @app.get('/ping')
+    async def ping():
+        return {'ok': True}
+
+    @app.get('/blocking')
+    async def blocking():
+        return Response(storage.read('audio/1.wav'), media_type='audio/wav')
+
+    @app.get('/aread')
+    async def aread():
+        return Response(await storage.aread('audio/1.wav'), media_type='audio/wav')
+
+    @app.get('/astream')
+    async def astream():
+        return StreamingResponse(await storage.astream_range('audio/1.wav'), media_type='audio/wav')
+
+    return app
+
+
+async def _probe(client, stop, latencies, interval):
+    # Fixed-rate schedule, latency measured from the *intended* send time, so
+    # a stalled event loop shows up as latency instead of as missing probes.
+    next_at = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+        await client.get('/ping')
+        latencies.append((time.perf_counter() - next_at) * 1000)
+        next_at += interval
+
+
+async def _run_strategy(name, args):
+    storage = _make_storage(SlowBackend(args.chunks, args.chunk_ms), args.workers)
+    transport = httpx.ASGITransport(app=_make_app(storage))
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        latencies, stop = [], asyncio.Event()
+        probe = asyncio.create_task(_probe(client, stop, latencies, args.probe_ms / 1000))
+        await asyncio.sleep(0)
+
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(client.get(f'/{name}') for _ in range(args.downloads)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await probe
+
+    assert all(len(r.content) == args.chunks * len(CHUNK) for r in responses), name
+    storage.shutdown()
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return {
+        'name': name,
+        'probes': len(latencies),
+        'p50': statistics.median(latencies),
+        'p99': p99,
+        'downloads_s': elapsed,
+    }
+
+
+async def _run(args):
+    print(f"{'strategy':<10} {'probes':>7} {'p50 ms':>9} {'p99 ms':>9} {'downloads s':>12}")
+    for name in ('blocking', 'aread', 'astream'):
+        stats = await _run_strategy(name, args)
+        print(
+            f"{stats['name']:<10} {stats['probes']:>7} {stats['p50']:>9.1f} "
+            f"{stats['p99']:>9.1f} {stats['downloads_s']:>12.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--downloads', type=int, default=8, help='concurrent large downloads')
+    parser.add_argument('--chunks', type=int, default=100, help='64 KiB chunks per download')
+    parser.add_argument('--chunk-ms', type=float, default=5, help='blocking time per chunk')
+    parser.add_argument('--workers', type=int, default=5, help='storage thread pool size')
+    parser.add_argument('--probe-ms', type=float, default=10, help='interval between probe requests')
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
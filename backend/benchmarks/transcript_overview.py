@@ -0,0 +1,187 @@
+"""
+Benchmark: ``GET /transcripts/{id}/overview`` latency under concurrent clients.
+
+Seeds ``--transcripts`` transcripts, each with sections, speakers, comments
+and activity, directly in Postgres. Then ``--clients`` clients each request
+``--requests`` overviews of random transcripts back to back, and the p50/p99
+latency and throughput are reported for each way of assembling the overview:
+
+  sequential - the overview's four reads awaited one after another
+  gather     - the current route handler, which runs them concurrently
+
+The sequential variant only runs the reads, so it skips the response model
+the route builds; the comparison slightly favours it.
+
+The engine pool defaults to the app's (10 connections plus 20 overflow), as
+the pool is what concurrent reads compete for under load. Postgres only:
+concurrent reads need separate connections, which the in-memory SQLite
+database does not have. Seeding is skipped when the database already holds
+the transcripts; point ``--url`` at a throwaway database.
+
+Run from the backend folder:
+
+    python -m benchmarks.transcript_overview --url postgresql+asyncpg://...
+    python -m benchmarks.transcript_overview --url postgresql+asyncpg://... --clients 1 10 50
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import sqlalchemy
+
+from benchmarks._db import add_url_argument, install_database
+
+_SEED = [
+    """
+    INSERT INTO public.users_t (id, user_name, display_name, created, created_by, modified, modified_by, active)
+    SELECT u, 'user' || u, 'User ' || u, now(), 1, now(), 1, 1 FROM generate_series(1, 50) AS u
+    """,
+    """
+    INSERT INTO public.transcripts_t (id, title, description, status, lesson_subject, lesson_number,
+                                      created, created_by, modified, modified_by, active)
+    SELECT t, 'Lesson ' || t, 'Recorded lesson ' || t, 'Active', 'Math', t % 20, now(), 1, now(), 1, 1
+    FROM generate_series(1, CAST(:transcripts AS integer)) AS t
+    """,
+    """
+    INSERT INTO public.transcript_speakers_t (transcription_id, speaker_label, display_name, is_active)
+    SELECT t, 'SPEAKER_' || s, 'Speaker ' || s, 1
+    FROM generate_series(1, CAST(:transcripts AS integer)) AS t, generate_series(1, CAST(:speakers AS integer)) AS s
+    """,
+    """
+    INSERT INTO public.transcript_details_t (transcription_id, section_id, sort_key, speaker_id, begin_ms, end_ms,
+                                             original_text, edited_text, is_active)
+    SELECT t, s, s * 1024, (t - 1) * CAST(:speakers AS integer) + 1 + s % CAST(:speakers AS integer),
+           s * 4000, s * 4000 + 3500, 'section ' || s, CASE WHEN s % 7 = 0 THEN 'edited ' || s END, 1
+    FROM generate_series(1, CAST(:transcripts AS integer)) AS t, generate_series(1, CAST(:sections AS integer)) AS s
+    """,
+    """
+    INSERT INTO public.transcript_details_comments_t (transcription_id, section_id, comment, created_by, created_at,
+                                                      is_active)
+    SELECT t, 1 + c % CAST(:sections AS integer), 'comment ' || c, 1 + c % 50, now() - c * interval '1 minute', 1
+    FROM generate_series(1, CAST(:transcripts AS integer)) AS t, generate_series(1, CAST(:comments AS integer)) AS c
+    """,
+    """
+    INSERT INTO public.transcript_activity_log_t (transcription_id, action, section_id, summary, user_id, created_at)
+    SELECT t, (ARRAY['section_edited', 'comment_added', 'tags_updated', 'speaker_renamed'])[1 + a % 4],
+           1 + a % CAST(:sections AS integer), 'activity ' || a, 1 + a % 50, now() - a * interval '1 minute'
+    FROM generate_series(1, CAST(:transcripts AS integer)) AS t, generate_series(1, CAST(:activity AS integer)) AS a
+    """,
+]
+
+_TABLES = (
+    'public.transcript_activity_log_t', 'public.transcript_details_comments_t', 'public.transcript_details_t',
+    'public.transcript_speakers_t', 'public.transcripts_t', 'public.users_t',
+)
+
+
+async def _seed(engine, args):
+    async with engine.connect() as conn:
+        have = (await conn.execute(sqlalchemy.text('SELECT count(*) FROM public.transcripts_t'))).scalar()
+    if have >= args.transcripts:
+        print(f'reusing {have} transcripts')
+        return
+
+    parameters = {
+        'transcripts': args.transcripts, 'sections': args.sections, 'speakers': args.speakers,
+        'comments': args.comments, 'activity': args.activity,
+    }
+    async with engine.begin() as conn:
+        await conn.execute(sqlalchemy.text(f'TRUNCATE {", ".join(_TABLES)}'))
+        for statement in _SEED:
+            await conn.execute(sqlalchemy.text(statement), parameters)
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level='AUTOCOMMIT')
+        # revision 17's indexes, which the overview reads are planned on
+        await conn.execute(sqlalchemy.text(
+            'CREATE INDEX IF NOT EXISTS ix_transcript_details_active_order ON public.transcript_details_t '
+            '(transcription_id, sort_key, id) WHERE is_active = 1'
+        ))
+        await conn.execute(sqlalchemy.text(
+            'CREATE INDEX IF NOT EXISTS ix_activity_log_transcription_action_created '
+            'ON public.transcript_activity_log_t (transcription_id, action, created_at DESC)'
+        ))
+        for table in _TABLES:
+            await conn.execute(sqlalchemy.text(f'VACUUM ANALYZE {table}'))
+    print(f'seeded {args.transcripts} transcripts')
+
+
+async def _sequential(transcript_id):
+    from app.api_routers.transcript_overview.route import activity_repo, overview_repo
+
+    await overview_repo.aget_summary(transcript_id)
+    await overview_repo.aget_speakers(transcript_id)
+    await activity_repo.alist(transcript_id, limit=15, actions=['section_edited', 'comment_added', 'tags_updated'])
+    await overview_repo.aget_recent_comments(transcript_id, limit=5)
+
+
+async def _gather(transcript_id):
+    from app.api_routers.transcript_overview.route import get_transcript_overview
+
+    await get_transcript_overview(transcript_id)
+
+
+STRATEGIES = {
+    'sequential': _sequential,
+    'gather': _gather,
+}
+
+
+async def _client(overview, args, rnd, latencies):
+    for _ in range(args.requests):
+        started = time.perf_counter()
+        await overview(rnd.randint(1, args.transcripts))
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def _run_strategy(overview, clients, args):
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _client(overview, args, random.Random(seed), latencies) for seed in range(clients)
+    ))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'p50': statistics.median(latencies),
+        'p99': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        'rps': len(latencies) / elapsed,
+    }
+
+
+async def _run(args):
+    if args.url.startswith('sqlite'):
+        raise SystemExit('concurrent reads need Postgres: pass --url postgresql+asyncpg://...')
+    database = await install_database(args.url, pool_size=args.pool_size, max_overflow=args.max_overflow)
+    await _seed(database.database_provider.aengine, args)
+
+    # warm the pool and the caches
+    for overview in STRATEGIES.values():
+        await _run_strategy(overview, 10, args)
+
+    print(f"{'strategy':<11} {'clients':>7} {'p50 ms':>9} {'p99 ms':>9} {'req/s':>8}")
+    for clients in args.clients:
+        for name, overview in STRATEGIES.items():
+            stats = await _run_strategy(overview, clients, args)
+            print(f"{name:<11} {clients:>7} {stats['p50']:>9.1f} {stats['p99']:>9.1f} {stats['rps']:>8.0f}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 50], help='concurrent clients')
+    parser.add_argument('--requests', type=int, default=40, help='overviews requested per client')
+    parser.add_argument('--transcripts', type=int, default=500)
+    parser.add_argument('--sections', type=int, default=600, help='sections per transcript')
+    parser.add_argument('--speakers', type=int, default=4, help='speakers per transcript')
+    parser.add_argument('--comments', type=int, default=60, help='comments per transcript')
+    parser.add_argument('--activity', type=int, default=400, help='activity entries per transcript')
+    parser.add_argument('--pool-size', type=int, default=10)
+    parser.add_argument('--max-overflow', type=int, default=20)
+    add_url_argument(parser)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+"""
+Benchmark: transcript full-text search (``GET /transcripts/search``) at scale.
+
+Seeds a synthetic corpus of ``--sections`` sections (10M by default, in
+transcripts of ``--per-transcript``) directly in Postgres. Section text is
+6-24 words drawn from a Zipf-like vocabulary: a few classroom words are in a
+large share of all sections, most made-up words are rare, and the word
+``needle`` is planted in one section per million. The GIN index from
+revision 18 is then built, with the section-order index from revision 17
+that hits are positioned on, and ``TranscriptRepository.asearch_sections``
+is timed for terms of every frequency: the median first-page time, and the
+time of page ``--pages`` reached by following cursors. The run fails if a
+plan does not read ``ix_transcript_details_search_vector``. ``--ilike`` adds
+the ``ILIKE '%term%'`` scan this endpoint replaces, for comparison; it stops
+at the first 20 substring matches, unranked, so it is fast for common
+substrings and slow for rare ones.
+
+Seeding is skipped when the database already holds the corpus, so re-runs
+only measure. Postgres only (tsvector); point ``--url`` at a throwaway
+database. Seeding is the slow part: about an hour for 10M sections on a
+laptop.
+
+Run from the backend folder:
+
+    python -m benchmarks.transcript_search --url postgresql+asyncpg://...
+    python -m benchmarks.transcript_search --url postgresql+asyncpg://... --sections 1000000 --ilike
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import statistics
+import time
+
+import sqlalchemy
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.mappers.transcript_search import decode_cursor, encode_cursor
+from benchmarks._db import add_url_argument, install_database
+
+INDEX_NAME = 'ix_transcript_details_search_vector'
+
+# the most frequent words, in rank order; made-up words fill the long tail
+COMMON_WORDS = (
+    'the a and is so what we of to it that you half quarter three two one four equals plus minus times '
+    'fraction number answer why how because then now look here write board share divide multiply equal '
+    'bigger smaller more less same different right wrong think explain again next first last whole part'
+).split()
+
+_SEED_SECTIONS = """
+    INSERT INTO public.transcript_details_t
+        (transcription_id, section_id, sort_key, begin_ms, end_ms, original_text, edited_text, is_active)
+    SELECT t, s, s * 1024, s * 4000, s * 4000 + 3500, text, text, 1
+    FROM (
+        SELECT 1 + (g - 1) / CAST(:per AS integer) AS t,
+               1 + (g - 1) % CAST(:per AS integer) AS s,
+               (SELECT string_agg((:vocabulary)[1 + floor(power(random(), 3) * CAST(:words AS integer))::int], ' ')
+                FROM generate_series(1, 6 + g % 19))
+               || CASE WHEN g % 1000000 = 7 THEN ' needle' ELSE '' END AS text
+        FROM generate_series(CAST(:low AS integer), CAST(:high AS integer)) AS g
+    ) sections
+"""
+
+
+def _vocabulary(size):
+    rnd = random.Random(11)
+    syllables = [c + v for c in 'bdfgklmnprstvz' for v in 'aeiou']
+    made_up = [''.join(parts) for parts in itertools.product(syllables, repeat=3)]
+    rnd.shuffle(made_up)
+    return COMMON_WORDS + made_up[:size - len(COMMON_WORDS)]
+
+
+def _terms(vocabulary):
+    """(label, query text) from most to least frequent."""
+    return [
+        ('most common word', vocabulary[1]),
+        ('common word', vocabulary[20]),
+        ('rank-500 word', vocabulary[500]),
+        ('rank-10k word', vocabulary[10_000]),
+        ('rarest word', vocabulary[-1]),
+        ('one in a million', 'needle'),
+        ('phrase', f'"{vocabulary[3]} {vocabulary[4]}"'),
+        ('two rare words', f'{vocabulary[-2]} or {vocabulary[-3]}'),
+    ]
+
+
+async def _seed(engine, args, vocabulary):
+    async with engine.connect() as conn:
+        have = (await conn.execute(sqlalchemy.text(
+            'SELECT count(*) FROM public.transcript_details_t WHERE is_active = 1'
+        ))).scalar()
+    if have >= args.sections:
+        print(f'reusing {have} sections')
+        return
+
+    transcripts = -(-args.sections // args.per_transcript)
+    statement = sqlalchemy.text(_SEED_SECTIONS).bindparams(sqlalchemy.bindparam('vocabulary', type_=ARRAY(sqlalchemy.Text)))
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        await conn.execute(sqlalchemy.text('TRUNCATE public.transcript_details_t, public.transcripts_t'))
+        await conn.execute(sqlalchemy.text(f'DROP INDEX IF EXISTS public.{INDEX_NAME}'))
+        await conn.execute(sqlalchemy.text("""
+            INSERT INTO public.transcripts_t (id, title, status, created, created_by, modified, modified_by, active)
+            SELECT t, 'Lesson ' || t, 'Active', now(), 1, now(), 1, 1 FROM generate_series(1, CAST(:transcripts AS integer)) AS t
+        """), {'transcripts': transcripts})
+        await conn.execute(sqlalchemy.text('SELECT setseed(0.42)'))
+    for low in range(1, args.sections + 1, args.batch):
+        high = min(low + args.batch - 1, args.sections)
+        async with engine.begin() as conn:
+            await conn.execute(statement, {
+                'per': args.per_transcript, 'vocabulary': vocabulary, 'words': len(vocabulary),
+                'low': low, 'high': high,
+            })
+        print(f'  seeded {high} sections ({time.perf_counter() - started:.0f} s)', flush=True)
+
+
+async def _index(engine):
+    started = time.perf_counter()
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level='AUTOCOMMIT')
+        await conn.execute(sqlalchemy.text(
+            f'CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON public.transcript_details_t '
+            'USING gin (search_vector) WHERE is_active = 1'
+        ))
+        # revision 17's index: hits' positions in their transcript are counted on it
+        await conn.execute(sqlalchemy.text(
+            'CREATE INDEX IF NOT EXISTS ix_transcript_details_active_order ON public.transcript_details_t '
+            '(transcription_id, sort_key, id) WHERE is_active = 1'
+        ))
+        await conn.execute(sqlalchemy.text('VACUUM ANALYZE public.transcript_details_t'))
+        await conn.execute(sqlalchemy.text('VACUUM ANALYZE public.transcripts_t'))
+        size = (await conn.execute(sqlalchemy.text(f"SELECT pg_size_pretty(pg_relation_size('public.{INDEX_NAME}'))"))).scalar()
+    print(f'index ready: {size} ({time.perf_counter() - started:.0f} s)')
+
+
+async def _count(engine, text):
+    async with engine.connect() as conn:
+        return (await conn.execute(sqlalchemy.text(
+            "SELECT count(*) FROM public.transcript_details_t "
+            "WHERE is_active = 1 AND search_vector @@ websearch_to_tsquery('simple', :text)"
+        ), {'text': text})).scalar()
+
+
+async def _ilike_ms(engine, word):
+    started = time.perf_counter()
+    async with engine.connect() as conn:
+        await conn.execute(sqlalchemy.text(
+            "SELECT id FROM public.transcript_details_t "
+            "WHERE is_active = 1 AND coalesce(edited_text, original_text) ILIKE :pattern ORDER BY id DESC LIMIT 20"
+        ), {'pattern': f'%{word}%'})
+    return (time.perf_counter() - started) * 1000
+
+
+async def _uses_index(engine, search):
+    """Whether the plan of *search*'s statement reads the GIN index."""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', capture)
+    try:
+        await search()
+    finally:
+        event.remove(engine.sync_engine, 'before_cursor_execute', capture)
+    statement, parameters = captured[-1]
+    async with engine.connect() as conn:
+        plan = (await conn.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {statement}', parameters)).scalar()
+    plan = plan if isinstance(plan, str) else json.dumps(plan)
+    return f'"Index Name": "{INDEX_NAME}"' in plan
+
+
+async def _timed(call):
+    started = time.perf_counter()
+    result = await call()
+    return (time.perf_counter() - started) * 1000, result
+
+
+async def _run(args):
+    if args.url.startswith('sqlite'):
+        raise SystemExit('full-text search needs Postgres: pass --url postgresql+asyncpg://...')
+    database = await install_database(args.url)
+    engine = database.database_provider.aengine
+    vocabulary = _vocabulary(args.vocabulary)
+    await _seed(engine, args, vocabulary)
+    await _index(engine)
+
+    from app.repositories.transcription.controller import TranscriptRepository
+
+    repository = TranscriptRepository()
+    header = f"{'term':<18} {'query':<24} {'matches':>9} {'page 1 ms':>10} {f'page {args.pages} ms':>11}"
+    print(header + (f" {'ILIKE ms':>9}" if args.ilike else ''))
+    failures = []
+    for label, text in _terms(vocabulary):
+        def search(after=None, text=text):
+            return repository.asearch_sections(text, limit=args.limit, after=after)
+
+        if not await _uses_index(engine, search):
+            failures.append(label)
+        first_page = statistics.median([(await _timed(search))[0] for _ in range(args.repeat)])
+
+        hits, page_ms = await search(), None
+        for _ in range(args.pages - 1):
+            if len(hits) < args.limit:
+                break
+            after = decode_cursor(encode_cursor(hits[-1]['rank'], hits[-1]['id']))
+            page_ms, hits = await _timed(lambda: search(after))
+        deep = f'{page_ms:>11.1f}' if page_ms is not None else f"{'-':>11}"
+
+        line = f'{label:<18} {text:<24} {await _count(engine, text):>9} {first_page:>10.1f} {deep}'
+        if args.ilike:
+            line += f' {await _ilike_ms(engine, text.strip(chr(34)).split()[0]):>9.0f}'
+        print(line, flush=True)
+
+    if failures:
+        raise SystemExit(f'{INDEX_NAME} not used for: {", ".join(failures)}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sections', type=int, default=10_000_000)
+    parser.add_argument('--per-transcript', type=int, default=1_000)
+    parser.add_argument('--vocabulary', type=int, default=20_000)
+    parser.add_argument('--batch', type=int, default=500_000, help='sections inserted per statement while seeding')
+    parser.add_argument('--limit', type=int, default=20, help='hits per page')
+    parser.add_argument('--pages', type=int, default=5, help='page reached by following cursors')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--ilike', action='store_true', help='also time the ILIKE scan for each term')
+    add_url_argument(parser)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""Contract tests for windowed transcription: VAD, window planning, WAV slicing and stitching."""
+
+import wave
+from array import array
+
+import pytest
+
+from app.services.transcript_process.asr_engines import StubEngine
+from app.services.transcript_process.chunking import (
+    SAMPLE_RATE,
+    find_silences,
+    frame_peak,
+    frame_rms,
+    is_model_ready_wav,
+    plan_windows,
+    prepare,
+    segments_from_words,
+    split_wav,
+    stitch,
+)
+
+
+def write_speech(path, words, gap=0.1, sample_rate=SAMPLE_RATE):
+    """A mono WAV where each ``(amplitude, seconds)`` is a flat "word" followed by *gap* of silence."""
+    samples = array("h")
+    for amplitude, seconds in words:
+        samples.extend([amplitude] * int(seconds * sample_rate))
+        samples.extend([0] * int(gap * sample_rate))
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+    return str(path)
+
+
+def word(text, start, end):
+    return {"text": text, "start": start, "end": end}
+
+
+def test_windows_overlap_and_partition_the_timeline():
+    windows = plan_windows(100.0, window=30.0, overlap=4.0)
+    assert windows[0]["start"] == 0.0 and windows[-1]["end"] == 100.0
+    for previous, current in zip(windows, windows[1:]):
+        assert previous["end"] - current["start"] == pytest.approx(4.0)
+        assert previous["keep_to"] == current["keep_from"] == pytest.approx((previous["end"] + current["start"]) / 2)
+    assert all(w["end"] - w["start"] <= 30.0 for w in windows)
+    assert plan_windows(20.0, window=30.0, overlap=4.0) == [
+        {"start": 0.0, "end": 20.0, "keep_from": 0.0, "keep_to": 20.0}
+    ]
+
+
+def test_window_boundaries_snap_to_the_closest_silence_before_the_nominal_cut():
+    windows = plan_windows(100.0, window=30.0, overlap=4.0, silences=[(20.0, 21.0), (24.0, 25.0), (40.0, 41.0)])
+    assert windows[0]["keep_to"] == 24.5  # nominal cut at 28, search reaches back to 20.5
+    assert windows[1]["start"] == 22.5
+    with pytest.raises(ValueError):
+        plan_windows(100.0, window=4.0, overlap=4.0)
+
+
+def test_energy_vad_finds_the_pauses(tmp_path):
+    path = write_speech(tmp_path / "a.wav", [(3000, 1.0), (0, 0.5), (2500, 1.0)], gap=0.0)
+    ((start, end),) = find_silences(path)
+    assert start == pytest.approx(1.0, abs=0.03) and end == pytest.approx(1.5, abs=0.03)
+
+
+def test_split_wav_cuts_each_window(tmp_path):
+    path = write_speech(tmp_path / "a.wav", [(1000, 3.0)], gap=0.0)
+    windows = [{"start": 0.0, "end": 2.0}, {"start": 1.5, "end": 3.0}]
+    lengths = []
+    for window_path in split_wav(path, windows, str(tmp_path)):
+        with wave.open(window_path, "rb") as wav:
+            lengths.append(wav.getnframes() / wav.getframerate())
+    assert lengths == [2.0, 1.5]
+    assert is_model_ready_wav(path) and not is_model_ready_wav(str(tmp_path / "missing.wav"))
+
+
+def test_stitching_keeps_each_overlap_word_once():
+    windows = [
+        {"start": 0.0, "end": 10.0, "keep_from": 0.0, "keep_to": 8.0},
+        {"start": 6.0, "end": 15.0, "keep_from": 8.0, "keep_to": 15.0},
+    ]
+    transcripts = [
+        {"words": [word("hello", 6.2, 6.8), word("there.", 7.0, 7.6), word("how", 8.9, 9.3), word("ar", 9.8, 10.0)]},
+        {"words": [word("lo", 0.5, 0.8), word("there.", 1.0, 1.6), word("how", 2.9, 3.3), word("are", 3.8, 4.3)]},
+    ]
+    stitched = stitch(windows, transcripts)
+    assert [(w["text"], w["start"]) for w in stitched["words"]] == [
+        ("hello", 6.2), ("there.", 7.0), ("how", 8.9), ("are", 9.8),
+    ]
+    assert [s["text"] for s in stitched["segments"]] == ["hello there.", "how are"]
+    assert stitched["text"] == "hello there. how are"
+
+
+def test_segments_break_at_pauses_and_length():
+    words = [word("a", 0, 1), word("b", 1.2, 2), word("c", 4, 5), word("d", 5, 40)]
+    assert [s["text"] for s in segments_from_words(words, max_gap=1.0, max_seconds=30)] == ["a b", "c", "d"]
+
+
+def test_windowed_transcript_matches_the_recording(tmp_path):
+    # 40 distinct "words" of 0.35 s over ~18 s, cut into 5 s windows
+    spoken = [(100 * (i + 1), 0.35) for i in range(40)]
+    path = write_speech(tmp_path / "lesson.wav", spoken)
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    _, windows = prepare(path, str(work_dir), window=5.0, overlap=1.0)
+    assert len(windows) >= 4
+
+    engine = StubEngine()
+    stitched = stitch(windows, engine.transcribe([w["path"] for w in windows]))
+    assert [w["text"] for w in stitched["words"]] == [f"w{i + 1}" for i in range(40)]
+
+
+def test_frame_energy_and_peak():
+    data = array("h", [3, -4] * 4 + [0, -32768]).tobytes()
+    assert frame_rms(data, 8) == [3, 23170]  # sqrt(12.5), sqrt(32768**2 / 2); a short last frame
+    assert frame_peak(data) == 32768
+    assert frame_rms(b"", 8) == []
+    assert frame_peak(b"") == 0
@@ -0,0 +1,61 @@
+"""Contract tests for Range header handling on GET /transcripts/{id}/audio."""
+
+import pytest
+
+from app.services.transcript_process.byte_range import (
+    RangeNotSatisfiableError,
+    content_range,
+    etag_matches,
+    parse_range_header,
+)
+
+SIZE = 1000
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-99", (0, 99)),
+        ("bytes=500-", (500, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=900-5000", (900, 999)),  # end is clamped to the file
+        ("bytes=-5000", (0, 999)),
+        ("Bytes = 10-19", (10, 19)),
+    ],
+)
+def test_single_ranges(header, expected):
+    assert parse_range_header(header, SIZE) == expected
+
+
+@pytest.mark.parametrize(
+    "header",
+    [None, "", "items=0-1", "bytes=0-1,5-9", "bytes=abc-", "bytes=5-1", "bytes=-", "bytes=--5", "bytes=5"],
+)
+def test_ignored_headers_serve_the_whole_file(header):
+    assert parse_range_header(header, SIZE) is None
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=2000-3000", "bytes=-0"])
+def test_unsatisfiable_ranges(header):
+    with pytest.raises(RangeNotSatisfiableError):
+        parse_range_header(header, SIZE)
+
+
+def test_content_range():
+    assert content_range(0, 99, SIZE) == "bytes 0-99/1000"
+
+
+@pytest.mark.parametrize(
+    "header, matches",
+    [
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"x", W/"abc"', True),
+        ("*", True),
+        ('"abcd"', False),
+        (None, False),
+    ],
+)
+def test_if_none_match(header, matches):
+    assert etag_matches(header, '"abc"') is matches
+    assert etag_matches(header, 'W/"abc"') is matches
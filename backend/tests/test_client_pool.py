@@ -0,0 +1,98 @@
+"""Contract tests for the storage client pool shared by both backends."""
+
+import threading
+
+import pytest
+
+from app.infrastructure.storage.client_pool import ClientPool, PoolExhaustedError
+
+
+class _Factory:
+    def __init__(self):
+        self.created = 0
+
+    def __call__(self):
+        self.created += 1
+        return f"client-{self.created}"
+
+
+def test_clients_are_created_lazily_and_reused():
+    factory = _Factory()
+    pool = ClientPool(factory, max_size=3)
+    assert factory.created == 0
+
+    with pool.client() as first:
+        pass
+    with pool.client() as second:
+        assert second == first
+    assert factory.created == 1
+    assert pool.metrics()["size"] == 1
+
+
+def test_acquire_times_out_when_exhausted():
+    pool = ClientPool(_Factory(), max_size=1)
+    held = pool.acquire()
+    with pytest.raises(PoolExhaustedError):
+        pool.acquire(timeout=0.01)
+    assert pool.metrics()["exhausted"] == 1
+    pool.release(held)
+    assert pool.acquire(timeout=0.01) == held
+
+
+def test_waiter_gets_the_released_client():
+    pool = ClientPool(_Factory(), max_size=1)
+    held = pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire(timeout=5)))
+    waiter.start()
+    pool.release(held)
+    waiter.join(5)
+    assert got == [held]
+    assert pool.metrics()["waited"] == 1
+
+
+def test_broken_clients_are_recycled():
+    factory = _Factory()
+    pool = ClientPool(factory, max_size=2, recycle_on=(ConnectionError,))
+    with pytest.raises(ConnectionError):
+        with pool.client():
+            raise ConnectionError("reset")
+    with pytest.raises(ValueError):
+        with pool.client():
+            raise ValueError("not a transport error")  # client is kept
+
+    metrics = pool.metrics()
+    assert (metrics["recycled"], metrics["size"], metrics["idle"]) == (1, 1, 1)
+    assert factory.created == 2
+
+
+def test_health_check_rejects_stale_idle_clients():
+    factory = _Factory()
+    pool = ClientPool(factory, max_size=2, health_check=lambda client: client != "client-1")
+    pool.release(pool.acquire())  # client-1 goes idle
+    assert pool.acquire() == "client-2"
+    assert pool.metrics()["recycled"] == 1
+
+
+def test_stream_holds_the_client_until_the_chunks_are_done():
+    pool = ClientPool(_Factory(), max_size=1)
+    chunks = pool.stream(lambda client: iter([client, "more"]))
+    assert pool.metrics()["in_use"] == 1
+    assert list(chunks) == ["client-1", "more"]
+    assert pool.metrics()["in_use"] == 0
+
+    chunks = pool.stream(lambda client: iter(["a", "b"]))
+    next(chunks)
+    chunks.close()  # abandoned part-way
+    assert pool.metrics()["in_use"] == 0
+
+
+def test_stream_raises_when_the_download_cannot_start():
+    pool = ClientPool(_Factory(), max_size=1)
+
+    def missing(client):
+        raise FileNotFoundError("no such blob")
+
+    with pytest.raises(FileNotFoundError):
+        pool.stream(missing)
+    assert pool.metrics()["in_use"] == 0
@@ -0,0 +1,68 @@
+"""Contract tests for the read-through blob disk cache."""
+
+import os
+
+from app.infrastructure.storage.disk_cache import DiskCache
+
+
+def _chunks(data, size=3):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_miss_then_hit_and_range_reads(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1024)
+    assert not cache.contains("audio/1.wav", "e1")
+    assert cache.put("audio/1.wav", "e1", _chunks(b"0123456789"))
+    assert cache.contains("audio/1.wav", "e1")
+
+    assert cache.get("audio/1.wav", "e1") == b"0123456789"
+    assert b"".join(cache.get_range("audio/1.wav", "e1", 2, 5)) == b"23456"
+    assert b"".join(cache.get_range("audio/1.wav", "e1", 8)) == b"89"
+    assert cache.get_range("audio/2.wav", "e1") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["bytes"]) == (4, 2, 1, 10)
+
+
+def test_open_range_survives_eviction(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=10)
+    cache.put("a", "1", [b"aaaaaaaa"])
+    chunks = cache.get_range("a", "1")
+    cache.put("b", "1", [b"bbbbbbbb"])  # evicts a before the range is read
+    assert not cache.contains("a", "1")
+    assert b"".join(chunks) == b"aaaaaaaa"
+
+
+def test_new_etag_replaces_the_old_version(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1024)
+    cache.put("audio/1.wav", "e1", [b"old"])
+    cache.put("audio/1.wav", "e2", [b"new!"])
+    assert not cache.contains("audio/1.wav", "e1")
+    assert cache.get("audio/1.wav", "e2") == b"new!"
+    assert cache.stats()["bytes"] == 4
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_least_recently_used_blob_is_evicted(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=10)
+    cache.put("a", "1", [b"aaaa"])
+    cache.put("b", "1", [b"bbbb"])
+    cache.contains("a", "1")  # touch a, so b is now the oldest
+    cache.put("c", "1", [b"cccc"])
+
+    assert cache.stats()["evictions"] == 1
+    assert not cache.contains("b", "1")
+    assert cache.contains("a", "1") and cache.contains("c", "1")
+
+
+def test_blob_larger_than_the_cache_is_not_stored(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=4)
+    assert not cache.put("big", "1", [b"12345"])
+    assert os.listdir(tmp_path) == []
+
+
+def test_index_is_rebuilt_from_disk(tmp_path):
+    DiskCache(str(tmp_path), max_bytes=1024).put("audio/1.wav", "e1", [b"abc"])
+    reopened = DiskCache(str(tmp_path), max_bytes=1024)
+    assert reopened.contains("audio/1.wav", "e1")
+    assert reopened.stats()["bytes"] == 3
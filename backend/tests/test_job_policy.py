@@ -0,0 +1,79 @@
+"""Contract tests for the retry and heartbeat policy of background ingestion jobs."""
+
+import asyncio
+
+import pytest
+
+from app.services.jobs.policy import MAX_RETRY_SECONDS, error_payload, heartbeat_while, retry_delay, should_retry
+
+
+class BadFileError(Exception):
+    def to_dict(self):
+        return {"message": "Not a transcript.", "code": "bad_transcript_file", "file": "transcript"}
+
+
+@pytest.mark.parametrize("attempt, expected", [(0, 0), (1, 10), (2, 20), (3, 40), (4, 80)])
+def test_backoff_doubles_per_attempt(attempt, expected):
+    assert retry_delay(attempt, base_seconds=10) == expected
+
+
+def test_backoff_is_capped():
+    assert retry_delay(30, base_seconds=10) == MAX_RETRY_SECONDS
+    assert retry_delay(5, base_seconds=10, cap_seconds=60) == 60
+
+
+def test_retries_until_attempts_are_used_up():
+    error = ConnectionError("storage unavailable")
+    assert should_retry(1, 3, error)
+    assert should_retry(2, 3, error)
+    assert not should_retry(3, 3, error)
+
+
+def test_permanent_errors_are_not_retried():
+    assert not should_retry(1, 3, BadFileError(), permanent_errors=(BadFileError,))
+    assert should_retry(1, 3, ConnectionError(), permanent_errors=(BadFileError,))
+
+
+def test_error_payload_keeps_user_facing_details():
+    assert error_payload(BadFileError()) == {
+        "message": "Not a transcript.",
+        "code": "bad_transcript_file",
+        "file": "transcript",
+    }
+
+
+def test_error_payload_for_unexpected_errors():
+    assert error_payload(RuntimeError("disk full")) == {"message": "disk full", "code": "job_failed", "file": None}
+    assert error_payload(TimeoutError())["message"] == "TimeoutError"
+
+
+def test_heartbeat_runs_until_the_work_finishes():
+    beats = []
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def beat():
+        beats.append(1)
+
+    assert asyncio.run(heartbeat_while(work(), beat, interval=0.01)) == "done"
+    assert len(beats) >= 2
+
+
+def test_failed_heartbeat_cancels_the_work():
+    cancelled = []
+
+    async def work():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def beat():
+        raise LookupError("job lost")
+
+    with pytest.raises(LookupError):
+        asyncio.run(heartbeat_while(work(), beat, interval=0.01))
+    assert cancelled
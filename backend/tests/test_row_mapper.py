@@ -0,0 +1,48 @@
+"""Contract tests for the DB row -> dict mapping used by SQLFactory.read/aread.
+
+RowMapper replaced the pandas DataFrame round trip, so these guard the two
+behaviours callers rely on: NULLs come back as None, and every other value is
+passed through untouched (ints stay ints even next to a NULL, no pandas types).
+"""
+
+import math
+from datetime import datetime
+
+from app.infrastructure.databases.row_mapper import RowMapper, normalize_null
+
+KEYS = ["id", "speaker_id", "begin_timestamp", "modified_at"]
+
+
+def test_maps_rows_onto_column_keys():
+    rows = [(1, 7, "00:00:01.000", None), (2, None, "00:00:02.500", None)]
+    records = RowMapper().map_rows(KEYS, rows)
+    assert records == [
+        {"id": 1, "speaker_id": 7, "begin_timestamp": "00:00:01.000", "modified_at": None},
+        {"id": 2, "speaker_id": None, "begin_timestamp": "00:00:02.500", "modified_at": None},
+    ]
+
+
+def test_values_are_passed_through_without_coercion():
+    when = datetime(2026, 4, 1, 12, 30)
+    records = RowMapper().map_rows(KEYS, [(1, None, "x", when), (2, 3, "y", None)])
+    # The pandas path turned [None, 3] into floats and datetimes into Timestamps.
+    assert type(records[1]["speaker_id"]) is int
+    assert type(records[0]["modified_at"]) is datetime
+
+
+def test_default_normalizer_turns_nan_into_none():
+    records = RowMapper().map_rows(["score"], [(float("nan"),), (1.5,)])
+    assert records == [{"score": None}, {"score": 1.5}]
+    assert normalize_null("NaN") == "NaN"  # only real float NaN is a null
+
+
+def test_normalizer_is_pluggable():
+    raw = RowMapper(null_normalizer=None).map_rows(["v"], [(float("nan"),)])
+    assert math.isnan(raw[0]["v"])  # normalisation switched off
+
+    blank_to_none = RowMapper(null_normalizer=lambda v: None if v == "" else v)
+    assert blank_to_none.map_rows(["v"], [("",), ("a",)]) == [{"v": None}, {"v": "a"}]
+
+
+def test_empty_result_maps_to_empty_list():
+    assert RowMapper().map_rows(KEYS, []) == []
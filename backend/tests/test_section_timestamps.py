@@ -0,0 +1,32 @@
+"""Contract tests for section timestamp conversion (display strings <-> milliseconds)."""
+
+import pytest
+
+from app.mappers.timestamps import ms_to_duration, timestamp_to_ms
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("00:01:23.456", 83_456),
+        (" 01:00:00.000 ", 3_600_000),
+        ("1:23", 83_000),
+        ("83.5", 83_500),
+        ("00:00:00.0004", 0),
+        ("", None),
+        (None, None),
+        ("soon", None),
+        ("1:02:03:04", None),
+        ("-1", None),
+        ("nan", None),
+    ],
+)
+def test_timestamp_to_ms(value, expected):
+    assert timestamp_to_ms(value) == expected
+
+
+def test_ms_to_duration():
+    assert ms_to_duration(59_999) == "0:59"
+    assert ms_to_duration(754_000) == "12:34"
+    assert ms_to_duration(3_723_000) == "1:02:03"
+    assert ms_to_duration(-5) == "0:00"
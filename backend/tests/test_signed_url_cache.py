@@ -0,0 +1,37 @@
+"""Contract tests for the signed-URL cache behind the audio redirect mode."""
+
+from app.infrastructure.storage.signed_url_cache import SignedUrlCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_url_is_reused_until_the_refresh_margin():
+    clock = _Clock()
+    cache = SignedUrlCache(refresh_margin=60, clock=clock)
+    cache.put("audio/1.wav", "https://signed/1", ttl_seconds=900)
+
+    clock.now = 839
+    assert cache.get("audio/1.wav") == "https://signed/1"
+    clock.now = 840  # only 60 s of validity left: sign a fresh one
+    assert cache.get("audio/1.wav") is None
+
+
+def test_missing_key():
+    assert SignedUrlCache().get("nope") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SignedUrlCache(max_entries=2, clock=_Clock())
+    cache.put("a", "url-a", 900)
+    cache.put("b", "url-b", 900)
+    cache.get("a")
+    cache.put("c", "url-c", 900)
+    assert cache.get("b") is None
+    assert cache.get("a") == "url-a"
+    assert cache.get("c") == "url-c"
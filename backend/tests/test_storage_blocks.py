@@ -0,0 +1,44 @@
+"""Contract tests for the block reader behind the streaming audio uploads.
+
+S3 multipart needs every part but the last to be full-sized, and Azure needs
+block ids of equal length, so both are pinned down here.
+"""
+
+import base64
+import io
+
+import pytest
+
+from app.infrastructure.storage.blocks import block_id, iter_blocks
+
+
+class _TrickleFile(io.BytesIO):
+    """File that returns at most 3 bytes per read, like a slow socket."""
+
+    def read(self, size=-1):
+        return super().read(min(size, 3) if size and size > 0 else 3)
+
+
+def test_splits_into_full_blocks_and_a_short_tail():
+    blocks = list(iter_blocks(io.BytesIO(b"abcdefghij"), block_size=4))
+    assert blocks == [b"abcd", b"efgh", b"ij"]
+
+
+def test_short_reads_are_topped_up_to_block_size():
+    blocks = list(iter_blocks(_TrickleFile(b"abcdefghij"), block_size=4))
+    assert blocks == [b"abcd", b"efgh", b"ij"]
+
+
+def test_empty_file_yields_nothing():
+    assert list(iter_blocks(io.BytesIO(b""), block_size=4)) == []
+
+
+def test_rejects_non_positive_block_size():
+    with pytest.raises(ValueError):
+        list(iter_blocks(io.BytesIO(b"abc"), block_size=0))
+
+
+def test_block_ids_are_base64_and_equal_length():
+    ids = [block_id(i) for i in (0, 9, 12345)]
+    assert len({len(i) for i in ids}) == 1
+    assert base64.b64decode(ids[1]) == b"00000009"
@@ -0,0 +1,71 @@
+"""Contract tests for the transcript text parser, whole-text and streamed."""
+
+import asyncio
+
+import pytest
+
+from app.services.transcript_process.transcript_parser import (
+    aiter_transcript_segments,
+    parse_transcript_file,
+)
+
+TRANSCRIPT = (
+    "Teacher 00:00:01\n"
+    "So what is a half\n"
+    "plus a quarter?\n"
+    "\n"
+    "Student 1 00:00:07.5\n"
+    "\n"
+    "Teacher 00:00:09\n"
+    "Three quarters — très bien.\n"
+)
+
+
+def stream(data: bytes, size: int):
+    async def chunks():
+        for i in range(0, len(data), size):
+            yield data[i:i + size]
+
+    async def collect():
+        return [segment async for segment in aiter_transcript_segments(chunks())]
+
+    return asyncio.run(collect())
+
+
+def test_blocks_become_segments_ending_where_the_next_begins():
+    assert parse_transcript_file(TRANSCRIPT)["combined_diarized_segments"] == [
+        {"speaker": "Teacher", "start": 1.0, "end": 9.0, "text": "So what is a half plus a quarter?"},
+        # the empty "Student 1" block is dropped and does not count as the next segment
+        {"speaker": "Teacher", "start": 9.0, "end": 9.0, "text": "Three quarters — très bien."},
+    ]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 4096])
+@pytest.mark.parametrize("newline", ["\n", "\r\n", "\r"])
+def test_streamed_parse_matches_the_whole_text_parse(size, newline):
+    text = TRANSCRIPT.replace("\n", newline)
+    # a BOM is dropped, and multi-byte characters may be split across chunks
+    data = "﻿".encode() + text.encode()
+    assert stream(data, size) == parse_transcript_file(text)["combined_diarized_segments"]
+
+
+def test_streamed_parse_yields_each_segment_once_the_next_one_has_text():
+    seen = []
+
+    async def chunks():
+        for line in (TRANSCRIPT + "Student 2 00:00:12\nSeven eighths?\n").splitlines(keepends=True):
+            seen.append(line)
+            yield line.encode()
+
+    async def first_segment():
+        async for segment in aiter_transcript_segments(chunks()):
+            return segment, len(seen)
+
+    segment, lines_read = asyncio.run(first_segment())
+    assert segment["end"] == 9.0
+    assert lines_read == 8  # up to the first text line of the next block with text, not all 10
+
+
+def test_streamed_parse_rejects_invalid_utf8():
+    with pytest.raises(UnicodeDecodeError):
+        stream(b"Teacher 00:00:01\nhello \xc3", 4)
@@ -0,0 +1,33 @@
+"""Contract tests for transcript search cursors and snippets."""
+
+import pytest
+
+from app.mappers.transcript_search import (
+    MATCH_START,
+    MATCH_STOP,
+    decode_cursor,
+    encode_cursor,
+    highlight,
+)
+
+
+@pytest.mark.parametrize("rank", [0.0, 0.1, 0.30000001192092896, 1e-20, 12.5])
+def test_cursor_round_trips_the_exact_rank(rank):
+    assert decode_cursor(encode_cursor(rank, 123456)) == (rank, 123456)
+
+
+def test_cursor_is_url_safe():
+    token = encode_cursor(0.7071067690849304, 2**31 - 1)
+    assert token.replace("-", "").replace("_", "").isalnum()
+
+
+@pytest.mark.parametrize("token", ["", "zz", "bm90IGEgY3Vyc29y", encode_cursor(0.5, 1) + "!!", "w6k"])
+def test_malformed_cursors_are_rejected(token):
+    with pytest.raises(ValueError):
+        decode_cursor(token)
+
+
+def test_snippets_escape_the_text_and_mark_matches():
+    snippet = f"Three <b>{MATCH_START}quarters{MATCH_STOP}</b> & a {MATCH_START}half{MATCH_STOP}"
+    assert highlight(snippet) == "Three &lt;b&gt;<mark>quarters</mark>&lt;/b&gt; &amp; a <mark>half</mark>"
+    assert highlight(None) == ""
@@ -0,0 +1,152 @@
+"""Contract tests for server-side transcription (engines, speaker attribution, pool)."""
+
+import asyncio
+import random
+import wave
+from array import array
+
+import pytest
+
+from app.services.transcript_process.asr_engines import StubEngine, TranscriptionEngine, create_engine
+from app.services.transcript_process.asr_pool import TranscriptionPool
+from app.services.transcript_process.audio_analyzer import (
+    add_speakers,
+    attach_speakers,
+    attach_speakers_naive,
+    combine_consecutive_speakers,
+    parse_rttm,
+)
+
+
+def seg(start, end, text="x"):
+    return {"text": text, "start": start, "end": end}
+
+
+def test_parse_rttm(tmp_path):
+    rttm = tmp_path / "a.rttm"
+    rttm.write_text(
+        "# comment\n"
+        "SPEAKER a 1 0.50 2.25 <NA> <NA> speaker_0 <NA> <NA>\n"
+        "\n"
+        "SPEAKER a 1 2.75 1.00 <NA> <NA> speaker_1 <NA> <NA>\n"
+        "LEXEME ignored\n"
+    )
+    assert parse_rttm(rttm) == [
+        {"speaker": "speaker_0", "start": 0.5, "end": 2.75},
+        {"speaker": "speaker_1", "start": 2.75, "end": 3.75},
+    ]
+
+
+def test_segments_get_the_most_overlapping_speaker():
+    turns = [
+        {"speaker": "A", "start": 0, "end": 4},
+        {"speaker": "B", "start": 4, "end": 10},
+    ]
+    labelled = attach_speakers([seg(0, 3), seg(3, 8), seg(2, 6), seg(11, 12)], turns)
+    assert [s["speaker"] for s in labelled] == ["A", "B", "A", "UNKNOWN"]  # the tie goes to the earlier turn
+
+
+def test_interval_attribution_matches_the_pairwise_loop():
+    pytest.importorskip("numpy")
+    rnd = random.Random(3)
+    for _ in range(50):
+        # a coarse grid makes equal overlaps (ties), nested and zero-length intervals common
+        turns = [
+            {"speaker": f"s{rnd.randrange(3)}", "start": (s := rnd.randrange(60) / 2), "end": s + rnd.randrange(12) / 2}
+            for _ in range(rnd.randrange(30))
+        ]
+        segments = [seg(s := rnd.randrange(60) / 2, s + rnd.randrange(8) / 2) for _ in range(rnd.randrange(40))]
+        assert attach_speakers(segments, turns) == attach_speakers_naive(segments, turns)
+
+
+def test_word_level_speakers_split_a_segment_at_the_speaker_change():
+    parsed = {
+        "segments": [seg(0, 4, "yes and you")],
+        "words": [seg(0, 1, "yes"), seg(2, 3, "and"), seg(3, 4, "you")],
+    }
+    turns = [{"speaker": "A", "start": 0, "end": 1.5}, {"speaker": "B", "start": 1.5, "end": 4}]
+    result = add_speakers(parsed, turns, word_level=True)
+    assert [(s["speaker"], s["text"], s["start"], s["end"]) for s in result["combined_diarized_segments"]] == [
+        ("A", "yes", 0, 1),
+        ("B", "and you", 2, 4),
+    ]
+    assert [w["speaker"] for w in result["words"]] == ["A", "B", "B"]
+
+
+def test_consecutive_segments_of_one_speaker_are_merged():
+    segments = [
+        {**seg(0, 1, "hello"), "speaker": "A"},
+        {**seg(1, 2, "there"), "speaker": "A"},
+        {**seg(2, 3, "hi"), "speaker": "B"},
+    ]
+    combined = combine_consecutive_speakers(segments)
+    assert combined == [
+        {"text": "hello there", "start": 0, "end": 2, "speaker": "A"},
+        {"text": "hi", "start": 2, "end": 3, "speaker": "B"},
+    ]
+    assert segments[0]["text"] == "hello"  # inputs are left alone
+
+
+def write_tone(path, seconds, amplitude=1000):
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(array("h", [amplitude] * int(seconds * 16000)).tobytes())
+    return str(path)
+
+
+def test_stub_engine_produces_the_upload_shape(tmp_path):
+    engine = create_engine("stub", segments=4, speakers=2)
+    engine.load()
+    audio = str(tmp_path / "lesson.mp3")
+    (parsed,) = engine.transcribe([audio])
+    result = add_speakers(parsed, engine.diarize(audio, str(tmp_path)))
+    assert [(s["speaker"], s["start"], s["end"]) for s in result["combined_diarized_segments"]] == [
+        ("speaker_0", 0.0, 10.0),
+        ("speaker_1", 10.0, 20.0),
+    ]
+    assert result["combined_diarized_segments"][0]["text"] == "lesson segment 1. lesson segment 2."
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        create_engine("whisper-xl")
+
+
+def test_engine_without_diarize_cannot_be_created():
+    class TranscribeOnly(TranscriptionEngine):
+        def transcribe(self, audio_paths):
+            return []
+
+    with pytest.raises(TypeError):
+        TranscribeOnly()
+
+
+def test_pool_batches_windows_across_files_and_loads_once_per_worker(tmp_path):
+    short = [write_tone(tmp_path / f"f{i}.wav", 2.0, amplitude=100 * (i + 1)) for i in range(3)]
+    long = write_tone(tmp_path / "long.wav", 9.0, amplitude=900)
+
+    async def run():
+        pool = TranscriptionPool(
+            "stub", workers=1, batch_size=3, batch_window=5, window_seconds=4.0, overlap_seconds=1.0
+        )
+        try:
+            # three short files queued together go to the worker as one batch ...
+            first = await asyncio.gather(*(pool.atranscribe(path) for path in short))
+            # ... and a long one is cut into windows that share a batch
+            pool.batch_window = 0.05
+            second = await pool.atranscribe(long)
+        finally:
+            pool.shutdown()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert [r["text"] for r in first] == ["w1", "w2", "w3"]
+    assert {r["engine"]["batch_size"] for r in first} == {3}
+    assert second["windows"] == 3 and second["engine"]["batch_size"] == 3
+    # the tone runs through every window; each window hears it, stitching keeps each copy's own span
+    assert [(w["start"], w["end"]) for w in second["words"]] == [(0.0, 4.0), (3.0, 7.0), (6.0, 9.0)]
+    assert {s["speaker"] for s in second["diarized_segments"]} == {"speaker_0"}
+    assert {r["engine"]["model_loads"] for r in first + [second]} == {1}
+    assert second["engine"]["worker_pid"] == first[0]["engine"]["worker_pid"]
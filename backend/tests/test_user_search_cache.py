@@ -0,0 +1,130 @@
+"""Contract tests for @mention autocomplete ranking and its per-process cache."""
+
+import pytest
+
+from app.repositories.user.search_cache import (
+    UserSearchCache,
+    like_escape,
+    normalize_query,
+    rank_users,
+    trigram_similarity,
+)
+
+
+def user(id, user_name=None, display_name=None):
+    return {"id": id, "user_name": user_name, "display_name": display_name}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+# values returned by pg_trgm's similarity() for the same arguments
+@pytest.mark.parametrize("a, b, expected", [
+    ("bry", "Bryan Hernandez", 0.1764706),
+    ("her", "brittney-hernandez", 0.15),
+    ("an", "Ann", 0.4),
+    ("o'neil", "O'Neil x", 0.7777778),
+    ("jo", "John Smith", 0.16666667),
+    ("jo", "jo", 1.0),
+    ("a", "A B", 0.5),
+    ("ab", "X_ab9c", 0.25),
+    ("", "abc", 0.0),
+    ("abc", None, 0.0),
+])
+def test_similarity_matches_pg_trgm(a, b, expected):
+    assert trigram_similarity(a, b) == pytest.approx(expected, abs=1e-6)
+
+
+def test_query_is_normalized_and_like_wildcards_escaped():
+    assert normalize_query("  JoHn ") == "john"
+    assert normalize_query(None) == ""
+    assert like_escape(r"50%_off\x") == r"50\%\_off\\x"
+
+
+def test_prefix_matches_rank_first_then_similarity_then_id():
+    rows = [
+        user(4, "mojo", "Mo Jo"),
+        user(3, "john.smith", "John Smith"),
+        user(2, None, "Jo"),
+        user(1, "banjo", None),
+        user(5, "jo.smith", None),
+    ]
+    assert [row["id"] for row in rank_users("jo", rows)] == [2, 5, 3, 4, 1]
+
+
+def test_exact_answer_is_served_up_to_the_limit():
+    cache = UserSearchCache()
+    rows = [user(1, "john"), user(2, "johanna")]
+    cache.put("jo", rows, complete=False, generation=cache.generation)
+    assert cache.get("jo", 1) == rows[:1]
+    assert cache.get("j", 10) is None
+
+
+def test_longer_text_is_narrowed_from_a_complete_prefix():
+    cache = UserSearchCache()
+    rows = rank_users("jo", [user(1, "johanna"), user(2, "banjo"), user(3, "john"), user(4, "jonas")])
+    cache.put("jo", rows, complete=True, generation=cache.generation)
+    assert [row["id"] for row in cache.get("joh", 10)] == [3, 1]
+    assert [row["id"] for row in cache.get("john", 10)] == [3]
+    assert cache.get("jox", 10) == []
+
+
+def test_incomplete_prefix_is_not_narrowed():
+    cache = UserSearchCache()
+    cache.put("jo", [user(1, "john")], complete=False, generation=cache.generation)
+    assert cache.get("joh", 10) is None
+
+
+def test_answer_that_raced_a_change_is_dropped():
+    cache = UserSearchCache()
+    generation = cache.generation
+    cache.invalidate()
+    cache.put("jo", [user(1, "john")], complete=True, generation=generation)
+    assert cache.get("jo", 10) is None
+
+
+def test_invalidate_forgets_every_answer():
+    cache = UserSearchCache()
+    cache.put("jo", [user(1, "john")], complete=True, generation=cache.generation)
+    cache.invalidate()
+    assert cache.get("jo", 10) is None
+    assert cache.get("john", 10) is None
+
+
+def test_answers_expire():
+    clock = FakeClock()
+    cache = UserSearchCache(ttl_seconds=60, clock=clock)
+    cache.put("jo", [user(1, "john")], complete=True, generation=cache.generation)
+    clock.now = 59
+    assert cache.get("jo", 10) is not None
+    clock.now = 60
+    assert cache.get("jo", 10) is None
+
+
+def test_narrowed_answers_expire_with_the_answer_they_came_from():
+    clock = FakeClock()
+    cache = UserSearchCache(ttl_seconds=60, clock=clock)
+    cache.put("j", [user(1, "john")], complete=True, generation=cache.generation)
+    clock.now = 40
+    assert cache.get("jo", 10) is not None
+    clock.now = 50
+    assert cache.get("joh", 10) is not None
+    clock.now = 60
+    assert cache.get("joh", 10) is None
+    assert cache.get("jo", 10) is None
+
+
+def test_least_recently_used_answer_is_evicted():
+    cache = UserSearchCache(max_entries=2)
+    for text in ("a", "b"):
+        cache.put(text, [], complete=False, generation=cache.generation)
+    cache.get("a", 10)
+    cache.put("c", [], complete=False, generation=cache.generation)
+    assert cache.get("b", 10) is None
+    assert cache.get("a", 10) == []
+    assert cache.get("c", 10) == []
@@ -0,0 +1,89 @@
+"""Contract tests for the waveform peaks file served by GET /transcripts/{id}/waveform."""
+
+from array import array
+
+import pytest
+
+from app.services.transcript_process.waveform import (
+    WaveformError,
+    build_levels,
+    compute_peaks,
+    downsample,
+    encode,
+    extract_level,
+)
+
+
+def pcm(samples):
+    return array("h", samples).tobytes()
+
+
+def test_peaks_are_bucket_min_max_scaled_to_int8():
+    samples = [0, 1000, -2000, 32767] + [-32768, 0, 256, 512]
+    assert list(compute_peaks([pcm(samples)], samples_per_bucket=4)) == [-8, 127, -128, 2]
+
+
+def test_peaks_do_not_depend_on_chunk_boundaries():
+    samples = [((i * 7919) % 65536) - 32768 for i in range(1000)]
+    data = pcm(samples)
+    whole = compute_peaks([data], samples_per_bucket=16)
+    # odd split sizes, including ones that cut a sample in half
+    chunks = [data[i:i + 37] for i in range(0, len(data), 37)]
+    assert compute_peaks(chunks, samples_per_bucket=16) == whole
+
+
+def test_trailing_partial_bucket_is_kept():
+    peaks = compute_peaks([pcm([100 * 256, 0, 0, 0, -3 * 256])], samples_per_bucket=4)
+    assert list(peaks) == [0, 100, -3, -3]
+
+
+def test_downsample_merges_neighbouring_buckets():
+    level = array("b", [-1, 5, -7, 2, -3, 9])  # three buckets, the last one unpaired
+    assert list(downsample(level)) == [-7, 5, -3, 9]
+
+
+def test_levels_stop_at_min_buckets():
+    levels = build_levels(array("b", [0, 0] * 1000), min_buckets=100)
+    assert [len(level) // 2 for level in levels] == [1000, 500, 250, 125]
+
+
+def test_encoded_levels_round_trip():
+    level0 = array("b", [i % 100 - 50 for i in range(2 * 40)])
+    levels = build_levels(level0, min_buckets=8)
+    blob = encode(levels, sample_rate=8000, samples_per_bucket=256)
+
+    for zoom, level in enumerate(levels):
+        data, meta = extract_level(blob, zoom)
+        assert data == level.tobytes()
+        assert meta == {
+            "zoom": zoom,
+            "zoom_levels": len(levels),
+            "sample_rate": 8000,
+            "samples_per_bucket": 256 << zoom,
+            "buckets": len(level) // 2,
+        }
+
+
+def test_zoom_beyond_coarsest_level_is_clamped():
+    levels = build_levels(array("b", [1, 2] * 64), min_buckets=16)
+    blob = encode(levels)
+    data, meta = extract_level(blob, 99)
+    assert meta["zoom"] == len(levels) - 1
+    assert data == levels[-1].tobytes()
+
+
+def test_rejects_foreign_data():
+    with pytest.raises(WaveformError):
+        extract_level(b"RIFF" + bytes(40), 0)
+
+
+@pytest.mark.parametrize("cut", [0, 4, 15, 20, -1])
+def test_rejects_truncated_files(cut):
+    blob = encode(build_levels(array("b", [1, 2] * 64), min_buckets=16))
+    with pytest.raises(WaveformError):
+        extract_level(blob[:cut], 0)
+
+
+def test_rejects_files_without_levels():
+    with pytest.raises(WaveformError):
+        extract_level(encode([]), 0)
@@ -0,0 +1,25 @@
+import { ApiClientError, fastApiClient } from "@/lib/api-client";
+import { NextResponse } from "next/server";
+
+type RouteContext = {
+  params: Promise<{ jobId: string }>;
+};
+
+/** GET /api/jobs/:jobId — status/progress of a background ingestion job. */
+export async function GET(_: Request, context: RouteContext) {
+  const { jobId } = await context.params;
+
+  if (!jobId || Number.isNaN(Number(jobId))) {
+    return NextResponse.json({ error: "Invalid job id" }, { status: 400 });
+  }
+
+  try {
+    const data = await fastApiClient.get(`/jobs/${jobId}`);
+    return NextResponse.json(data);
+  } catch (error) {
+    if (error instanceof ApiClientError) {
+      return NextResponse.json({ error: error.message }, { status: error.status });
+    }
+    return NextResponse.json({ error: "Unexpected server error" }, { status: 500 });
+  }
+}
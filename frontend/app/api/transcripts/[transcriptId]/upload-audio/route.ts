@@ -9,7 +9,8 @@ type RouteContext = {
 /**
  * Proxy POST /api/transcripts/:id/upload-audio → FastAPI backend.
  * Forwards the multipart/form-data body (audio_file + transcript_file)
- * directly to the backend.
+ * directly to the backend, which answers 202 with the ingestion job to poll
+ * at /api/jobs/:jobId.
  */
 export async function POST(request: Request, context: RouteContext) {
   const { transcriptId } = await context.params;
@@ -73,7 +74,7 @@ export async function POST(request: Request, context: RouteContext) {
     }
 
     const data = await backendRes.json();
-    return NextResponse.json(data, { status: 201 });
+    return NextResponse.json(data, { status: backendRes.status });
   } catch {
     return NextResponse.json(
       { error: "Failed to upload files" },
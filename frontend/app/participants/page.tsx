@@ -97,6 +97,30 @@ const extractUploadError = async (res: Response): Promise<string> => {
   return "We couldn't process your files. Please double-check the audio and transcript, then try again.";
 };
 
+type IngestJob = {
+  id: number;
+  status: "queued" | "running" | "succeeded" | "failed";
+  stage?: string | null;
+  progress?: number;
+  error?: { message?: string } | null;
+};
+
+/**
+ * Poll a background ingestion job until it finishes. Resolves with the final
+ * job; `onUpdate` is called with every status read so the dialog can show the
+ * current stage.
+ */
+const waitForJob = async (jobId: number, onUpdate: (job: IngestJob) => void): Promise<IngestJob> => {
+  for (;;) {
+    const res = await fetch(`/api/jobs/${jobId}`);
+    if (!res.ok) throw new Error("Lost track of the upload while it was being processed.");
+    const job = (await res.json()) as IngestJob;
+    onUpdate(job);
+    if (job.status === "succeeded" || job.status === "failed") return job;
+    await new Promise((resolve) => setTimeout(resolve, 1500));
+  }
+};
+
 /* ------------------------------------------------------------------ */
 /*  Page                                                               */
 /* ------------------------------------------------------------------ */
@@ -414,6 +438,27 @@ export default function ParticipantsPage() {
           setUploadMessage(friendly);
           return;
         }
+
+        /* Step 3 — the server ingests the files in the background; wait for it */
+        const accepted = (await uploadRes.json()) as { data?: { id?: number } };
+        const jobId = accepted.data?.id;
+        if (jobId) {
+          const job = await waitForJob(jobId, (j) => {
+            setUploadMessage(j.status === "queued" ? "Waiting to be processed…" : `${j.stage ?? "Processing"}… ${j.progress ?? 0}%`);
+          });
+          if (job.status === "failed") {
+            try {
+              await fetch(`/api/transcripts/${newId}`, { method: "DELETE" });
+            } catch {
+              /* best-effort rollback */
+            }
+            setUploadStep("error");
+            setUploadMessage(
+              job.error?.message ?? "We couldn't process your files. Please double-check the audio and transcript, then try again.",
+            );
+            return;
+          }
+        }
       }
 
       setUploadStep("done");